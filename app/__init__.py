@@ -4,6 +4,7 @@ Creates and configures the Flask application with all extensions and blueprints.
 """
 import os
 import logging
+import click
 from flask import Flask, render_template, jsonify
 from app.config import config
 from app.extensions import db, migrate, login_manager, csrf, talisman, limiter, cache
@@ -46,6 +47,14 @@ def create_app(config_name=None):
     # Initialize Sentry (if configured)
     initialize_sentry(app)
 
+    # Compiled template cache, and precompile before workers fork
+    from app.cv.template_cache import init_template_cache
+    init_template_cache(app)
+
+    # Load the PDF engine now or on first use
+    from app.cv.render_engine import init_render_engine
+    init_render_engine(app)
+
     # Log startup info
     app.logger.info(
         f"CV Builder starting in {config_name} mode - {app.config['APP_BASE_URL']}"
@@ -117,6 +126,50 @@ def initialize_extensions(app):
     # Caching
     cache.init_app(app)
 
+    # CV document snapshots (kept current on flush)
+    from app.cv.snapshot import init_snapshots
+    init_snapshots(app)
+
+    # CV template registry (slug lookup and version hashes)
+    from app.cv.template_registry import init_template_registry
+    init_template_registry(app)
+
+    # Compiled theme CSS
+    from app.cv.theme import init_theme
+    init_theme(app)
+
+    # Rendered PDF cache
+    from app.cv.render_cache import init_render_cache
+    init_render_cache(app)
+
+    # Background PDF render jobs
+    from app.cv.render_jobs import init_render_jobs
+    init_render_jobs(app)
+
+    # Dashboard thumbnails
+    from app.cv.thumbnails import init_thumbnails
+    init_thumbnails(app)
+
+    # Live preview updates (SSE)
+    from app.cv.live_updates import init_live_updates
+    init_live_updates(app)
+
+    # Speculative pre-render after edits
+    from app.cv.prerender import init_prerender
+    init_prerender(app)
+
+    # Dashboard page cache
+    from app.cv.dashboard import init_dashboard
+    init_dashboard(app)
+
+    # Fingerprinted static assets
+    from app.utils.assets import init_assets
+    init_assets(app)
+
+    # Server-Timing and request profiling
+    from app.cv.timing import init_timing
+    init_timing(app)
+
     # User loader for Flask-Login
     from app.models.user import User
 
@@ -228,12 +281,21 @@ Sitemap: {app.config['APP_BASE_URL']}/sitemap.xml
 
         status_code = 200 if db_status == "ok" and redis_status == "ok" else 503
 
+        from app.cv.render_cache import pdf_cache, thumbnail_cache
+        from app.cv.render_engine import render_engine
+        from app.cv.theme import theme_compiler
+
         return (
             jsonify(
                 {
                     "status": "ok" if status_code == 200 else "degraded",
                     "database": db_status,
                     "redis": redis_status,
+                    "pdf_cache": pdf_cache.stats(),
+                    "thumbnail_cache": thumbnail_cache.stats(),
+                    "pdf_engine": render_engine.status(),
+                    "theme_css": theme_compiler.stats(),
+                    "template_cache": app.jinja_env.bytecode_cache.stats() if app.jinja_env.bytecode_cache else None,
                 }
             ),
             status_code,
@@ -273,12 +335,64 @@ def register_cli_commands(app):
         seed()
         app.logger.info("Templates seeded successfully!")
 
+    @app.cli.command()
+    def build_assets():
+        """Minify, fingerprint and precompress static CSS/JS into static/dist."""
+        from app.utils.assets import build_assets as build, asset_manifest
+
+        manifest = build(app.static_folder)
+        asset_manifest.load()
+        for name, built in manifest.items():
+            app.logger.info(f"{name} -> {built}")
+        app.logger.info(f"Built {len(manifest)} assets")
+
+    @app.cli.command()
+    @click.option("--repair", is_flag=True, help="Rebuild snapshots that are missing or drifted")
+    @click.option("--chunk-size", default=500, show_default=True, help="CVs checked per query")
+    def check_snapshots(repair, chunk_size):
+        """Compare CV snapshots with their section rows."""
+        from app.cv.snapshot import check_snapshots as check
+
+        counts = check(repair=repair, chunk_size=chunk_size, log=app.logger.warning)
+        app.logger.info(
+            f"Checked {counts['checked']} CVs: {counts['drifted']} drifted, {counts['repaired']} repaired"
+        )
+
+    @app.cli.command()
+    def repair_cv_counts():
+        """Recompute every user's active CV count from the cvs table."""
+        from app.models import User
+
+        fixed = User.repair_cv_counts()
+        app.logger.info(f"Fixed the CV count of {fixed} users")
+
     @app.cli.command()
     def create_db():
         """Create database tables."""
         db.create_all()
         app.logger.info("Database tables created!")
 
+    @app.cli.command()
+    @click.argument("email")
+    @click.option("--output", "-o", default=None, help="ZIP file to write (default: <email>_cvs.zip)")
+    def export_user(email, output):
+        """Export all of a user's CVs as a ZIP of PDFs and JSON sources."""
+        from app.cv.export import prepare_export, iter_export_zip
+        from app.models import User, CV
+
+        user = User.query.filter_by(email=email.lower()).first()
+        if user is None:
+            raise click.ClickException(f"No user with email {email}")
+
+        cvs = CV.query.filter_by(user_id=user.id, is_deleted=False).order_by(CV.updated_at.desc()).all()
+        output = output or f"{email.split('@')[0]}_cvs.zip"
+
+        with open(output, "wb") as f:
+            for chunk in iter_export_zip(prepare_export(cvs)):
+                f.write(chunk)
+
+        app.logger.info(f"Exported {len(cvs)} CVs for {email} to {output}")
+
 
 def initialize_sentry(app):
     """Initialize Sentry error tracking if configured."""
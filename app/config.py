@@ -81,6 +81,85 @@ class Config:
     CACHE_TYPE = "RedisCache" if REDIS_URL else "SimpleCache"
     CACHE_REDIS_URL = REDIS_URL if REDIS_URL else None
     CACHE_DEFAULT_TIMEOUT = 300  # 5 minutes
+    PREVIEW_CACHE_TIMEOUT = int(os.environ.get("PREVIEW_CACHE_TIMEOUT", "3600"))  # rendered preview HTML
+
+    # Rendered PDF cache ("filesystem" or "flask-caching")
+    PDF_CACHE_BACKEND = os.environ.get("PDF_CACHE_BACKEND", "filesystem")
+    PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR")  # default: <instance path>/pdf_cache
+    PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    PDF_CACHE_TIMEOUT = int(os.environ.get("PDF_CACHE_TIMEOUT", "86400"))  # flask-caching backend only
+
+    # Dashboard thumbnails (page 1 rasterized with pypdfium2, "webp" or "png")
+    THUMBNAILS_ENABLED = os.environ.get("THUMBNAILS_ENABLED", "true").lower() == "true"
+    THUMBNAIL_WIDTH = int(os.environ.get("THUMBNAIL_WIDTH", "360"))  # pixels
+    THUMBNAIL_FORMAT = os.environ.get("THUMBNAIL_FORMAT", "webp")
+    THUMBNAIL_CACHE_BACKEND = os.environ.get("THUMBNAIL_CACHE_BACKEND", "filesystem")
+    THUMBNAIL_CACHE_DIR = os.environ.get("THUMBNAIL_CACHE_DIR")  # default: <instance path>/thumbnails
+    THUMBNAIL_CACHE_MAX_BYTES = int(os.environ.get("THUMBNAIL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    THUMBNAIL_CACHE_TIMEOUT = int(os.environ.get("THUMBNAIL_CACHE_TIMEOUT", "604800"))  # flask-caching backend only
+
+    # Background PDF render jobs (process pool per gunicorn worker)
+    RENDER_JOB_DIR = os.environ.get("RENDER_JOB_DIR")  # default: <instance path>/render_jobs
+    RENDER_POOL_WORKERS = int(os.environ.get("RENDER_POOL_WORKERS", "2"))
+    RENDER_QUEUE_MAX_PENDING = int(os.environ.get("RENDER_QUEUE_MAX_PENDING", "16"))
+    RENDER_JOB_TTL = int(os.environ.get("RENDER_JOB_TTL", "3600"))  # seconds
+    RENDER_POOL_START_METHOD = os.environ.get("RENDER_POOL_START_METHOD", "spawn")
+
+    # Speculative pre-render into the PDF cache once an edited CV goes idle
+    PRERENDER_ENABLED = os.environ.get("PRERENDER_ENABLED", "true").lower() == "true"
+    PRERENDER_DELAY = float(os.environ.get("PRERENDER_DELAY", "5"))  # seconds
+    PRERENDER_MAX_PER_USER = int(os.environ.get("PRERENDER_MAX_PER_USER", "1"))
+
+    # Live preview updates over SSE ("local" = per process, "redis" = across workers).
+    # Off by default unless the redis backend is configured: with "local" and
+    # several workers a save and the tab's stream often land in different processes
+    LIVE_UPDATES_BACKEND = os.environ.get("LIVE_UPDATES_BACKEND", "local")
+    LIVE_UPDATES_ENABLED = os.environ.get(
+        "LIVE_UPDATES_ENABLED", "true" if LIVE_UPDATES_BACKEND == "redis" else "false"
+    ).lower() == "true"
+    LIVE_UPDATES_REDIS_URL = os.environ.get("LIVE_UPDATES_REDIS_URL", REDIS_URL)
+    LIVE_UPDATES_HEARTBEAT = int(os.environ.get("LIVE_UPDATES_HEARTBEAT", "15"))  # seconds
+    LIVE_UPDATES_MAX_STREAM_SECONDS = int(os.environ.get("LIVE_UPDATES_MAX_STREAM_SECONDS", "300"))
+    # Each stream holds a worker thread; above this many per process the
+    # endpoint answers 503 and editors fetch fragments after saves instead
+    LIVE_UPDATES_MAX_STREAMS = int(os.environ.get("LIVE_UPDATES_MAX_STREAMS", "2"))
+
+    # Compiled Jinja templates on local disk, shared by all workers on the host;
+    # JINJA_PRECOMPILE loads the CV templates, editor and dashboard in create_app
+    JINJA_BYTECODE_CACHE_ENABLED = os.environ.get("JINJA_BYTECODE_CACHE_ENABLED", "true").lower() == "true"
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get("JINJA_BYTECODE_CACHE_DIR")  # default: <instance path>/jinja_bytecode
+    JINJA_PRECOMPILE = os.environ.get("JINJA_PRECOMPILE", "true").lower() == "true"
+
+    # Compiled theme CSS per (template, primary_color, font_pair), LRU-bounded
+    THEME_CSS_CACHE_SIZE = int(os.environ.get("THEME_CSS_CACHE_SIZE", "256"))
+    THEME_CSS_MAX_AGE = int(os.environ.get("THEME_CSS_MAX_AGE", "31536000"))  # versioned URLs
+
+    # Section operations accepted by one batched autosave request
+    SECTION_BATCH_MAX_OPERATIONS = int(os.environ.get("SECTION_BATCH_MAX_OPERATIONS", "100"))
+
+    # Dashboard: CVs per page (keyset pagination) and the per-user cache of
+    # the rendered card list, invalidated by any write to the user's CVs
+    DASHBOARD_PAGE_SIZE = int(os.environ.get("DASHBOARD_PAGE_SIZE", "12"))
+    DASHBOARD_CACHE_ENABLED = os.environ.get("DASHBOARD_CACHE_ENABLED", "true").lower() == "true"
+    DASHBOARD_CACHE_TIMEOUT = int(os.environ.get("DASHBOARD_CACHE_TIMEOUT", "3600"))
+
+    # Fingerprinted static assets from `flask build-assets` (served from /assets/)
+    ASSETS_ENABLED = os.environ.get("ASSETS_ENABLED", "true").lower() == "true"
+    ASSETS_MAX_AGE = int(os.environ.get("ASSETS_MAX_AGE", "31536000"))
+
+    # Server-Timing header and JSON timing log line for preview, download and section APIs
+    SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    # cProfile a fraction of timed requests (0 = only admins sending "X-Profile: 1")
+    PROFILER_SAMPLE_RATE = float(os.environ.get("PROFILER_SAMPLE_RATE", "0"))
+    PROFILER_DIR = os.environ.get("PROFILER_DIR")  # default: <instance path>/profiles
+    ADMIN_EMAILS = {
+        email.strip().lower() for email in os.environ.get("ADMIN_EMAILS", "").split(",") if email.strip()
+    }
+
+    # PDF engine loading: "lazy" imports WeasyPrint on first render (fast boot),
+    # "eager" imports it and renders a warm-up document in create_app
+    # (before gunicorn forks when started with --preload)
+    PDF_ENGINE_MODE = os.environ.get("PDF_ENGINE_MODE", "lazy")
 
     # Feature flags
     MAX_CVS_PER_USER = int(os.environ.get("MAX_CVS_PER_USER", "10"))
@@ -118,6 +197,9 @@ class DevelopmentConfig(Config):
     TESTING = False
     SQLALCHEMY_ECHO = os.environ.get("SQLALCHEMY_ECHO", "false").lower() == "true"
 
+    # Serve the unbuilt files so edits show up without `flask build-assets`
+    ASSETS_ENABLED = os.environ.get("ASSETS_ENABLED", "false").lower() == "true"
+
     # Disable HTTPS requirement for local development
     TALISMAN_FORCE_HTTPS = False
 
@@ -139,6 +221,12 @@ class TestingConfig(Config):
 
     # Use simple cache for testing
     CACHE_TYPE = "SimpleCache"
+    PDF_CACHE_BACKEND = "flask-caching"
+    THUMBNAIL_CACHE_BACKEND = "flask-caching"
+    PRERENDER_ENABLED = False
+    THUMBNAILS_ENABLED = False
+    JINJA_BYTECODE_CACHE_ENABLED = False
+    JINJA_PRECOMPILE = False
 
     # Disable rate limiting in tests
     RATELIMIT_ENABLED = False
@@ -154,6 +242,8 @@ class ProductionConfig(Config):
     TALISMAN_FORCE_HTTPS = True
     SESSION_COOKIE_SECURE = True
 
+    PDF_ENGINE_MODE = os.environ.get("PDF_ENGINE_MODE", "eager")
+
     # Ensure critical env vars are set
     @classmethod
     def init_app(cls, app):
@@ -0,0 +1,138 @@
+"""
+In-memory asset resolution for PDF renders.
+WeasyPrint resolves stylesheets, fonts and images through a URL fetcher. This
+one answers /static/... and template asset URLs from a map preloaded into
+memory, so renders never touch the network or re-read the disk.
+"""
+import mimetypes
+import os
+import threading
+from urllib.parse import urlparse, unquote
+
+APP_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Base URL given to WeasyPrint; relative URLs in templates resolve against it
+ASSET_BASE_URL = "https://assets.cv-builder.invalid/cv_templates/"
+
+# URL path prefix -> directory preloaded under it
+ASSET_ROOTS = {
+    "/static/": os.path.join(APP_DIR, "static"),
+    "/cv_templates/": os.path.join(APP_DIR, "templates", "cv_templates"),
+}
+
+ASSET_EXTENSIONS = {
+    ".css", ".woff", ".woff2", ".ttf", ".otf",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+}
+
+mimetypes.add_type("font/woff2", ".woff2")
+mimetypes.add_type("font/woff", ".woff")
+mimetypes.add_type("image/webp", ".webp")
+
+
+class AssetMap:
+    """Preloaded URL path -> (bytes, mime type) map."""
+
+    def __init__(self, roots=None):
+        self.roots = roots or ASSET_ROOTS
+        self._assets = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Read every servable asset into memory.
+
+        Returns:
+            int: Number of assets loaded
+        """
+        assets = {}
+        for prefix, directory in self.roots.items():
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if os.path.splitext(name)[1].lower() not in ASSET_EXTENSIONS:
+                        continue
+                    path = os.path.join(root, name)
+                    relative = os.path.relpath(path, directory).replace(os.sep, "/")
+                    mime_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                    with open(path, "rb") as f:
+                        assets[prefix + relative] = (f.read(), mime_type)
+
+        with self._lock:
+            self._assets = assets
+        return len(assets)
+
+    def lookup(self, url):
+        """
+        Resolve an http(s) URL to a preloaded asset.
+
+        Only the path is used; the host is ignored because nothing is ever
+        fetched from it.
+
+        Args:
+            url: Absolute URL requested by WeasyPrint
+
+        Returns:
+            tuple: (bytes, mime type)
+
+        Raises:
+            ValueError: If the scheme is not http(s) or the asset is unknown
+        """
+        if self._assets is None:
+            self.load()
+
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"Refusing to fetch {parsed.scheme or 'relative'} URL during PDF render: {url}")
+
+        asset = self._assets.get(unquote(parsed.path))
+        if asset is None:
+            raise ValueError(f"Unknown asset during PDF render: {url}")
+        return asset
+
+    def fetch(self, url):
+        """
+        WeasyPrint url_fetcher callable (dict-returning API).
+
+        data: URLs are decoded by WeasyPrint's default fetcher, which does no I/O
+        for them. Any other scheme is refused.
+        """
+        if url.startswith("data:"):
+            from weasyprint.urls import default_url_fetcher
+
+            return default_url_fetcher(url)
+
+        data, mime_type = self.lookup(url)
+        return {"string": data, "mime_type": mime_type, "redirected_url": url}
+
+
+asset_map = AssetMap()
+
+_url_fetcher = None
+
+
+def get_url_fetcher():
+    """
+    Get a url_fetcher for HTML()/CSS() backed by the preloaded asset map.
+
+    WeasyPrint 66+ expects a URLFetcher instance; older versions take a plain
+    callable returning a dict.
+    """
+    global _url_fetcher
+    if _url_fetcher is not None:
+        return _url_fetcher
+
+    try:
+        from weasyprint.urls import URLFetcher, URLFetcherResponse
+    except ImportError:
+        _url_fetcher = asset_map.fetch
+        return _url_fetcher
+
+    class AssetURLFetcher(URLFetcher):
+        def fetch(self, url, headers=None):
+            if url.startswith("data:"):
+                return super().fetch(url, headers)
+            data, mime_type = asset_map.lookup(url)
+            return URLFetcherResponse(url, data, {"Content-Type": mime_type})
+
+    _url_fetcher = AssetURLFetcher()
+    return _url_fetcher
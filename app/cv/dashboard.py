@@ -0,0 +1,176 @@
+"""
+Dashboard CV listing.
+The dashboard reads only the columns its cards show (no snapshot or section
+rows), one keyset-paginated page at a time, newest first, so its cost does
+not grow with a user's CV count or CV size.
+
+The rendered card list of each page is cached per user under a version
+token. Any committed write to one of the user's CVs (or their sections,
+which update the CV's snapshot) replaces the token, so stale pages are
+never read again and simply expire.
+"""
+import uuid
+from datetime import datetime
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import cache, db
+
+# Columns the dashboard cards (and thumbnail keys) need
+DASHBOARD_COLUMNS = ("id", "title", "template_slug", "updated_at", "section_count", "snapshot_hash")
+
+CURSOR_SEPARATOR = "~"
+
+
+def encode_cursor(row):
+    """Build the cursor of the page that starts after a row."""
+    return f"{row.updated_at.isoformat()}{CURSOR_SEPARATOR}{row.id}"
+
+
+def decode_cursor(cursor):
+    """
+    Parse a page cursor.
+
+    Returns:
+        tuple: (updated_at, id), or None if the cursor is missing or malformed
+    """
+    updated_at, separator, cv_id = (cursor or "").partition(CURSOR_SEPARATOR)
+    if not separator or not cv_id:
+        return None
+    try:
+        return datetime.fromisoformat(updated_at), cv_id
+    except ValueError:
+        return None
+
+
+def page_query(user_id, cursor=None):
+    """
+    Build the query for a user's live CVs after a cursor, newest first.
+
+    Served by the (user_id, is_deleted, updated_at, id) index without a sort.
+    """
+    from app.models import CV
+
+    query = db.session.query(*(getattr(CV, column) for column in DASHBOARD_COLUMNS)).filter(
+        CV.user_id == user_id, CV.is_deleted == db.false()
+    )
+    after = decode_cursor(cursor)
+    if after is not None:
+        updated_at, cv_id = after
+        # Keyset: rows strictly after the cursor in (updated_at DESC, id DESC) order
+        query = query.filter(
+            db.or_(CV.updated_at < updated_at, db.and_(CV.updated_at == updated_at, CV.id < cv_id))
+        )
+    return query.order_by(CV.updated_at.desc(), CV.id.desc())
+
+
+def list_cvs(user_id, cursor=None, page_size=12):
+    """
+    Get one page of a user's live CVs, newest first.
+
+    Args:
+        user_id: Owner's id
+        cursor: Cursor from a previous page (None for the first page)
+        page_size: CVs per page
+
+    Returns:
+        tuple: (list of rows with DASHBOARD_COLUMNS, cursor of the next page or None)
+    """
+    rows = page_query(user_id, cursor).limit(page_size + 1).all()
+    next_cursor = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
+
+class DashboardCache:
+    """Per-user cache of rendered dashboard pages."""
+
+    def __init__(self):
+        self.enabled = False
+        self.timeout = 3600
+
+    def init_app(self, app):
+        """Configure the cache and invalidate it on writes to CVs."""
+        self.enabled = app.config["DASHBOARD_CACHE_ENABLED"]
+        self.timeout = app.config["DASHBOARD_CACHE_TIMEOUT"]
+
+        if not event.contains(Session, "after_flush", _collect_users):
+            event.listen(Session, "after_flush", _collect_users)
+            event.listen(Session, "after_commit", _bump_users)
+            event.listen(Session, "after_rollback", _forget_users)
+
+    def version(self, user_id):
+        """Get the user's current version token, creating one if needed."""
+        key = f"dashboard_version:{user_id}"
+        version = cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex[:12]
+            cache.set(key, version, timeout=0)
+        return version
+
+    def bump(self, user_ids):
+        """Invalidate every cached page of the given users."""
+        if not self.enabled:
+            return
+        for user_id in user_ids:
+            cache.set(f"dashboard_version:{user_id}", uuid.uuid4().hex[:12], timeout=0)
+
+    def _key(self, user_id, cursor, extra):
+        return f"dashboard:{user_id}:{self.version(user_id)}:{extra}:{cursor or ''}"
+
+    def get(self, user_id, cursor, extra=""):
+        """
+        Get a cached page.
+
+        Args:
+            user_id: Owner's id
+            cursor: Page cursor
+            extra: Anything else the rendered page depends on (e.g., template registry version)
+
+        Returns:
+            dict: The cached page (cards HTML, total, next cursor), or None
+        """
+        if not self.enabled:
+            return None
+        return cache.get(self._key(user_id, cursor, extra))
+
+    def set(self, user_id, cursor, page, extra=""):
+        """Cache a rendered page."""
+        if self.enabled:
+            cache.set(self._key(user_id, cursor, extra), page, timeout=self.timeout)
+
+
+def mark_user_changed(session, user_id):
+    """Invalidate a user's pages when this transaction commits (for writes that bypass the ORM)."""
+    session.info.setdefault("dashboard_users", set()).add(user_id)
+
+
+def _collect_users(session, flush_context):
+    """after_flush hook: remember whose CVs this transaction wrote."""
+    from app.models import CV
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, CV) and obj.user_id is not None:
+            mark_user_changed(session, obj.user_id)
+
+
+def _bump_users(session):
+    # Only after commit: bumping earlier would let a concurrent request cache
+    # the old rows under the new version
+    users = session.info.pop("dashboard_users", None)
+    if users:
+        dashboard_cache.bump(users)
+
+
+def _forget_users(session):
+    session.info.pop("dashboard_users", None)
+
+
+dashboard_cache = DashboardCache()
+
+
+def init_dashboard(app):
+    """Initialize the dashboard page cache."""
+    dashboard_cache.init_app(app)
+    return dashboard_cache
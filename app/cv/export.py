@@ -0,0 +1,158 @@
+"""
+Bulk export of a user's CVs.
+Renders every CV in parallel on the render pool (reusing cached PDFs) and
+streams a ZIP with each PDF next to its JSON source, chunk by chunk.
+"""
+import io
+import json
+import re
+import zipfile
+
+from app.cv.render_cache import pdf_cache, compute_cache_key
+from app.cv.render_jobs import render_queue
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable sink that buffers ZipFile output until drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _entry_name(cv):
+    """Build a filesystem-safe, unique base name for a CV's files."""
+    title = re.sub(r"[^A-Za-z0-9_-]+", "_", cv.title).strip("_") or "CV"
+    return f"{title[:60]}_{cv.id[:8]}"
+
+
+def prepare_export(cvs):
+    """
+    Start rendering every CV that is not already cached.
+
+    Must run inside the app context: it reads the database and renders the
+    Jinja HTML, then hands layout to the render pool. Without a PDF engine,
+    uncached CVs are exported with an error file instead of being queued.
+
+    Args:
+        cvs: CV model instances to export
+
+    Returns:
+        list: Export entries for iter_export_zip()
+
+    Raises:
+        QueueFullError: If the render pool has no room for the uncached CVs;
+        renders already queued for this export are cancelled
+    """
+    from app.cv.pdf_generator import build_render_args
+    from app.cv.preview import build_cv_view
+    from app.cv.render_engine import render_engine, UNAVAILABLE_MESSAGE
+    from app.cv.template_registry import template_registry
+
+    entries = []
+    try:
+        for cv in cvs:
+            entry = {
+                "name": _entry_name(cv),
+                "cache_key": None,
+                "source": json.dumps(cv.to_dict(), indent=2, ensure_ascii=False).encode("utf-8"),
+                "future": None,
+            }
+            entries.append(entry)
+            if cv.template_slug not in template_registry:
+                entry["error"] = f"unknown template {cv.template_slug!r}"
+                continue
+
+            view = build_cv_view(cv)
+            entry["cache_key"] = compute_cache_key(cv, cv.template_slug, sections=view.sections)
+            if pdf_cache.has(entry["cache_key"]):
+                continue
+            if not render_engine.available:
+                entry["error"] = UNAVAILABLE_MESSAGE
+                continue
+            entry["future"] = render_queue.submit(
+                entry["cache_key"], lambda view=view: build_render_args(view, view.template_slug)
+            )
+    except Exception:
+        # Nothing will collect these renders; drop the ones no worker has started
+        for entry in entries:
+            if entry["future"] is not None:
+                entry["future"].cancel()
+        raise
+    return entries
+
+
+def _open_pdf(cache_key):
+    """Open a cached PDF for chunked reading."""
+    if pdf_cache.is_filesystem:
+        path = pdf_cache.get_path(cache_key)
+        return open(path, "rb") if path else None
+    data = pdf_cache.get(cache_key)
+    return io.BytesIO(data) if data is not None else None
+
+
+def iter_export_zip(entries, render_timeout=None):
+    """
+    Stream a ZIP archive of exported CVs.
+
+    Entries are written in order as their renders finish; at most one
+    CHUNK_SIZE block of PDF data is held in memory at a time. A CV whose
+    render failed gets an .error.txt file instead of a PDF.
+
+    Args:
+        entries: Output of prepare_export()
+        render_timeout: Seconds to wait for each pending render
+
+    Yields:
+        bytes: ZIP data
+    """
+    for chunk in _iter_zip(entries, render_timeout):
+        if chunk:
+            yield chunk
+
+
+def _iter_zip(entries, render_timeout):
+    sink = _ChunkWriter()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for entry in entries:
+            name = entry["name"]
+            archive.writestr(f"{name}.json", entry["source"])
+            yield sink.drain()
+
+            error = entry.get("error")
+            if entry["future"] is not None:
+                try:
+                    entry["future"].result(timeout=render_timeout)
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+
+            pdf_file = None if error else _open_pdf(entry["cache_key"])
+            if pdf_file is None:
+                archive.writestr(f"{name}.error.txt", f"PDF could not be rendered: {error or 'evicted from cache'}\n")
+                yield sink.drain()
+                continue
+
+            with pdf_file, archive.open(f"{name}.pdf", mode="w") as dest:
+                while True:
+                    chunk = pdf_file.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+
+    # Central directory
+    yield sink.drain()
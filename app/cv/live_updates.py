@@ -0,0 +1,240 @@
+"""
+Live preview updates over Server-Sent Events.
+Section and meta writes publish an event on the CV's channel once they are
+committed: the new preview version plus the re-rendered HTML of the changed
+sections. Every editor tab streaming /cv/<id>/events patches its preview from
+the event instead of fetching the preview again.
+
+The default "local" backend fans events out to the threads of one process.
+With several gunicorn workers, set LIVE_UPDATES_BACKEND=redis so events
+published in one worker reach tabs connected to another. Either way the
+editor falls back to fetching the changed fragments itself when no event
+arrives shortly after a save.
+"""
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+
+
+class LocalSubscription:
+    """Queue of events for one SSE stream."""
+
+    def __init__(self, broker, channel, max_queued):
+        self._broker = broker
+        self.channel = channel
+        self._queue = queue.Queue(maxsize=max_queued)
+
+    def put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # A stalled client misses intermediate versions; the next event still carries the latest
+            pass
+
+    def get(self, timeout):
+        """Wait up to timeout seconds for the next event (None on timeout)."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process pub/sub shared by the threads of one worker."""
+
+    def __init__(self, max_queued=32):
+        self.max_queued = max_queued
+        self._channels = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = LocalSubscription(self, channel, self.max_queued)
+        with self._lock:
+            self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def has_subscribers(self, channel):
+        with self._lock:
+            return bool(self._channels.get(channel))
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+
+
+class RedisSubscription:
+    """Redis pub/sub connection for one SSE stream."""
+
+    def __init__(self, client, channel):
+        self.channel = channel
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+
+    def get(self, timeout):
+        """Wait up to timeout seconds for the next event (None on timeout)."""
+        message = self._pubsub.get_message(timeout=timeout)
+        if message is None or message.get("type") != "message":
+            return None
+        return json.loads(message["data"])
+
+    def close(self):
+        self._pubsub.close()
+
+
+class RedisBroker:
+    """Pub/sub through a Redis-compatible server, shared by all workers."""
+
+    def __init__(self, url):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def subscribe(self, channel):
+        return RedisSubscription(self._client, channel)
+
+    def has_subscribers(self, channel):
+        return any(count for _, count in self._client.pubsub_numsub(channel))
+
+    def publish(self, channel, message):
+        self._client.publish(channel, json.dumps(message))
+
+
+class LiveUpdates:
+    """Publishes preview updates for CVs and streams them as SSE."""
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.broker = None
+        self.heartbeat = 15
+        self.max_stream_seconds = 300
+        self.max_streams = 2
+        self._streams = 0
+        self._streams_lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure the broker from app config."""
+        self.app = app
+        self.enabled = app.config["LIVE_UPDATES_ENABLED"]
+        self.heartbeat = app.config["LIVE_UPDATES_HEARTBEAT"]
+        self.max_stream_seconds = app.config["LIVE_UPDATES_MAX_STREAM_SECONDS"]
+        self.max_streams = app.config["LIVE_UPDATES_MAX_STREAMS"]
+
+        backend = app.config["LIVE_UPDATES_BACKEND"]
+        if backend == "local":
+            self.broker = LocalBroker()
+        elif backend == "redis":
+            self.broker = RedisBroker(app.config["LIVE_UPDATES_REDIS_URL"])
+        else:
+            raise ValueError(f"Unknown LIVE_UPDATES_BACKEND: {backend!r}")
+
+    @staticmethod
+    def channel(cv_id):
+        """Pub/sub channel name for a CV."""
+        return f"cv-updates:{cv_id}"
+
+    def publish(self, cv, sections=(), removed=(), reload=False):
+        """
+        Announce a committed change to a CV.
+
+        Fragments are only rendered when someone is listening. Errors are
+        logged and swallowed: the write has already succeeded.
+
+        Args:
+            cv: CV model instance
+            sections: CVSection rows that were created or updated
+            removed: Ids of deleted sections
+            reload: Whether the whole preview must be reloaded (e.g., template change)
+        """
+        if not self.enabled:
+            return
+
+        from app.cv.preview import preview_version, render_section_fragment, SECTION_MACROS
+
+        channel = self.channel(cv.id)
+        try:
+            if not self.broker.has_subscribers(channel):
+                return
+
+            fragments = {}
+            for section in sections:
+                if section.section_type in SECTION_MACROS:
+                    fragments[section.id] = render_section_fragment(section, cv.template_slug)
+                else:
+                    reload = True
+
+            self.broker.publish(channel, {
+                "version": preview_version(cv),
+                "fragments": fragments,
+                "removed": list(removed),
+                "reload": reload,
+            })
+        except Exception as e:
+            self.app.logger.warning(f"Live update for CV {cv.id} not published: {e}")
+
+    def acquire_stream(self):
+        """
+        Reserve one of this process's stream slots.
+
+        Streams hold a (sync or gthread) worker thread for up to
+        max_stream_seconds, so they are capped to keep threads free for
+        other requests.
+
+        Returns:
+            bool: False if max_streams streams are already open
+        """
+        with self._streams_lock:
+            if self._streams >= self.max_streams:
+                return False
+            self._streams += 1
+            return True
+
+    def release_stream(self):
+        """Free a slot taken by acquire_stream()."""
+        with self._streams_lock:
+            self._streams = max(self._streams - 1, 0)
+
+    def stream(self, cv_id):
+        """
+        Yield SSE-formatted events for a CV until the stream times out.
+
+        The stream ends after max_stream_seconds so a thread is not held
+        forever; EventSource reconnects on its own.
+        """
+        subscription = self.broker.subscribe(self.channel(cv_id))
+        deadline = time.monotonic() + self.max_stream_seconds
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield "retry: 2000\n\n"
+            while time.monotonic() < deadline:
+                message = subscription.get(timeout=self.heartbeat)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: update\ndata: {json.dumps(message)}\n\n"
+        finally:
+            subscription.close()
+
+
+live_updates = LiveUpdates()
+
+
+def init_live_updates(app):
+    """Initialize live preview updates from app config."""
+    live_updates.init_app(app)
+    return live_updates
@@ -1,46 +1,148 @@
 """
 PDF generation using WeasyPrint.
 """
-from flask import render_template
+from flask import current_app
 import io
+import os
 
-# Try to import WeasyPrint, but make it optional
-try:
-    from weasyprint import HTML
-    WEASYPRINT_AVAILABLE = True
-except (ImportError, OSError) as e:
-    WEASYPRINT_AVAILABLE = False
-    print(f"WeasyPrint not available: {e}")
-    print("PDF generation will be disabled. App will still work!")
+from app.cv.render_cache import pdf_cache, compute_cache_key
+from app.cv.render_context import render_context
+from app.cv.asset_fetcher import get_url_fetcher, ASSET_BASE_URL
+from app.cv.render_engine import render_engine, UNAVAILABLE_MESSAGE
+from app.cv.preview import build_cv_view, render_preview
+from app.cv.timing import phase
 
 
 def generate_pdf(cv, template_slug):
     """
     Generate PDF from CV using specified template.
 
+    Rendered PDFs are cached by content hash, so downloading an unchanged
+    CV again costs a hash and a cache lookup instead of a full render. With
+    the filesystem cache backend WeasyPrint writes straight into the cache
+    directory and the caller streams the file, so memory per download stays
+    flat regardless of document size.
+
+    Args:
+        cv: CV model instance or CVView
+        template_slug: Template identifier (e.g., 'ats_clean')
+
+    Returns:
+        tuple: (path to the cached PDF or BytesIO with PDF data, cache key)
+
+    Raises:
+        RuntimeError: If WeasyPrint is not available
+        UnknownTemplateError: If the template is not registered or has no HTML file
+    """
+    # One section query serves both the cache key and the render
+    cv = build_cv_view(cv)
+    with phase("cache_key"):
+        cache_key = compute_cache_key(cv, template_slug, sections=cv.sections)
+
+    if pdf_cache.is_filesystem:
+        with phase("cache"):
+            path = pdf_cache.get_path(cache_key)
+        if path is None:
+            _require_engine()
+            tmp_path = pdf_cache.temp_path(cache_key)
+            try:
+                html_to_pdf(**build_render_args(cv, template_slug), target=tmp_path)
+                path = pdf_cache.store_file(cache_key, tmp_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        else:
+            current_app.logger.debug(f"PDF cache hit for CV {cv.id} ({cache_key[:12]})")
+        return path, cache_key
+
+    with phase("cache"):
+        pdf_bytes = pdf_cache.get(cache_key)
+    if pdf_bytes is None:
+        _require_engine()
+        pdf_bytes = render_pdf(cv, template_slug)
+        pdf_cache.set(cache_key, pdf_bytes)
+    else:
+        current_app.logger.debug(f"PDF cache hit for CV {cv.id} ({cache_key[:12]})")
+
+    return io.BytesIO(pdf_bytes), cache_key
+
+
+def _require_engine():
+    """Fail a cache miss before the template is rendered when there is nothing to lay it out."""
+    if not render_engine.available:
+        raise RuntimeError(UNAVAILABLE_MESSAGE)
+
+
+def render_pdf(cv, template_slug):
+    """
+    Render a CV to PDF bytes, bypassing the cache.
+
     Args:
         cv: CV model instance
         template_slug: Template identifier (e.g., 'ats_clean')
 
     Returns:
-        BytesIO object containing PDF data
+        bytes: PDF data
 
     Raises:
         RuntimeError: If WeasyPrint is not available
     """
-    if not WEASYPRINT_AVAILABLE:
-        raise RuntimeError(
-            "PDF generation is not available. "
-            "WeasyPrint requires GTK libraries which are not installed. "
-            "See SETUP.md for installation instructions."
-        )
+    return html_to_pdf(**build_render_args(cv, template_slug))
+
+
+def build_render_args(cv, template_slug):
+    """
+    Render the HTML that WeasyPrint lays out for a CV.
+
+    The template's inline <style> is left out; html_to_pdf() applies the
+    CV's compiled theme, pre-parsed by the render context, instead.
+
+    Args:
+        cv: CV model instance or CVView
+        template_slug: Template identifier (e.g., 'ats_clean')
+
+    Returns:
+        dict: Keyword arguments for html_to_pdf()
+    """
+    return {
+        "html_content": render_preview(cv, template_slug, external_styles=True),
+        "template_slug": template_slug,
+        "primary_color": cv.primary_color,
+        "font_pair": cv.font_pair,
+    }
 
-    # Render HTML template with CV data
-    template_name = f'cv_templates/{template_slug}.html'
-    html_content = render_template(template_name, cv=cv)
 
-    # Generate PDF with WeasyPrint
-    pdf_bytes = HTML(string=html_content).write_pdf()
+def html_to_pdf(html_content, template_slug, primary_color=None, font_pair=None, target=None, first_page_only=False):
+    """
+    Lay out rendered HTML as a PDF.
+
+    Needs no app context, so it can run in a render worker process.
+
+    Args:
+        html_content: HTML string from build_render_args()
+        template_slug: Template whose stylesheet to apply
+        primary_color: CV primary color
+        font_pair: CV font pair
+        target: Optional path or binary file object to write the PDF into
+        first_page_only: Lay out the whole document but keep only page 1 (for thumbnails)
+
+    Returns:
+        bytes: PDF data, or None when written to target
+
+    Raises:
+        RuntimeError: If WeasyPrint is not available
+    """
+    # Imports WeasyPrint on first use in lazy mode; raises RuntimeError if unavailable
+    HTML = render_engine.weasyprint.HTML
 
-    # Return as BytesIO object
-    return io.BytesIO(pdf_bytes)
+    # Assets resolve from the in-memory map; no network or disk access during layout
+    # Phases are recorded when rendering inside a timed request, not in worker processes
+    with phase("css"):
+        stylesheet = render_context.stylesheet(template_slug, primary_color, font_pair)
+    with phase("layout"):
+        html = HTML(string=html_content, base_url=ASSET_BASE_URL, url_fetcher=get_url_fetcher())
+        document = html.render(stylesheets=[stylesheet], font_config=render_context.font_config)
+    if first_page_only:
+        document = document.copy(document.pages[:1])
+    with phase("pdf_write"):
+        return document.write_pdf(target)
@@ -0,0 +1,168 @@
+"""
+Speculative PDF pre-rendering.
+After an edit, a CV is rendered into the PDF cache in the background once it
+has been idle for PRERENDER_DELAY seconds, so the next download is a cache
+hit. A newer edit restarts the idle timer and cancels a render that is still
+queued for the same CV; each user has at most PRERENDER_MAX_PER_USER
+pre-renders on the pool at a time.
+
+Timers live in the web process. With several gunicorn workers, edits to one
+CV may schedule a timer in each of them; every timer renders the CV as it is
+in the database when it fires, so they agree on the cache key and the later
+ones find the PDF already cached.
+"""
+import threading
+from collections import defaultdict
+
+
+class PrerenderScheduler:
+    """Debounced per-CV timers feeding the render pool."""
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.delay = 5.0
+        self.max_per_user = 1
+        self._timers = {}  # cv_id -> threading.Timer
+        self._futures = {}  # cv_id -> RenderFuture submitted to the pool
+        self._in_flight = defaultdict(set)  # user_id -> cv_ids rendering
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure the scheduler from app config."""
+        self.app = app
+        self.enabled = app.config["PRERENDER_ENABLED"]
+        self.delay = app.config["PRERENDER_DELAY"]
+        self.max_per_user = app.config["PRERENDER_MAX_PER_USER"]
+
+    def schedule(self, cv_id, user_id):
+        """
+        Pre-render a CV once it has been idle for `delay` seconds.
+
+        Restarts the idle timer if one is already running for this CV and
+        cancels a render of an older version that has not started yet.
+
+        Args:
+            cv_id: CV that was edited
+            user_id: Owner (for the per-user cap)
+        """
+        if not self.enabled:
+            return
+
+        timer = threading.Timer(self.delay, self._fire, args=(cv_id, user_id))
+        timer.daemon = True
+
+        with self._lock:
+            previous = self._timers.pop(cv_id, None)
+            if previous is not None:
+                previous.cancel()
+            future = self._futures.get(cv_id)
+            self._timers[cv_id] = timer
+
+        if future is not None:
+            # Succeeds only while the render is still queued; a running one is left
+            # to finish. Cancelling runs _release, so it must happen outside the lock.
+            future.cancel()
+        timer.start()
+
+    def cancel(self, cv_id):
+        """Drop any pending pre-render for a CV (e.g., when it is deleted)."""
+        with self._lock:
+            timer = self._timers.pop(cv_id, None)
+            if timer is not None:
+                timer.cancel()
+            future = self._futures.get(cv_id)
+
+        if future is not None:
+            future.cancel()
+
+    def _fire(self, cv_id, user_id):
+        """Timer callback: submit the render if the user is under the cap."""
+        with self._lock:
+            if self._timers.get(cv_id) is not threading.current_thread():
+                # Superseded by a newer edit
+                return
+            del self._timers[cv_id]
+
+            if len(self._in_flight[user_id]) >= self.max_per_user:
+                # Try again after another idle period instead of piling onto the pool
+                retry = True
+            else:
+                retry = False
+                self._in_flight[user_id].add(cv_id)
+
+        if retry:
+            self.schedule(cv_id, user_id)
+            return
+
+        future = None
+        try:
+            with self.app.app_context():
+                future = self._submit(cv_id)
+        except Exception as e:
+            self.app.logger.warning(f"Pre-render of CV {cv_id} not started: {e}")
+
+        if future is None:
+            self._release(cv_id, user_id, None)
+            return
+
+        with self._lock:
+            self._futures[cv_id] = future
+        future.add_done_callback(lambda f: self._release(cv_id, user_id, f))
+
+    def _submit(self, cv_id):
+        """
+        Submit the CV's current state to the render pool. Runs in an app context.
+
+        Returns:
+            RenderFuture or None if there is nothing to render
+        """
+        from app.extensions import db
+        from app.models import CV
+        from app.cv.pdf_generator import build_render_args
+        from app.cv.preview import build_cv_view
+        from app.cv.render_cache import pdf_cache, compute_cache_key
+        from app.cv.render_engine import render_engine
+        from app.cv.render_jobs import render_queue
+        from app.cv.template_registry import template_registry
+
+        cv = db.session.get(CV, cv_id)
+        if cv is None or cv.is_deleted or cv.template_slug not in template_registry:
+            return None
+        if not render_engine.available:
+            return None
+
+        view = build_cv_view(cv)
+        cache_key = compute_cache_key(cv, cv.template_slug, sections=view.sections)
+        if pdf_cache.has(cache_key):
+            return None
+
+        return render_queue.submit(cache_key, lambda: build_render_args(view, view.template_slug))
+
+    def _release(self, cv_id, user_id, future):
+        """Free the user's pre-render slot once a render finishes or is cancelled."""
+        with self._lock:
+            if future is None or self._futures.get(cv_id) is future:
+                self._futures.pop(cv_id, None)
+            self._in_flight[user_id].discard(cv_id)
+            if not self._in_flight[user_id]:
+                del self._in_flight[user_id]
+
+        if future is not None and not future.cancelled() and future.exception() is not None:
+            self.app.logger.warning(f"Pre-render of CV {cv_id} failed: {future.exception()}")
+
+    def shutdown(self):
+        """Cancel all pending timers."""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+
+prerender_scheduler = PrerenderScheduler()
+
+
+def init_prerender(app):
+    """Initialize the pre-render scheduler from app config."""
+    prerender_scheduler.init_app(app)
+    return prerender_scheduler
@@ -1,21 +1,208 @@
 """
 Live preview renderer.
 Generates HTML preview for the builder interface.
+
+Templates receive a CVView instead of the CV model: the sections come from
+the CV's snapshot column (or, without one, one ordered query) and are grouped
+by type up front, so a render costs the same number of queries however many
+sections the CV has.
 """
-from flask import render_template
+import hashlib
+
+from flask import render_template, get_template_attribute, url_for
+
+from app.cv.timing import phase
+
+# Section types with a macro in cv_templates/sections/<slug>.html
+SECTION_MACROS = ("personal", "summary", "experience", "education", "skills")
+
+
+class SectionView:
+    """Plain copy of a CVSection row for templates."""
+
+    __slots__ = ("id", "section_type", "label", "content", "display_order", "is_visible")
+
+    def __init__(self, section):
+        self.id = section.id
+        self.section_type = section.section_type
+        self.label = section.label
+        self.content = section.content or {}
+        self.display_order = section.display_order
+        self.is_visible = section.is_visible
+
+    @classmethod
+    def from_snapshot(cls, entry):
+        """Build a view from a CV snapshot's section entry."""
+        view = cls.__new__(cls)
+        for field in cls.__slots__:
+            setattr(view, field, entry[field])
+        return view
 
 
-def render_preview(cv, template_slug):
+def snapshot_sections(cv):
     """
-    Render CV preview HTML.
+    Get a CV's sections from its snapshot, without querying cv_sections.
 
     Args:
         cv: CV model instance
+
+    Returns:
+        list: SectionViews in display order, or None if the CV has no current snapshot
+    """
+    from app.cv.snapshot import current_snapshot
+
+    snapshot = current_snapshot(cv)
+    if snapshot is None:
+        return None
+    return [SectionView.from_snapshot(entry) for entry in snapshot["sections"]]
+
+
+class CVView:
+    """
+    Read-only view of a CV and its sections, grouped by type.
+
+    Templates use cv.section('summary') for single sections and
+    cv.sections_of('experience') for repeated ones.
+    """
+
+    def __init__(self, cv, sections):
+        self.id = cv.id
+        self.user_id = cv.user_id
+        self.title = cv.title
+        self.template_slug = cv.template_slug
+        self.primary_color = cv.primary_color
+        self.font_pair = cv.font_pair
+        self.updated_at = cv.updated_at
+        self.sections = [s if isinstance(s, SectionView) else SectionView(s) for s in sections]
+
+        self._by_type = {}
+        for section in self.sections:
+            self._by_type.setdefault(section.section_type, []).append(section)
+
+    def section(self, section_type):
+        """Get the first section of a type, or None."""
+        sections = self._by_type.get(section_type)
+        return sections[0] if sections else None
+
+    def sections_of(self, section_type):
+        """Get all sections of a type in display order."""
+        return self._by_type.get(section_type, [])
+
+
+def build_cv_view(cv, sections=None):
+    """
+    Build the template view model for a CV.
+
+    Args:
+        cv: CV model instance (a CVView is returned unchanged)
+        sections: Optional pre-loaded list of the CV's sections in display order
+
+    Returns:
+        CVView
+    """
+    if isinstance(cv, CVView):
+        return cv
+    if sections is None:
+        sections = snapshot_sections(cv)
+    if sections is None:
+        # One query; the relationship orders by display_order
+        sections = cv.sections.all()
+    return CVView(cv, sections)
+
+
+def render_preview(cv, template_slug, **context):
+    """
+    Render CV preview HTML.
+
+    Args:
+        cv: CV model instance or CVView
         template_slug: Template identifier
+        **context: Extra template variables (e.g., external_styles)
 
     Returns:
         str: Rendered HTML content
     """
-    # TODO: Implement in Phase 1
-    # return render_template(f'cv_templates/{template_slug}.html', cv=cv)
-    pass
+    cv = build_cv_view(cv)
+    with phase("jinja"):
+        return render_template(f'cv_templates/{template_slug}.html', cv=cv, **context)
+
+
+def theme_stylesheet_url(cv):
+    """
+    Get the versioned URL of a CV's compiled theme stylesheet.
+
+    The digest of the compiled CSS is part of the URL, so the stylesheet can
+    be cached for good and a theme change simply links a different URL.
+
+    Args:
+        cv: CV model instance or CVView
+
+    Returns:
+        str: URL of the theme_css endpoint
+    """
+    from app.cv.theme import theme_compiler, normalize_theme
+
+    _, digest = theme_compiler.get(cv.template_slug, cv.primary_color, cv.font_pair)
+    color, fonts = normalize_theme(cv.primary_color, cv.font_pair)
+    return url_for(
+        "cv.theme_css",
+        template_slug=cv.template_slug,
+        color=color.lstrip("#") if color else None,
+        fonts=fonts,
+        v=digest,
+    )
+
+
+def render_section_fragment(section, template_slug):
+    """
+    Render one section's HTML with the template's section macro.
+
+    Args:
+        section: CVSection model instance
+        template_slug: Template identifier
+
+    Returns:
+        str: HTML for the section; empty if the section renders nothing
+
+    Raises:
+        ValueError: If the section type has no macro
+    """
+    if section.section_type not in SECTION_MACROS:
+        raise ValueError(f"No fragment macro for section type {section.section_type!r}")
+
+    with phase("jinja"):
+        macro = get_template_attribute(f"cv_templates/sections/{template_slug}.html", section.section_type)
+        return str(macro(SectionView(section))).strip()
+
+
+def preview_version(cv):
+    """
+    Compute a cheap version token for a CV's rendered preview.
+
+    Uses the CV's snapshot hash, which changes with any section or metadata
+    change, plus the template source hash so template changes invalidate old
+    previews. CVs without a snapshot fall back to one aggregate query over the
+    sections (newest updated_at and count, so deletions count too).
+
+    Args:
+        cv: CV model instance
+
+    Returns:
+        str: Hex token, usable as an ETag
+    """
+    from app.extensions import db
+    from app.models import CVSection
+    from app.cv.render_cache import template_version
+    from app.cv.snapshot import current_snapshot
+
+    if current_snapshot(cv) is not None:
+        payload = f"{cv.id}:{cv.template_slug}:{template_version(cv.template_slug)}:{cv.snapshot_hash}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    with phase("version"):
+        latest, count = db.session.query(
+            db.func.max(CVSection.updated_at), db.func.count(CVSection.id)
+        ).filter(CVSection.cv_id == cv.id).one()
+
+    payload = f"{cv.id}:{cv.template_slug}:{template_version(cv.template_slug)}:{cv.updated_at}:{latest}:{count}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
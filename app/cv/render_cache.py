@@ -0,0 +1,321 @@
+"""
+Content-addressed cache for rendered CV output.
+Rendered PDFs are keyed by a hash of everything that affects the output,
+so repeat downloads of an unchanged CV skip WeasyPrint entirely.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from app.utils.security import app_directory
+
+# Bump when the key payload or the rendering pipeline changes shape
+CACHE_FORMAT_VERSION = 2
+
+
+def template_version(template_slug):
+    """
+    Get a short hash of a CV template's source, including its section macros.
+
+    Args:
+        template_slug: Template identifier (e.g., 'ats_clean')
+
+    Returns:
+        str: 16 hex chars from the template registry
+
+    Raises:
+        UnknownTemplateError: If the template is not registered or has no HTML file
+    """
+    from app.cv.template_registry import template_registry
+
+    return template_registry.require(template_slug).version
+
+
+def compute_cache_key(cv, template_slug, sections=None):
+    """
+    Hash everything that affects a CV's rendered output.
+
+    Args:
+        cv: CV model instance
+        template_slug: Template identifier
+        sections: Optional pre-loaded list of CVSection rows (avoids a query)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    if sections is None:
+        from app.cv.preview import build_cv_view
+
+        sections = build_cv_view(cv).sections
+
+    payload = {
+        "format": CACHE_FORMAT_VERSION,
+        "template_slug": template_slug,
+        "template_version": template_version(template_slug),
+        "title": cv.title,
+        "primary_color": cv.primary_color,
+        "font_pair": cv.font_pair,
+        "sections": [
+            [
+                section.section_type,
+                section.label,
+                section.content,
+                section.display_order,
+                section.is_visible,
+            ]
+            for section in sections
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Size-bounded LRU cache for rendered documents.
+
+    Two backends are supported:
+    - "filesystem": one file per key under a local directory, evicted
+      least-recently-used first once the directory exceeds its byte budget.
+      Several gunicorn workers can share the directory; each keeps its own
+      index and treats a file evicted by another worker as a miss.
+    - "flask-caching": bytes stored in the configured Flask-Caching backend,
+      which then owns eviction (Redis maxmemory policy, SimpleCache threshold).
+    """
+
+    def __init__(self, config_prefix, suffix, dir_name):
+        self.config_prefix = config_prefix
+        self.suffix = suffix
+        self.dir_name = dir_name  # under the instance path unless <prefix>_DIR is set
+        self.backend = "filesystem"
+        self.directory = None
+        self.max_bytes = 0
+        self.timeout = None
+        self._index = OrderedDict()  # key -> size in bytes, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def init_app(self, app):
+        """Configure the cache from app config."""
+        prefix = self.config_prefix
+        self.backend = app.config[f"{prefix}_BACKEND"]
+        self.max_bytes = app.config[f"{prefix}_MAX_BYTES"]
+        self.timeout = app.config[f"{prefix}_TIMEOUT"]
+
+        if self.backend == "filesystem":
+            # Files here are served to users: never a directory others can write to
+            self.directory = app_directory(app, f"{prefix}_DIR", self.dir_name)
+            self._load_index()
+        elif self.backend != "flask-caching":
+            raise ValueError(f"Unknown {prefix}_BACKEND: {self.backend!r}")
+
+    def _load_index(self):
+        """Rebuild the LRU index from files already on disk."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, name[: -len(self.suffix)], stat.st_size))
+
+        with self._lock:
+            self._index.clear()
+            self._size = 0
+            for _, key, size in sorted(entries):
+                self._index[key] = size
+                self._size += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _cache_key(self, key):
+        return f"{self.config_prefix.lower()}:{key}"
+
+    def _record(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    @property
+    def is_filesystem(self):
+        """Whether entries are files that can be streamed straight from disk."""
+        return self.backend == "filesystem"
+
+    def get(self, key):
+        """
+        Look up rendered bytes.
+
+        Args:
+            key: Content hash from compute_cache_key()
+
+        Returns:
+            bytes or None on a miss
+        """
+        if not self.is_filesystem:
+            from app.extensions import cache
+
+            data = cache.get(self._cache_key(key))
+            self._record("hits" if data is not None else "misses")
+            return data
+
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+
+    def has(self, key):
+        """Check whether a key is cached without reading the entry."""
+        if self.is_filesystem:
+            return self.get_path(key) is not None
+
+        from app.extensions import cache
+
+        found = cache.has(self._cache_key(key))
+        self._record("hits" if found else "misses")
+        return found
+
+    def get_path(self, key):
+        """
+        Look up a cached file without reading it (filesystem backend only).
+
+        Args:
+            key: Content hash from compute_cache_key()
+
+        Returns:
+            str path or None on a miss
+        """
+        path = self._path(key)
+        try:
+            # Touch the file so LRU order survives restarts and is shared across workers
+            os.utime(path)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            self._forget(key)
+            self._record("misses")
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                self._index[key] = size
+                self._size += size
+        return path
+
+    def _forget(self, key):
+        with self._lock:
+            size = self._index.pop(key, None)
+            if size is not None:
+                self._size -= size
+
+    def temp_path(self, key):
+        """
+        Get a unique scratch path in the cache directory for rendering into.
+
+        Pass it to store_file() once the render has finished so readers
+        never see a partial file.
+        """
+        return os.path.join(self.directory, f".{key}.{uuid.uuid4().hex}.tmp")
+
+    def store_file(self, key, tmp_path):
+        """
+        Adopt a rendered file from temp_path() as the entry for key.
+
+        Args:
+            key: Content hash from compute_cache_key()
+            tmp_path: Finished file in the cache directory
+
+        Returns:
+            str: Path of the cached file
+        """
+        path = self._path(key)
+        os.replace(tmp_path, path)
+        self._add(key, os.path.getsize(path))
+        return path
+
+    def set(self, key, data):
+        """
+        Store rendered bytes.
+
+        Args:
+            key: Content hash from compute_cache_key()
+            data: Rendered document bytes
+        """
+        if not self.is_filesystem:
+            from app.extensions import cache
+
+            cache.set(self._cache_key(key), data, timeout=self.timeout)
+            self._record("stores")
+            return
+
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        self.store_file(key, tmp_path)
+
+    def _add(self, key, size):
+        """Index a newly stored file and evict older entries over budget."""
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._size -= previous
+            self._index[key] = size
+            self._size += size
+            self._stats["stores"] += 1
+            evicted = self._evict_locked()
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def _evict_locked(self):
+        """
+        Drop least-recently-used entries until under budget. Caller holds the lock.
+
+        The newest entry is always kept, even if it alone exceeds the budget,
+        so a file that was just stored can still be sent.
+        """
+        evicted = []
+        while self._size > self.max_bytes and len(self._index) > 1:
+            old_key, size = self._index.popitem(last=False)
+            self._size -= size
+            self._stats["evictions"] += 1
+            evicted.append(old_key)
+        return evicted
+
+    def stats(self):
+        """Get hit/miss counters for this process."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+            if self.backend == "filesystem":
+                stats["entries"] = len(self._index)
+                stats["size_bytes"] = self._size
+        stats["backend"] = self.backend
+        return stats
+
+
+pdf_cache = RenderCache("PDF_CACHE", suffix=".pdf", dir_name="pdf_cache")
+thumbnail_cache = RenderCache("THUMBNAIL_CACHE", suffix=".thumb", dir_name="thumbnails")
+
+
+def init_render_cache(app):
+    """Initialize render caches from app config."""
+    pdf_cache.init_app(app)
+    thumbnail_cache.init_app(app)
+    return pdf_cache
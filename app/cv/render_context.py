@@ -0,0 +1,104 @@
+"""
+Per-process WeasyPrint render context.
+Parses each compiled theme stylesheet and builds the font configuration once,
+then reuses them for every PDF rendered by this process.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from app.cv.asset_fetcher import asset_map, get_url_fetcher, ASSET_BASE_URL
+from app.cv.template_registry import load_templates
+from app.cv.theme import theme_compiler
+
+# Parsed stylesheets kept per process, one per (template, color, font pair)
+MAX_STYLESHEETS = 64
+
+
+def available_template_slugs():
+    """List slugs of the registered CV templates that have an HTML file."""
+    return [template.slug for template in load_templates().values() if template.available]
+
+
+class RenderContext:
+    """Shared FontConfiguration and parsed theme CSS, keyed by the compiled theme's digest."""
+
+    def __init__(self, max_stylesheets=MAX_STYLESHEETS):
+        self.max_stylesheets = max_stylesheets
+        self._font_config = None
+        self._stylesheets = OrderedDict()  # theme digest -> weasyprint.CSS, oldest first
+        self._lock = threading.Lock()
+
+    @property
+    def font_config(self):
+        """Get the process-wide WeasyPrint FontConfiguration."""
+        if self._font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+
+            with self._lock:
+                if self._font_config is None:
+                    self._font_config = FontConfiguration()
+        return self._font_config
+
+    def stylesheet(self, template_slug, primary_color=None, font_pair=None):
+        """
+        Get the parsed theme stylesheet for a template.
+
+        Args:
+            template_slug: Template identifier
+            primary_color: CV primary color
+            font_pair: CV font pair
+
+        Returns:
+            weasyprint.CSS
+        """
+        css_text, key = theme_compiler.get(template_slug, primary_color, font_pair)
+        with self._lock:
+            css = self._stylesheets.get(key)
+            if css is not None:
+                self._stylesheets.move_to_end(key)
+                return css
+
+        from app.cv.render_engine import render_engine
+
+        CSS = render_engine.weasyprint.CSS
+        font_config = self.font_config
+        with self._lock:
+            css = self._stylesheets.get(key)
+            if css is None:
+                css = CSS(
+                    string=css_text,
+                    base_url=ASSET_BASE_URL,
+                    url_fetcher=get_url_fetcher(),
+                    font_config=font_config,
+                )
+                self._stylesheets[key] = css
+                while len(self._stylesheets) > self.max_stylesheets:
+                    self._stylesheets.popitem(last=False)
+        return css
+
+    def warm_up(self, template_slugs=None):
+        """
+        Preload assets and parse stylesheets for every template ahead of the first render.
+
+        Args:
+            template_slugs: Templates to prepare (defaults to all shipped templates)
+
+        Returns:
+            float: Seconds spent
+        """
+        started = time.perf_counter()
+        asset_map.load()
+        for template_slug in template_slugs or available_template_slugs():
+            self.stylesheet(template_slug)
+        return time.perf_counter() - started
+
+    def clear(self):
+        """Drop all cached objects (used by benchmarks to measure cold renders)."""
+        with self._lock:
+            self._font_config = None
+            self._stylesheets.clear()
+        theme_compiler.reload()
+
+
+render_context = RenderContext()
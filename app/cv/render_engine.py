@@ -0,0 +1,150 @@
+"""
+WeasyPrint engine loader.
+Importing WeasyPrint pulls in Pango and runs font discovery, which takes
+long enough to matter. In "lazy" mode the import happens on the first PDF
+render, keeping boot fast. In "eager" mode create_app imports it and renders
+a tiny warm-up document, so with gunicorn --preload every worker forks with
+the engine already loaded.
+"""
+import importlib.util
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ENGINE_MODES = ("lazy", "eager")
+
+WARM_UP_HTML = "<html><body><p>Warm-up</p></body></html>"
+
+UNAVAILABLE_MESSAGE = (
+    "PDF generation is not available. "
+    "WeasyPrint requires GTK libraries which are not installed. "
+    "See SETUP.md for installation instructions."
+)
+
+
+class RenderEngine:
+    """Loads WeasyPrint once per process and records how long it took."""
+
+    def __init__(self):
+        self.mode = "lazy"
+        self._module = None
+        self._loaded = False
+        self._error = None
+        self._import_seconds = None
+        self._warm_up_seconds = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Import WeasyPrint if that has not been attempted yet.
+
+        Returns:
+            bool: Whether the engine is available
+        """
+        if self._loaded:
+            return self._module is not None
+
+        with self._lock:
+            if not self._loaded:
+                started = time.perf_counter()
+                try:
+                    import weasyprint
+
+                    self._module = weasyprint
+                except (ImportError, OSError) as e:
+                    self._error = str(e)
+                    logger.warning(f"WeasyPrint not available, PDF generation disabled: {e}")
+                self._import_seconds = time.perf_counter() - started
+                self._loaded = True
+        return self._module is not None
+
+    @property
+    def available(self):
+        """Whether PDFs can be rendered in this process (imports on first access)."""
+        return self.load()
+
+    @property
+    def installed(self):
+        """
+        Whether WeasyPrint looks usable, without importing it.
+
+        The import result once the engine is loaded, else whether the package
+        can be found (for callers that only queue renders for other processes).
+        """
+        if self._loaded:
+            return self._module is not None
+        return importlib.util.find_spec("weasyprint") is not None
+
+    @property
+    def weasyprint(self):
+        """
+        Get the weasyprint module.
+
+        Raises:
+            RuntimeError: If WeasyPrint is not available
+        """
+        if not self.load():
+            raise RuntimeError(UNAVAILABLE_MESSAGE)
+        return self._module
+
+    def warm_up(self):
+        """
+        Import the engine, prepare the render context and render a tiny document.
+
+        Returns:
+            bool: Whether the engine is available
+        """
+        if not self.load():
+            return False
+
+        from app.cv.render_context import render_context
+
+        started = time.perf_counter()
+        render_context.warm_up()
+        self._module.HTML(string=WARM_UP_HTML).write_pdf(font_config=render_context.font_config)
+        self._warm_up_seconds = time.perf_counter() - started
+        return True
+
+    def status(self):
+        """Get availability and timing information for monitoring."""
+        return {
+            "mode": self.mode,
+            "loaded": self._loaded,
+            "available": self._module is not None if self._loaded else None,
+            "error": self._error,
+            "import_ms": round(self._import_seconds * 1000, 1) if self._import_seconds is not None else None,
+            "warm_up_ms": round(self._warm_up_seconds * 1000, 1) if self._warm_up_seconds is not None else None,
+        }
+
+
+render_engine = RenderEngine()
+
+
+def init_render_engine(app):
+    """Load the PDF engine now or on first use, depending on PDF_ENGINE_MODE."""
+    mode = app.config["PDF_ENGINE_MODE"]
+    if mode not in ENGINE_MODES:
+        raise ValueError(f"Unknown PDF_ENGINE_MODE: {mode!r}")
+    render_engine.mode = mode
+
+    if mode == "eager":
+        if render_engine.warm_up():
+            status = render_engine.status()
+            app.logger.info(
+                f"PDF engine ready (import {status['import_ms']}ms, warm-up {status['warm_up_ms']}ms)"
+            )
+        else:
+            app.logger.warning("PDF engine unavailable; downloads will fall back to browser printing")
+
+    return render_engine
+
+
+def warm_up_worker():
+    """ProcessPoolExecutor initializer: load the engine before the first job arrives."""
+    try:
+        render_engine.warm_up()
+    except Exception as e:
+        # A failing initializer would break the whole pool; let jobs report the error
+        logger.warning(f"PDF render worker warm-up failed: {e}")
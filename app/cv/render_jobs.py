@@ -0,0 +1,287 @@
+"""
+Background PDF render jobs.
+Jinja rendering stays in the request because it needs the database session;
+WeasyPrint layout, the CPU-heavy part, runs in a bounded process pool so it
+never holds a web thread or runs into the gunicorn worker timeout.
+
+Job records are small JSON files in a shared directory, so any gunicorn
+worker can answer a status request for a job enqueued by another one.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from app.cv.render_cache import pdf_cache
+from app.utils.security import app_directory
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class QueueFullError(RuntimeError):
+    """Raised when too many render jobs are already pending."""
+
+
+class RenderFuture(Future):
+    """Future for a pooled render that can be cancelled while it is still queued."""
+
+    def __init__(self):
+        super().__init__()
+        self.pool_future = None
+
+    def cancel(self):
+        """Cancel the render if no worker has picked it up yet."""
+        if self.pool_future is None or not self.pool_future.cancel():
+            return False
+        return super().cancel()
+
+
+def _write_job(job_dir, job):
+    """Atomically write a job record."""
+    path = os.path.join(job_dir, f"{job['id']}.json")
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(job, f)
+    os.replace(tmp_path, path)
+
+
+def _read_job(job_dir, job_id):
+    try:
+        with open(os.path.join(job_dir, f"{job_id}.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _run_render_job(job_dir, job_id, render_args, target=None, render_func=None):
+    """
+    Render worker entry point (runs in a pool process).
+
+    Args:
+        job_dir: Directory holding job records
+        job_id: Job identifier, or None for renders without a job record
+        render_args: Keyword arguments for render_func
+        target: Optional path to write the output into instead of returning it
+        render_func: Module-level render function (defaults to html_to_pdf())
+
+    Returns:
+        bytes: Rendered data, or None when written to target
+    """
+    if render_func is None:
+        from app.cv.pdf_generator import html_to_pdf as render_func
+
+    job = _read_job(job_dir, job_id) if job_id else None
+    if job is not None:
+        job.update(status=STATUS_RUNNING, started_at=time.time())
+        _write_job(job_dir, job)
+
+    return render_func(**render_args, target=target)
+
+
+class RenderJobQueue:
+    """Bounded process pool plus file-backed job records."""
+
+    def __init__(self):
+        self.app = None
+        self.job_dir = None
+        self.max_workers = 2
+        self.max_pending = 16
+        self.job_ttl = 3600
+        self.start_method = "spawn"
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure the queue from app config."""
+        self.app = app
+        self.max_workers = app.config["RENDER_POOL_WORKERS"]
+        self.max_pending = app.config["RENDER_QUEUE_MAX_PENDING"]
+        self.job_ttl = app.config["RENDER_JOB_TTL"]
+        self.start_method = app.config["RENDER_POOL_START_METHOD"]
+        # Finished PDFs are served from here
+        self.job_dir = app_directory(app, "RENDER_JOB_DIR", "render_jobs")
+
+    def _get_executor(self):
+        """Create the process pool on first use (never in the gunicorn master)."""
+        if self._executor is None:
+            from app.cv.render_engine import warm_up_worker
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=warm_up_worker,
+            )
+        return self._executor
+
+    def enqueue(self, cv_id, user_id, cache_key, build_args):
+        """
+        Queue a PDF render.
+
+        If the PDF is already cached the job is created as done immediately.
+
+        Args:
+            cv_id: CV being rendered
+            user_id: Owner allowed to read the job
+            cache_key: Content hash the result is stored under
+            build_args: Callable returning html_to_pdf() arguments; only called on a cache miss
+
+        Returns:
+            dict: Job record
+
+        Raises:
+            QueueFullError: If max_pending jobs are already in flight
+        """
+        job = {
+            "id": str(uuid.uuid4()),
+            "cv_id": cv_id,
+            "user_id": user_id,
+            "cache_key": cache_key,
+            "status": STATUS_QUEUED,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+        if pdf_cache.has(cache_key):
+            job.update(status=STATUS_DONE, finished_at=time.time())
+            _write_job(self.job_dir, job)
+            return job
+
+        _write_job(self.job_dir, job)
+        self._prune_expired()
+
+        try:
+            future = self.submit(cache_key, build_args, job_id=job["id"])
+        except Exception:
+            os.remove(os.path.join(self.job_dir, f"{job['id']}.json"))
+            raise
+        future.add_done_callback(lambda f: self._finish_job(job["id"], f))
+        return job
+
+    def submit(self, cache_key, build_args, job_id=None, cache=None, render_func=None):
+        """
+        Render into a cache on the process pool (a PDF unless render_func says otherwise).
+
+        Args:
+            cache_key: Content hash the result is stored under
+            build_args: Callable returning render_func arguments
+            job_id: Optional job record to mark as running when the worker starts
+            cache: RenderCache to store the result in (defaults to pdf_cache)
+            render_func: Picklable module-level render function (defaults to html_to_pdf())
+
+        Returns:
+            RenderFuture: Resolves to True once the result is cached
+
+        Raises:
+            QueueFullError: If max_pending renders are already in flight
+        """
+        cache = cache or pdf_cache
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError("Too many PDF renders in progress. Please try again shortly.")
+            self._pending += 1
+
+        try:
+            render_args = build_args()
+
+            # With a filesystem cache the worker writes the PDF in place
+            # instead of pickling the bytes back to this process
+            target = cache.temp_path(cache_key) if cache.is_filesystem else None
+            pool_future = self._get_executor().submit(
+                _run_render_job, self.job_dir, job_id, render_args, target, render_func
+            )
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        stored = RenderFuture()
+        stored.pool_future = pool_future
+        pool_future.add_done_callback(lambda f: self._store_result(cache, cache_key, target, f, stored))
+        return stored
+
+    def _store_result(self, cache, cache_key, target, pool_future, stored):
+        """Move a finished render into the cache (runs on a pool thread)."""
+        with self._lock:
+            self._pending -= 1
+
+        if pool_future.cancelled():
+            Future.cancel(stored)
+            return
+
+        with self.app.app_context():
+            try:
+                data = pool_future.result()
+                if target is not None:
+                    cache.store_file(cache_key, target)
+                else:
+                    cache.set(cache_key, data)
+            except Exception as e:
+                if target is not None and os.path.exists(target):
+                    os.remove(target)
+                stored.set_exception(e)
+            else:
+                stored.set_result(True)
+
+    def _finish_job(self, job_id, future):
+        """Record a job's outcome."""
+        job = _read_job(self.job_dir, job_id) or {"id": job_id}
+        error = RuntimeError("Render was cancelled") if future.cancelled() else future.exception()
+        if error is None:
+            job.update(status=STATUS_DONE, error=None)
+        else:
+            self.app.logger.error(f"Render job {job_id} failed: {error}")
+            job.update(status=STATUS_FAILED, error=str(error))
+        job["finished_at"] = time.time()
+        _write_job(self.job_dir, job)
+
+    def get(self, job_id):
+        """
+        Get a job record.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            dict or None if unknown or expired
+        """
+        try:
+            uuid.UUID(job_id)
+        except ValueError:
+            return None
+        return _read_job(self.job_dir, job_id)
+
+    def _prune_expired(self):
+        """Delete job records older than job_ttl."""
+        cutoff = time.time() - self.job_ttl
+        for name in os.listdir(self.job_dir):
+            path = os.path.join(self.job_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self):
+        """Stop the process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render_queue = RenderJobQueue()
+
+
+def init_render_jobs(app):
+    """Initialize the render job queue from app config."""
+    render_queue.init_app(app)
+    return render_queue
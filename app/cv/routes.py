@@ -2,29 +2,51 @@
 CV management routes.
 Dashboard, editor, preview, and download endpoints.
 """
-from flask import render_template, redirect, url_for, flash, abort, request, jsonify, send_file, current_app
+from flask import render_template, redirect, url_for, flash, abort, request, jsonify, send_file, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 from app.cv import bp
-from app.extensions import db, limiter
+from app.extensions import db, limiter, cache
 from app.models import CV, CVSection, DownloadLog
+from app.cv.prerender import prerender_scheduler
+from app.cv.preview import build_cv_view, render_preview
+from app.cv.live_updates import live_updates
+from app.cv.template_registry import template_registry, DEFAULT_TEMPLATE
+from app.cv.timing import timed, phase
 import uuid
 
 
 @bp.route("/dashboard")
+@timed
 def dashboard():
-    """Display user's CV dashboard."""
+    """Display user's CV dashboard, one page of CV cards at a time."""
+    from markupsafe import Markup
+    from app.cv.dashboard import dashboard_cache, list_cvs
+    from app.cv.thumbnails import thumbnails
+
+    cursor = request.args.get("after")
+    # Guest users see empty dashboard
+    page = {"cards": "", "total": 0, "next": None}
+
     if current_user.is_authenticated:
-        cvs = CV.query.filter_by(
-            user_id=current_user.id,
-            is_deleted=False
-        ).order_by(CV.updated_at.desc()).all()
-    else:
-        # Guest users see empty dashboard
-        cvs = []
+        # Thumbnail keys and template names depend on the template files too
+        page = dashboard_cache.get(current_user.id, cursor, extra=template_registry.version)
+        if page is None:
+            cvs, next_cursor = list_cvs(current_user.id, cursor, current_app.config["DASHBOARD_PAGE_SIZE"])
+            thumbnail_keys, pending = thumbnails.lookup(cvs)
+            with phase("jinja"):
+                cards = render_template("dashboard/cv_cards.html", cvs=cvs, thumbnail_keys=thumbnail_keys)
+            page = {"cards": cards, "total": current_user.cv_count, "next": next_cursor}
+            # Pages showing a placeholder for a thumbnail still being rendered are not cached
+            if not pending:
+                dashboard_cache.set(current_user.id, cursor, page, extra=template_registry.version)
 
     return render_template(
         "dashboard/index.html",
-        cvs=cvs,
+        cards=Markup(page["cards"]),
+        has_cards=bool(page["cards"].strip()),
+        total_cvs=page["total"],
+        cursor=cursor,
+        next_cursor=page["next"],
         max_cvs=current_app.config["MAX_CVS_PER_USER"]
     )
 
@@ -34,14 +56,19 @@ def dashboard():
 def create_cv():
     """Create a new CV (requires authentication)."""
     title = request.form.get("title", "").strip()
-    template_slug = request.form.get("template_slug", "ats_clean")
+    template_slug = request.form.get("template_slug", DEFAULT_TEMPLATE)
 
     if not title:
         flash("CV title is required.", "error")
         return redirect(url_for("cv.dashboard"))
 
-    # Check CV limit
-    if not current_user.can_create_cv(current_app.config["MAX_CVS_PER_USER"]):
+    if template_slug not in template_registry:
+        flash("Please choose an available template.", "error")
+        return redirect(url_for("cv.dashboard"))
+
+    # Check and take a slot in the CV limit atomically (released on rollback)
+    if not current_user.reserve_cv_slot(current_app.config["MAX_CVS_PER_USER"]):
+        db.session.rollback()
         flash(f"You have reached the maximum limit of {current_app.config['MAX_CVS_PER_USER']} CVs.", "error")
         return redirect(url_for("cv.dashboard"))
 
@@ -87,7 +114,9 @@ def edit_cv(cv_id):
     if cv.is_deleted:
         abort(404)
 
-    return render_template("builder/editor.html", cv=cv)
+    return render_template(
+        "builder/editor.html", cv=build_cv_view(cv), live_updates_enabled=live_updates.enabled
+    )
 
 
 @bp.route("/<cv_id>/delete", methods=["POST"])
@@ -102,36 +131,171 @@ def delete_cv(cv_id):
 
     # Soft delete
     cv.soft_delete()
+    prerender_scheduler.cancel(cv.id)
 
     return jsonify({"success": True})
 
 
 @bp.route("/<cv_id>/preview")
 @limiter.limit("120/minute")
+@timed
 def preview_cv(cv_id):
     """Live preview endpoint (rendered HTML) - public access."""
+    from app.cv.preview import preview_version, theme_stylesheet_url
+
     cv = CV.query.get_or_404(cv_id)
 
     if cv.is_deleted:
         abort(404)
 
-    # Render CV template
-    template_name = f"cv_templates/{cv.template_slug}.html"
+    if cv.template_slug not in template_registry:
+        return f"<p>Error rendering preview: unknown template {cv.template_slug!r}</p>", 404
 
     try:
-        return render_template(template_name, cv=cv)
+        version = preview_version(cv)
+
+        # Unchanged since the iframe last loaded it: no section load, no render
+        if version in request.if_none_match:
+            return _preview_response(current_app.response_class(status=304), version)
+
+        cache_key = f"preview:{cv.id}:{version}"
+        with phase("cache"):
+            html = cache.get(cache_key)
+        if html is None:
+            html = render_preview(cv, cv.template_slug, theme_url=theme_stylesheet_url(cv))
+            cache.set(cache_key, html, timeout=current_app.config["PREVIEW_CACHE_TIMEOUT"])
     except Exception as e:
         return f"<p>Error rendering preview: {str(e)}</p>", 500
 
+    return _preview_response(current_app.response_class(html, mimetype="text/html"), version)
+
+
+@bp.route("/theme/<template_slug>.css")
+def theme_css(template_slug):
+    """Compiled theme stylesheet for a template, color and font pair - public access."""
+    from app.cv.theme import theme_compiler
+
+    if template_slug not in template_registry:
+        abort(404)
+
+    color = request.args.get("color")
+    css, digest = theme_compiler.get(
+        template_slug, f"#{color}" if color else None, request.args.get("fonts")
+    )
+
+    response = current_app.response_class(css, mimetype="text/css")
+    response.set_etag(digest)
+    if request.args.get("v") == digest:
+        # Versioned URL: the content behind it never changes
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config["THEME_CSS_MAX_AGE"]
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@bp.route("/<cv_id>/preview/sections/<section_id>")
+@limiter.limit("120/minute")
+def preview_section(cv_id, section_id):
+    """Render one section of the live preview for in-place patching - public access."""
+    from app.cv.preview import render_section_fragment
+
+    cv = CV.query.get_or_404(cv_id)
+
+    if cv.is_deleted:
+        abort(404)
+
+    section = CVSection.query.get_or_404(section_id)
+
+    if section.cv_id != cv.id:
+        abort(404)
+
+    try:
+        html = render_section_fragment(section, cv.template_slug)
+    except ValueError:
+        # The client falls back to reloading the whole preview
+        abort(404)
+
+    response = current_app.response_class(html, mimetype="text/html")
+    response.cache_control.no_store = True
+    return response
+
+
+@bp.route("/<cv_id>/events")
+@limiter.limit("30/minute")
+def preview_events(cv_id):
+    """Stream preview updates for a CV as Server-Sent Events - public access."""
+    cv = CV.query.get_or_404(cv_id)
+
+    if cv.is_deleted or not live_updates.enabled:
+        abort(404)
+
+    # Every stream holds a worker thread; when this worker is at its cap the
+    # EventSource fails and the editor fetches fragments after saves instead
+    if not live_updates.acquire_stream():
+        return Response("Too many live update streams", status=503, headers={"Retry-After": "60"})
+
+    # Release the database connection before the long-lived stream starts
+    db.session.remove()
+
+    response = Response(
+        live_updates.stream(cv_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(live_updates.release_stream)
+    return response
+
+
+def _preview_response(response, version):
+    """Tag a preview response so the browser revalidates it on every load."""
+    response.set_etag(version)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@bp.route("/<cv_id>/thumbnail/<key>")
+@login_required
+def cv_thumbnail(cv_id, key):
+    """Serve a CV's first-page thumbnail (requires authentication)."""
+    from app.cv.render_cache import thumbnail_cache
+    from app.cv.thumbnails import thumbnails
+    import io
+
+    cv = CV.query.get_or_404(cv_id)
+
+    # Verify ownership; only the current content hash is served
+    if cv.user_id != current_user.id or cv.is_deleted:
+        abort(404)
+    if key != thumbnails.key_for(cv):
+        abort(404)
+
+    if thumbnail_cache.is_filesystem:
+        image = thumbnail_cache.get_path(key)
+    else:
+        data = thumbnail_cache.get(key)
+        image = io.BytesIO(data) if data is not None else None
+
+    if image is None:
+        abort(404)
+
+    # The URL changes whenever the CV does, so the browser may keep it forever
+    response = send_file(image, mimetype=thumbnails.mimetype, conditional=True, etag=key, max_age=31536000)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
+
 
 @bp.route("/<cv_id>/download")
 @login_required
 @limiter.limit("5/hour")
+@timed
 def download_cv(cv_id):
     """Generate and download PDF (requires authentication)."""
     from app.cv.pdf_generator import generate_pdf
-    from datetime import datetime
-    import io
 
     cv = CV.query.get_or_404(cv_id)
 
@@ -140,35 +304,13 @@ def download_cv(cv_id):
         flash("You can only download your own CVs.", "error")
         abort(403)
 
-    try:
-        # Generate PDF
-        pdf_bytes = generate_pdf(cv, cv.template_slug)
-
-        # Log download with current user
-        DownloadLog.create_log(
-            cv=cv,
-            user=current_user,
-            ip_address=request.remote_addr,
-            salt=current_app.config["IP_HASH_SALT"]
-        )
-
-        # Generate filename
-        # Get personal info for name
-        personal_section = cv.sections.filter_by(section_type="personal").first()
-        if personal_section and personal_section.content.get("name"):
-            name = personal_section.content["name"].replace(" ", "_")
-        else:
-            name = cv.title.replace(" ", "_")
-
-        filename = f"{name}_CV_{datetime.now().strftime('%Y-%m')}.pdf"
-
-        return send_file(
-            pdf_bytes,
-            mimetype="application/pdf",
-            as_attachment=True,
-            download_name=filename
-        )
+    if cv.template_slug not in template_registry:
+        flash("This CV uses a template that is not available. Choose another template and try again.", "error")
+        return redirect(url_for("cv.edit_cv", cv_id=cv_id))
 
+    try:
+        # Generate PDF (or reuse the cached one)
+        pdf_file, cache_key = generate_pdf(cv, cv.template_slug)
     except RuntimeError as e:
         # WeasyPrint not available
         flash(str(e), "error")
@@ -179,24 +321,208 @@ def download_cv(cv_id):
         flash("Failed to generate PDF. Please try again.", "error")
         return redirect(url_for("cv.edit_cv", cv_id=cv_id))
 
+    # Log download with current user
+    DownloadLog.create_log(
+        cv=cv,
+        user=current_user,
+        ip_address=request.remote_addr,
+        salt=current_app.config["IP_HASH_SALT"]
+    )
+
+    # Outside the try: a 416 for an unsatisfiable Range is not a render failure
+    return _send_pdf(pdf_file, cache_key, cv)
+
+
+def _send_pdf(pdf_file, cache_key, cv):
+    """
+    Send a rendered PDF as an attachment.
+
+    Cached files are sent by path, so Werkzeug sets Content-Length, answers
+    Range and If-None-Match requests, and the server can use sendfile (or
+    X-Sendfile when USE_X_SENDFILE is on). The content hash is the ETag.
+    """
+    return send_file(
+        pdf_file,
+        mimetype="application/pdf",
+        as_attachment=True,
+        download_name=_pdf_filename(cv),
+        conditional=True,
+        etag=cache_key,
+        max_age=0,
+    )
+
+
+def _pdf_filename(cv):
+    """Build the download filename from the CV owner's name or the CV title."""
+    from datetime import datetime
+
+    # From the snapshot (no cv_sections query) when it is current
+    personal_section = build_cv_view(cv).section("personal")
+    if personal_section and personal_section.content.get("name"):
+        name = personal_section.content["name"].replace(" ", "_")
+    else:
+        name = cv.title.replace(" ", "_")
+
+    return f"{name}_CV_{datetime.now().strftime('%Y-%m')}.pdf"
+
+
+# ============================================
+# Background PDF Render Jobs
+# ============================================
+
+@bp.route("/<cv_id>/render", methods=["POST"])
+@login_required
+@limiter.limit("5/hour")
+def enqueue_render(cv_id):
+    """Queue a background PDF render and return its job id (requires authentication)."""
+    from app.cv.pdf_generator import build_render_args
+    from app.cv.render_cache import compute_cache_key
+    from app.cv.render_jobs import render_queue, QueueFullError
+
+    cv = CV.query.get_or_404(cv_id)
+
+    # Verify ownership
+    if cv.user_id != current_user.id or cv.is_deleted:
+        return jsonify({"error": "Unauthorized"}), 403
+
+    if cv.template_slug not in template_registry:
+        return jsonify({"error": "Unknown template"}), 400
+
+    view = build_cv_view(cv)
+    cache_key = compute_cache_key(cv, cv.template_slug, sections=view.sections)
+
+    try:
+        job = render_queue.enqueue(
+            cv_id=cv.id,
+            user_id=current_user.id,
+            cache_key=cache_key,
+            build_args=lambda: build_render_args(view, cv.template_slug),
+        )
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+
+    return jsonify({
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": url_for("cv.render_status", job_id=job["id"]),
+        "download_url": url_for("cv.render_file", job_id=job["id"]),
+    }), 202
+
+
+@bp.route("/render-jobs/<job_id>", methods=["GET"])
+@login_required
+def render_status(job_id):
+    """Report a render job's status: queued, running, done or failed."""
+    from app.cv.render_jobs import render_queue
+
+    job = render_queue.get(job_id)
+    if job is None or job.get("user_id") != current_user.id:
+        abort(404)
+
+    return jsonify({
+        "job_id": job["id"],
+        "cv_id": job["cv_id"],
+        "status": job["status"],
+        "error": job["error"],
+    })
+
+
+@bp.route("/render-jobs/<job_id>/file", methods=["GET"])
+@login_required
+def render_file(job_id):
+    """Download the PDF produced by a finished render job."""
+    from app.cv.render_cache import pdf_cache
+    from app.cv.render_jobs import render_queue, STATUS_DONE
+    import io
+
+    job = render_queue.get(job_id)
+    if job is None or job.get("user_id") != current_user.id:
+        abort(404)
+
+    if job["status"] != STATUS_DONE:
+        return jsonify({"error": "Render job is not finished", "status": job["status"]}), 409
+
+    if pdf_cache.is_filesystem:
+        pdf_file = pdf_cache.get_path(job["cache_key"])
+    else:
+        pdf_bytes = pdf_cache.get(job["cache_key"])
+        pdf_file = io.BytesIO(pdf_bytes) if pdf_bytes is not None else None
+
+    if pdf_file is None:
+        # Evicted since the job finished; the client should enqueue again
+        return jsonify({"error": "Rendered PDF has expired. Please render again."}), 410
+
+    cv = CV.query.get_or_404(job["cv_id"])
+
+    DownloadLog.create_log(
+        cv=cv,
+        user=current_user,
+        ip_address=request.remote_addr,
+        salt=current_app.config["IP_HASH_SALT"]
+    )
+
+    return _send_pdf(pdf_file, job["cache_key"], cv)
+
+
+@bp.route("/export")
+@login_required
+@limiter.limit("5/hour")
+def export_cvs():
+    """Download all of the user's CVs as a ZIP of PDFs and JSON sources (requires authentication)."""
+    from app.cv.export import prepare_export, iter_export_zip
+    from app.cv.render_jobs import QueueFullError
+    from datetime import datetime
+
+    cvs = CV.query.filter_by(
+        user_id=current_user.id,
+        is_deleted=False
+    ).order_by(CV.updated_at.desc()).all()
+
+    if not cvs:
+        flash("You have no CVs to export.", "info")
+        return redirect(url_for("cv.dashboard"))
+
+    try:
+        entries = prepare_export(cvs)
+    except QueueFullError as e:
+        flash(str(e), "error")
+        return redirect(url_for("cv.dashboard"))
+
+    for cv in cvs:
+        DownloadLog.create_log(
+            cv=cv,
+            user=current_user,
+            ip_address=request.remote_addr,
+            salt=current_app.config["IP_HASH_SALT"]
+        )
+
+    filename = f"CVs_{datetime.now().strftime('%Y-%m-%d')}.zip"
+    return Response(
+        stream_with_context(iter_export_zip(entries)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 # ============================================
 # API Endpoints for Section Management
 # ============================================
 
 @bp.route("/api/<cv_id>/sections", methods=["GET"])
+@timed
 def get_sections(cv_id):
     """Get all sections for a CV (public access)."""
     cv = CV.query.get_or_404(cv_id)
 
-    sections = cv.sections.order_by(CVSection.display_order).all()
     return jsonify({
-        "sections": [section.to_dict() for section in sections]
+        "sections": cv.section_dicts()
     })
 
 
 @bp.route("/api/<cv_id>/sections", methods=["POST"])
 @login_required
+@timed
 def create_section(cv_id):
     """Create a new section (requires authentication)."""
     cv = CV.query.get_or_404(cv_id)
@@ -217,6 +543,9 @@ def create_section(cv_id):
 
     db.session.add(section)
     db.session.commit()
+    prerender_scheduler.schedule(cv.id, current_user.id)
+    with phase("publish"):
+        live_updates.publish(cv, sections=[section])
 
     return jsonify({
         "success": True,
@@ -226,6 +555,7 @@ def create_section(cv_id):
 
 @bp.route("/api/<cv_id>/sections/<section_id>", methods=["PUT"])
 @login_required
+@timed
 def update_section(cv_id, section_id):
     """Update an existing section (requires authentication)."""
     cv = CV.query.get_or_404(cv_id)
@@ -251,6 +581,9 @@ def update_section(cv_id, section_id):
         section.display_order = data["display_order"]
 
     db.session.commit()
+    prerender_scheduler.schedule(cv.id, current_user.id)
+    with phase("publish"):
+        live_updates.publish(cv, sections=[section])
 
     return jsonify({
         "success": True,
@@ -260,6 +593,7 @@ def update_section(cv_id, section_id):
 
 @bp.route("/api/<cv_id>/sections/<section_id>", methods=["DELETE"])
 @login_required
+@timed
 def delete_section(cv_id, section_id):
     """Delete a section (requires authentication)."""
     cv = CV.query.get_or_404(cv_id)
@@ -275,12 +609,85 @@ def delete_section(cv_id, section_id):
 
     db.session.delete(section)
     db.session.commit()
+    prerender_scheduler.schedule(cv.id, current_user.id)
+    with phase("publish"):
+        live_updates.publish(cv, removed=[section_id])
 
     return jsonify({"success": True})
 
 
+@bp.route("/api/<cv_id>/sections/batch", methods=["POST"])
+@login_required
+@timed
+def batch_sections(cv_id):
+    """Apply several section writes in one transaction (requires authentication)."""
+    from app.cv.section_batch import apply_operations, BatchError
+
+    cv = CV.query.get_or_404(cv_id)
+
+    # Verify ownership once for the whole batch
+    if cv.user_id != current_user.id or cv.is_deleted:
+        return jsonify({"error": "Unauthorized"}), 403
+
+    data = request.get_json(silent=True) or {}
+
+    try:
+        batch = apply_operations(
+            cv, data.get("operations"), current_app.config["SECTION_BATCH_MAX_OPERATIONS"]
+        )
+    except BatchError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e), "index": e.index}), 400
+
+    db.session.commit()
+    prerender_scheduler.schedule(cv.id, current_user.id)
+    with phase("publish"):
+        live_updates.publish(
+            cv, sections=list(batch.changed.values()), removed=batch.removed, reload=batch.reordered
+        )
+
+    return jsonify({
+        "success": True,
+        "results": batch.results
+    })
+
+
+@bp.route("/api/<cv_id>/sections/order", methods=["PUT"])
+@login_required
+@timed
+def reorder_sections(cv_id):
+    """Reorder all sections of a CV in one statement (requires authentication)."""
+    from app.cv.section_batch import reorder_sections as reorder
+
+    cv = CV.query.get_or_404(cv_id)
+
+    # Verify ownership
+    if cv.user_id != current_user.id or cv.is_deleted:
+        return jsonify({"error": "Unauthorized"}), 403
+
+    data = request.get_json(silent=True) or {}
+
+    try:
+        moved = reorder(cv, data.get("order"))
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
+    db.session.commit()
+    if moved:
+        prerender_scheduler.schedule(cv.id, current_user.id)
+        with phase("publish"):
+            live_updates.publish(cv, reload=True)
+
+    return jsonify({
+        "success": True,
+        "moved": moved
+    })
+
+
 @bp.route("/api/<cv_id>/meta", methods=["PUT"])
 @login_required
+@timed
 def update_meta(cv_id):
     """Update CV metadata (requires authentication)."""
     cv = CV.query.get_or_404(cv_id)
@@ -291,6 +698,9 @@ def update_meta(cv_id):
 
     data = request.get_json()
 
+    if "template_slug" in data and data["template_slug"] not in template_registry:
+        return jsonify({"error": "Unknown template"}), 400
+
     if "title" in data:
         cv.title = data["title"]
     if "template_slug" in data:
@@ -301,6 +711,9 @@ def update_meta(cv_id):
         cv.font_pair = data["font_pair"]
 
     db.session.commit()
+    prerender_scheduler.schedule(cv.id, current_user.id)
+    with phase("publish"):
+        live_updates.publish(cv, reload=True)
 
     return jsonify({
         "success": True,
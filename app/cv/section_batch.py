@@ -0,0 +1,204 @@
+"""
+Batched section writes.
+The editor sends every pending edit as one list of operations, applied to
+the CV's sections in a single transaction: one ownership check, one query
+for the existing sections and one commit, however many sections changed.
+
+Operations (applied in order):
+    {"op": "create", "section_type": ..., "label": ..., "content": {...}, "display_order": n}
+    {"op": "upsert", "section_type": ..., "content": {...}}   # single sections (personal, summary, skills)
+    {"op": "update", "id": ..., "content"/"label"/"is_visible"/"display_order": ...}
+    {"op": "delete", "id": ...}
+    {"op": "reorder", "order": [id, id, ...]}
+
+reorder_sections() is the standalone drag-and-drop reorder: one SELECT to
+validate the ids and one UPDATE ... CASE for every moved section.
+"""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.extensions import db
+from app.models import CVSection
+
+OPERATIONS = ("create", "upsert", "update", "delete", "reorder")
+
+UPDATABLE_FIELDS = ("content", "label", "is_visible", "display_order")
+
+
+class BatchError(ValueError):
+    """Raised when an operation in a batch is invalid; nothing is applied."""
+
+    def __init__(self, index, message):
+        super().__init__(f"Operation {index}: {message}")
+        self.index = index
+
+
+class BatchResult:
+    """What a batch changed, for the response, pre-rendering and live updates."""
+
+    def __init__(self):
+        self.results = []  # one {"op", "id"} per operation
+        self.changed = {}  # section id -> CVSection created or updated
+        self.removed = []  # ids of deleted sections
+        self.reordered = False
+
+
+def apply_operations(cv, operations, max_operations):
+    """
+    Apply a list of section operations to a CV without committing.
+
+    Args:
+        cv: CV model instance (ownership already checked)
+        operations: List of operation dicts
+        max_operations: Upper bound on the batch size
+
+    Returns:
+        BatchResult
+
+    Raises:
+        BatchError: If an operation is malformed or refers to a section of another CV
+    """
+    if not isinstance(operations, list) or not operations:
+        raise BatchError(0, "operations must be a non-empty list")
+    if len(operations) > max_operations:
+        raise BatchError(max_operations, f"at most {max_operations} operations per batch")
+
+    # One query for every section the batch may touch
+    sections = {section.id: section for section in cv.sections.all()}
+    result = BatchResult()
+
+    for index, operation in enumerate(operations):
+        op = operation.get("op") if isinstance(operation, dict) else None
+        if op not in OPERATIONS:
+            raise BatchError(index, f"unknown op {op!r}")
+
+        if op == "create":
+            section = _create(cv, operation, index)
+        elif op == "upsert":
+            section = _upsert(cv, sections, operation, index)
+        elif op == "update":
+            section = _get(sections, operation.get("id"), index)
+            _update(section, operation)
+        elif op == "delete":
+            section = _get(sections, operation.get("id"), index)
+            db.session.delete(section)
+            del sections[section.id]
+            result.changed.pop(section.id, None)
+            result.removed.append(section.id)
+            result.results.append({"op": op, "id": section.id})
+            continue
+        else:
+            _reorder(sections, operation.get("order"), index)
+            result.reordered = True
+            result.results.append({"op": op})
+            continue
+
+        sections[section.id] = section
+        result.changed[section.id] = section
+        result.results.append({"op": op, "id": section.id})
+
+    return result
+
+
+def _get(sections, section_id, index):
+    section = sections.get(section_id)
+    if section is None:
+        raise BatchError(index, f"no section {section_id!r} in this CV")
+    return section
+
+
+def _create(cv, operation, index):
+    if not operation.get("section_type"):
+        raise BatchError(index, "section_type is required")
+
+    # The id is assigned here (not at INSERT) so later operations and the
+    # response can refer to it without flushing each new row separately
+    section = CVSection(
+        id=str(uuid.uuid4()),
+        cv_id=cv.id,
+        section_type=operation["section_type"],
+        label=operation.get("label"),
+        content=operation.get("content", {}),
+        display_order=operation.get("display_order", 999),
+    )
+    db.session.add(section)
+    return section
+
+
+def _upsert(cv, sections, operation, index):
+    section_type = operation.get("section_type")
+    existing = next(
+        (s for s in sorted(sections.values(), key=lambda s: s.display_order) if s.section_type == section_type),
+        None,
+    )
+    if existing is None:
+        return _create(cv, operation, index)
+    _update(existing, operation)
+    return existing
+
+
+def _update(section, operation):
+    for field in UPDATABLE_FIELDS:
+        if field in operation:
+            setattr(section, field, operation[field])
+
+
+def _reorder(sections, order, index):
+    if not isinstance(order, list) or any(section_id not in sections for section_id in order):
+        raise BatchError(index, "order must list sections of this CV")
+    for position, section_id in enumerate(order):
+        sections[section_id].display_order = position
+
+
+def reorder_sections(cv, order):
+    """
+    Set the display order of all of a CV's sections without committing.
+
+    The ids are validated with one query and every moved section is written
+    by a single UPDATE ... CASE. The CV's snapshot is rebuilt from the same
+    rows, since the bulk UPDATE bypasses the ORM flush hook.
+
+    Args:
+        cv: CV model instance (ownership already checked)
+        order: Every section id of the CV, in the new order
+
+    Returns:
+        list: Ids of the sections whose position changed
+
+    Raises:
+        ValueError: If order is not a permutation of the CV's section ids
+    """
+    from app.cv.snapshot import build_snapshot
+
+    if (not isinstance(order, list) or not all(isinstance(section_id, str) for section_id in order)
+            or len(set(order)) != len(order)):
+        raise ValueError("order must be a list of distinct section ids")
+
+    rows = db.session.query(
+        CVSection.id,
+        CVSection.section_type,
+        CVSection.label,
+        CVSection.content,
+        CVSection.display_order,
+        CVSection.is_visible,
+    ).filter(CVSection.cv_id == cv.id).all()
+    if {row.id for row in rows} != set(order):
+        raise ValueError("order must list every section of this CV exactly once")
+
+    positions = {section_id: position for position, section_id in enumerate(order)}
+    moved = [row.id for row in rows if row.display_order != positions[row.id]]
+    if moved:
+        db.session.execute(
+            db.update(CVSection)
+            .where(CVSection.id.in_(moved))
+            .values(
+                display_order=db.case({section_id: positions[section_id] for section_id in moved}, value=CVSection.id),
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        sections = [SimpleNamespace(**{**row._asdict(), "display_order": positions[row.id]}) for row in rows]
+        cv.snapshot, cv.snapshot_hash = build_snapshot(cv, sections)
+    return moved
@@ -0,0 +1,178 @@
+"""
+Denormalized CV document snapshots.
+Each CV row carries a compact JSON copy of its metadata and sections
+(cvs.snapshot) plus a SHA-256 of it (cvs.snapshot_hash) and the number of
+sections (cvs.section_count, for listings). A before_flush hook
+rebuilds the snapshot whenever a section or the CV's metadata changes, in the
+same transaction as the change, so readers (editor, preview, PDF, API) get
+the whole document from one row instead of reassembling cv_sections.
+
+`flask check-snapshots` compares every snapshot with the section rows and,
+with --repair, rebuilds the ones that drifted (e.g., rows written outside
+the ORM).
+"""
+import hashlib
+import json
+import uuid
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Bump when the snapshot layout changes; older snapshots are ignored by
+# readers and rebuilt by check_snapshots(repair=True)
+SNAPSHOT_VERSION = 1
+
+# CV columns copied into the snapshot
+CV_FIELDS = ("title", "template_slug", "primary_color", "font_pair")
+
+
+def section_entry(section):
+    """Snapshot entry for a CVSection (or any object/row with the same attributes)."""
+    return {
+        "id": section.id,
+        "section_type": section.section_type,
+        "label": section.label,
+        "content": section.content if section.content is not None else {},
+        # Column defaults are not applied until INSERT
+        "display_order": section.display_order if section.display_order is not None else 0,
+        "is_visible": section.is_visible if section.is_visible is not None else True,
+    }
+
+
+def build_snapshot(cv, sections):
+    """
+    Build a CV's snapshot.
+
+    Args:
+        cv: CV model instance or row with the CV_FIELDS attributes
+        sections: The CV's sections (model instances or rows)
+
+    Returns:
+        tuple: (snapshot dict, hex SHA-256 of its canonical JSON)
+    """
+    entries = sorted((section_entry(section) for section in sections), key=lambda s: s["display_order"])
+    snapshot = {"v": SNAPSHOT_VERSION, **{field: getattr(cv, field) for field in CV_FIELDS}, "sections": entries}
+    encoded = json.dumps(snapshot, sort_keys=True, separators=(",", ":"), default=str)
+    return snapshot, hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def current_snapshot(cv):
+    """Get a CV's snapshot if it is in the current format, else None."""
+    snapshot = cv.snapshot
+    if snapshot and snapshot.get("v") == SNAPSHOT_VERSION:
+        return snapshot
+    return None
+
+
+def _pending_sections(session, cv):
+    """The CV's sections as they will be after this flush."""
+    from app.models import CVSection
+
+    sections = {}
+    if inspect(cv).persistent:
+        for section in session.query(CVSection).filter(CVSection.cv_id == cv.id):
+            sections[section] = None
+    for obj in session.new:
+        if isinstance(obj, CVSection) and (obj.cv is cv or (obj.cv_id is not None and obj.cv_id == cv.id)):
+            sections[obj] = None
+    return [section for section in sections if section not in session.deleted]
+
+
+def _refresh_snapshots(session, flush_context, instances):
+    """before_flush hook: rebuild snapshots of CVs whose sections or metadata changed."""
+    from app.models import CV, CVSection
+
+    with session.no_autoflush:
+        affected = {}
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, CVSection):
+                if obj.id is None:
+                    # Snapshots refer to sections by id, so assign it before INSERT
+                    obj.id = str(uuid.uuid4())
+                # Pending sections created with only cv_id set do not load .cv
+                cv = obj.cv or (session.get(CV, obj.cv_id) if obj.cv_id else None)
+                if cv is not None:
+                    affected[id(cv)] = cv
+            elif isinstance(obj, CV) and obj not in session.deleted:
+                state = inspect(obj)
+                if state.pending or any(state.attrs[field].history.has_changes() for field in CV_FIELDS):
+                    affected[id(obj)] = obj
+
+        for cv in affected.values():
+            if cv in session.deleted:
+                continue
+            sections = _pending_sections(session, cv)
+            snapshot, digest = build_snapshot(cv, sections)
+            if digest != cv.snapshot_hash:
+                cv.snapshot = snapshot
+                cv.snapshot_hash = digest
+            if cv.section_count != len(sections):
+                cv.section_count = len(sections)
+
+
+def check_snapshots(repair=False, chunk_size=500, log=None):
+    """
+    Compare every CV snapshot with its section rows.
+
+    Args:
+        repair: Rebuild drifted or missing snapshots
+        chunk_size: CVs loaded per query
+        log: Optional callable receiving one message per drifted CV
+
+    Returns:
+        dict: checked, drifted and repaired counts
+    """
+    from app.extensions import db
+    from app.models import CV, CVSection
+
+    counts = {"checked": 0, "drifted": 0, "repaired": 0}
+    last_id = ""
+    while True:
+        cvs = CV.query.filter(CV.id > last_id).order_by(CV.id).limit(chunk_size).all()
+        if not cvs:
+            break
+        last_id = cvs[-1].id
+
+        sections_by_cv = {cv.id: [] for cv in cvs}
+        sections = CVSection.query.filter(CVSection.cv_id.in_(sections_by_cv)).order_by(CVSection.display_order).all()
+        for section in sections:
+            sections_by_cv[section.cv_id].append(section)
+
+        for cv in cvs:
+            counts["checked"] += 1
+            snapshot, digest = build_snapshot(cv, sections_by_cv[cv.id])
+            count = len(sections_by_cv[cv.id])
+            if (
+                current_snapshot(cv) is not None
+                and digest == cv.snapshot_hash
+                and cv.snapshot == snapshot
+                and cv.section_count == count
+            ):
+                continue
+
+            counts["drifted"] += 1
+            if log:
+                log(f"CV {cv.id}: snapshot {'missing or outdated' if current_snapshot(cv) is None else 'drifted'}")
+            if repair:
+                # Core UPDATE: keep updated_at, and skip the flush hook
+                db.session.execute(
+                    db.update(CV)
+                    .where(CV.id == cv.id)
+                    .values(snapshot=snapshot, snapshot_hash=digest, section_count=count, updated_at=cv.updated_at)
+                )
+                counts["repaired"] += 1
+
+        if repair:
+            db.session.commit()
+        # Keep memory flat on large tables
+        for obj in chain(cvs, sections):
+            db.session.expunge(obj)
+
+    return counts
+
+
+def init_snapshots(app):
+    """Keep CV snapshots up to date on every flush."""
+    if not event.contains(Session, "before_flush", _refresh_snapshots):
+        event.listen(Session, "before_flush", _refresh_snapshots)
@@ -0,0 +1,108 @@
+"""
+Jinja template compilation cache.
+Compiled template bytecode is stored on local disk (JINJA_BYTECODE_CACHE_DIR,
+default <instance path>/jinja_bytecode) so every gunicorn worker, and every
+restart, loads it instead of parsing the template source again. Jinja writes
+cache files through a temporary file and rename, so workers can share the
+directory safely; a template whose source changed gets a checksum mismatch
+and is compiled again.
+
+With JINJA_PRECOMPILE enabled, create_app loads the CV templates, their
+section macros, the editor and the dashboard up front. Under
+gunicorn --preload this happens once in the master and the workers fork with
+the templates already in Jinja's in-memory cache.
+
+Bytecode is executed when loaded, so the directory must be private to the
+app's user: it is created with mode 0700 and refused if another user owns it
+or can access it (Jinja only checks this for its own default temp directory).
+"""
+import threading
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+from app.utils.security import app_directory, private_directory
+
+# Templates loaded at startup: CV templates and their section macros (every
+# preview and PDF), plus the pages with the largest inline styles
+PRECOMPILE_PREFIXES = ("cv_templates/",)
+PRECOMPILE_TEMPLATES = ("base.html", "builder/editor.html", "dashboard/index.html")
+
+
+class CountingBytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache that counts hits and compiles for monitoring."""
+
+    def __init__(self, directory):
+        private_directory(directory)
+        super().__init__(directory, pattern="__jinja2_%s.cache")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load_bytecode(self, bucket):
+        super().load_bytecode(bucket)
+        with self._lock:
+            if bucket.code is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+    def stats(self):
+        """Get hit/compile counters for monitoring."""
+        return {"directory": self.directory, "hits": self.hits, "compiled": self.misses}
+
+
+def precompile_templates(app):
+    """
+    Load the templates used by previews, PDFs, the editor and the dashboard.
+
+    Args:
+        app: Flask application
+
+    Returns:
+        dict: Template count, how many were loaded from the bytecode cache
+        or compiled from source, and the milliseconds spent on each
+    """
+    env = app.jinja_env
+    names = [
+        name for name in env.list_templates()
+        if name.startswith(PRECOMPILE_PREFIXES) and name.endswith(".html")
+    ]
+    names.extend(name for name in PRECOMPILE_TEMPLATES if name not in names)
+
+    bytecode_cache = env.bytecode_cache
+    result = {"templates": len(names), "loaded": 0, "load_ms": 0.0, "compiled": 0, "compile_ms": 0.0}
+    for name in names:
+        hits_before = getattr(bytecode_cache, "hits", 0)
+        started = time.perf_counter()
+        env.get_template(name)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        # Without a bytecode cache every template is compiled from source
+        if getattr(bytecode_cache, "hits", 0) > hits_before:
+            result["loaded"] += 1
+            result["load_ms"] += elapsed_ms
+        else:
+            result["compiled"] += 1
+            result["compile_ms"] += elapsed_ms
+
+    result["load_ms"] = round(result["load_ms"], 1)
+    result["compile_ms"] = round(result["compile_ms"], 1)
+    return result
+
+
+def init_template_cache(app):
+    """Attach the bytecode cache and precompile templates, depending on config."""
+    if app.config["JINJA_BYTECODE_CACHE_ENABLED"]:
+        directory = app_directory(app, "JINJA_BYTECODE_CACHE_DIR", "jinja_bytecode")
+        app.jinja_env.bytecode_cache = CountingBytecodeCache(directory)
+
+    if app.config["JINJA_PRECOMPILE"]:
+        result = precompile_templates(app)
+        app.logger.info(
+            f"Precompiled {result['templates']} templates: "
+            f"{result['loaded']} loaded from bytecode cache in {result['load_ms']}ms, "
+            f"{result['compiled']} compiled in {result['compile_ms']}ms"
+        )
+
+    return app.jinja_env.bytecode_cache
@@ -0,0 +1,211 @@
+"""
+CV template registry.
+Template metadata, file paths and source hashes, loaded once at startup into
+a read-only dict keyed by slug. Routes validate a slug with one dict lookup
+instead of finding out about a missing template from a render exception, and
+render cache keys use the registry's version hash for the template.
+
+accent_color is the color in the template's CSS that a CV's primary_color
+replaces (None: the template is not recolored).
+
+Templates listed here without an HTML file (the planned pro_* designs) are
+known but not selectable until their file ships.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "cv_templates")
+
+DEFAULT_TEMPLATE = "ats_clean"
+
+TEMPLATE_DEFINITIONS = (
+    {
+        "slug": "ats_clean",
+        "name": "ATS Clean",
+        "category": "ats",
+        "description": "Single-column, no graphics, standard headings",
+        "is_ats_friendly": True,
+        "sort_order": 1,
+        "accent_color": None,
+    },
+    {
+        "slug": "ats_modern",
+        "name": "ATS Modern",
+        "category": "ats",
+        "description": "Single-column, subtle accent color, clean dividers",
+        "is_ats_friendly": True,
+        "sort_order": 2,
+        "accent_color": "#4299e1",
+    },
+    {
+        "slug": "ats_executive",
+        "name": "ATS Executive",
+        "category": "ats",
+        "description": "Classic two-column header, single-column body",
+        "is_ats_friendly": True,
+        "sort_order": 3,
+        "accent_color": None,
+    },
+    {
+        "slug": "pro_elegant",
+        "name": "Professional Elegant",
+        "category": "professional",
+        "description": "Cream paper tone, refined typography, tasteful icons",
+        "is_ats_friendly": False,
+        "sort_order": 4,
+        "accent_color": None,
+    },
+    {
+        "slug": "pro_creative",
+        "name": "Professional Creative",
+        "category": "professional",
+        "description": "Accent sidebar with skills bars, photo slot",
+        "is_ats_friendly": False,
+        "sort_order": 5,
+        "accent_color": None,
+    },
+    {
+        "slug": "pro_bold",
+        "name": "Professional Bold",
+        "category": "professional",
+        "description": "High-contrast header, card-style entries",
+        "is_ats_friendly": False,
+        "sort_order": 6,
+        "accent_color": None,
+    },
+)
+
+
+class UnknownTemplateError(ValueError):
+    """Raised when a template slug is not registered or has no HTML file."""
+
+
+@dataclass(frozen=True)
+class CVTemplate:
+    """Metadata and source files of one CV template."""
+
+    slug: str
+    name: str
+    category: str
+    description: str
+    is_ats_friendly: bool
+    sort_order: int
+    accent_color: str = None
+    path: str = None
+    sections_path: str = None
+    version: str = None
+
+    @property
+    def available(self):
+        """Whether the template has an HTML file and can be rendered."""
+        return self.path is not None
+
+    @property
+    def template_name(self):
+        """Jinja name of the main template."""
+        return f"cv_templates/{self.slug}.html"
+
+
+def _hash_files(paths):
+    """Get the first 16 hex chars of the SHA-256 of the given files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def load_templates(template_dir=TEMPLATE_DIR, definitions=TEMPLATE_DEFINITIONS):
+    """
+    Build the registry entries from the definitions and the files on disk.
+
+    Args:
+        template_dir: Directory holding <slug>.html and sections/<slug>.html
+        definitions: Template metadata dicts
+
+    Returns:
+        MappingProxyType: Read-only {slug: CVTemplate}, in sort order
+    """
+    templates = {}
+    for definition in sorted(definitions, key=lambda d: d["sort_order"]):
+        path = os.path.join(template_dir, f"{definition['slug']}.html")
+        sections_path = os.path.join(template_dir, "sections", f"{definition['slug']}.html")
+        if not os.path.isfile(path):
+            path = sections_path = None
+        elif not os.path.isfile(sections_path):
+            sections_path = None
+
+        version = None
+        if path is not None:
+            version = _hash_files([p for p in (path, sections_path) if p])
+
+        templates[definition["slug"]] = CVTemplate(
+            path=path, sections_path=sections_path, version=version, **definition
+        )
+    return MappingProxyType(templates)
+
+
+class TemplateRegistry:
+    """Read-only lookup of CV templates by slug."""
+
+    def __init__(self):
+        self._templates = MappingProxyType({})
+        self.version = None
+
+    def init_app(self, app):
+        """Load template metadata and hashes from the template directory."""
+        self.load()
+        missing = [t.slug for t in self._templates.values() if not t.available]
+        app.logger.info(
+            f"Template registry: {len(self.available())} templates available"
+            + (f", no HTML for {', '.join(missing)}" if missing else "")
+        )
+
+    def load(self, template_dir=TEMPLATE_DIR):
+        """(Re)build the registry from disk."""
+        self._templates = load_templates(template_dir)
+        # Changes whenever any template is added, removed or edited
+        self.version = hashlib.sha256(
+            "|".join(f"{t.slug}:{t.version}" for t in self._templates.values()).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def __contains__(self, slug):
+        template = self._templates.get(slug)
+        return template is not None and template.available
+
+    def get(self, slug):
+        """Get a registered template (available or not), or None."""
+        return self._templates.get(slug)
+
+    def require(self, slug):
+        """
+        Get a template that can be rendered.
+
+        Raises:
+            UnknownTemplateError: If the slug is unknown or has no HTML file
+        """
+        template = self._templates.get(slug)
+        if template is None:
+            raise UnknownTemplateError(f"Unknown template: {slug!r}")
+        if not template.available:
+            raise UnknownTemplateError(f"Template {slug!r} is not available yet")
+        return template
+
+    def all(self):
+        """Get every registered template in sort order."""
+        return list(self._templates.values())
+
+    def available(self):
+        """Get the templates that can be rendered, in sort order."""
+        return [t for t in self._templates.values() if t.available]
+
+
+template_registry = TemplateRegistry()
+
+
+def init_template_registry(app):
+    """Load the CV template registry."""
+    template_registry.init_app(app)
+    return template_registry
@@ -0,0 +1,169 @@
+"""
+Theme CSS compiler.
+Builds one minified stylesheet per (template, primary_color, font_pair) from
+the template's <style> block: the template's accent color is swapped for the
+CV's primary color and the font pair overrides body and heading fonts.
+
+Compiled payloads are kept in a bounded LRU. Previews link to them as a
+cacheable stylesheet instead of inlining the template CSS, and PDF renders
+parse them once per process through the render context.
+
+Needs no app context, so render worker processes compile themes themselves.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from app.cv.template_registry import load_templates, UnknownTemplateError
+from app.utils.assets import minify_css
+
+# Bump when compile_theme_css() changes its output for the same inputs
+THEME_FORMAT_VERSION = 1
+
+# font_pair -> (heading font stack, body font stack)
+FONT_PAIRS = {
+    "sans": (
+        "'Helvetica Neue', Arial, sans-serif",
+        "'Helvetica Neue', Arial, sans-serif",
+    ),
+    "serif": (
+        "Georgia, 'Times New Roman', serif",
+        "Georgia, 'Times New Roman', serif",
+    ),
+    "classic": (
+        "Georgia, 'Times New Roman', serif",
+        "'Helvetica Neue', Arial, sans-serif",
+    ),
+    "modern": (
+        "'Segoe UI', 'Helvetica Neue', Arial, sans-serif",
+        "-apple-system, BlinkMacSystemFont, 'Segoe UI', Arial, sans-serif",
+    ),
+}
+
+HEADING_SELECTORS = ".name, .section-title"
+
+_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+_STYLE_RE = re.compile(r"<style[^>]*>(.*?)</style>", re.DOTALL | re.IGNORECASE)
+
+
+def is_valid_color(color):
+    """Check for a #rrggbb hex color."""
+    return bool(color) and bool(_COLOR_RE.match(color))
+
+
+def normalize_theme(primary_color, font_pair):
+    """
+    Drop theme values the compiler does not understand.
+
+    Returns:
+        tuple: (lowercase #rrggbb color or None, known font pair or None)
+    """
+    color = primary_color.lower() if is_valid_color(primary_color) else None
+    fonts = font_pair if font_pair in FONT_PAIRS else None
+    return color, fonts
+
+
+def compile_theme_css(template, primary_color=None, font_pair=None):
+    """
+    Compile the stylesheet for a template with a CV's theme applied.
+
+    Args:
+        template: CVTemplate from the registry
+        primary_color: Normalized #rrggbb color, or None for the template's own
+        font_pair: Key of FONT_PAIRS, or None for the template's own fonts
+
+    Returns:
+        str: Minified CSS
+    """
+    with open(template.path, encoding="utf-8") as f:
+        css = "\n".join(_STYLE_RE.findall(f.read()))
+
+    if primary_color and template.accent_color:
+        css = re.sub(re.escape(template.accent_color), primary_color, css, flags=re.IGNORECASE)
+
+    if font_pair:
+        heading, body = FONT_PAIRS[font_pair]
+        css += f"\nbody {{ font-family: {body}; }}\n{HEADING_SELECTORS} {{ font-family: {heading}; }}"
+
+    return minify_css(css)
+
+
+class ThemeCompiler:
+    """LRU of compiled theme CSS keyed by (template, version, color, font pair)."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._templates = None
+        self._entries = OrderedDict()  # key -> (css, digest), oldest first
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def init_app(self, app):
+        """Configure the LRU bound from app config."""
+        self.max_entries = app.config["THEME_CSS_CACHE_SIZE"]
+
+    def _template(self, template_slug):
+        if self._templates is None:
+            self._templates = load_templates()
+        template = self._templates.get(template_slug)
+        if template is None or not template.available:
+            raise UnknownTemplateError(f"Unknown template: {template_slug!r}")
+        return template
+
+    def get(self, template_slug, primary_color=None, font_pair=None):
+        """
+        Get the compiled theme for a CV's template, color and font pair.
+
+        Unknown colors and font pairs fall back to the template's own.
+
+        Returns:
+            tuple: (minified CSS, 16-char hex digest of the CSS)
+
+        Raises:
+            UnknownTemplateError: If the template is not registered or has no HTML file
+        """
+        template = self._template(template_slug)
+        color, fonts = normalize_theme(primary_color, font_pair)
+        if template.accent_color is None:
+            # Not recolored: share one entry whatever the CV's color
+            color = None
+        key = (template_slug, template.version, THEME_FORMAT_VERSION, color, fonts)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            self._stats["misses"] += 1
+
+        css = compile_theme_css(template, color, fonts)
+        entry = (css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:16])
+
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return entry
+
+    def reload(self):
+        """Re-read template files and drop compiled themes."""
+        with self._lock:
+            self._templates = None
+            self._entries.clear()
+
+    def stats(self):
+        """Get hit/miss counters for monitoring."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), max_entries=self.max_entries)
+
+
+theme_compiler = ThemeCompiler()
+
+
+def init_theme(app):
+    """Configure the theme CSS compiler from app config."""
+    theme_compiler.init_app(app)
+    return theme_compiler
@@ -0,0 +1,239 @@
+"""
+First-page thumbnails for the dashboard.
+Page 1 of each CV is rasterized to a small WebP (or PNG) on the render pool
+and cached under a hash of the CV's content, so the dashboard shows one
+small immutable image per CV instead of running a full preview for each.
+When the CV's PDF is already cached the worker rasterizes that file and
+skips layout entirely.
+"""
+import hashlib
+import importlib.util
+import io
+import threading
+
+from app.cv.preview import build_cv_view
+from app.cv.render_cache import (
+    CACHE_FORMAT_VERSION, pdf_cache, thumbnail_cache, compute_cache_key, template_version
+)
+from app.cv.template_registry import template_registry
+
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "png": ("PNG", "image/png", {"optimize": True}),
+}
+
+
+def render_thumbnail(width, image_format, pdf_path=None, target=None, **render_args):
+    """
+    Rasterize page 1 of a CV (runs in a render worker process).
+
+    Args:
+        width: Thumbnail width in pixels
+        image_format: Key of THUMBNAIL_FORMATS
+        pdf_path: Already rendered PDF to rasterize, if one is cached
+        target: Optional path to write the image into instead of returning it
+        **render_args: html_to_pdf() arguments, used when there is no pdf_path
+
+    Returns:
+        bytes: Image data, or None when written to target
+
+    Raises:
+        RuntimeError: If pypdfium2 (or WeasyPrint, without pdf_path) is not available
+    """
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        raise RuntimeError("Thumbnails require pypdfium2. Install it with: pip install pypdfium2")
+
+    if pdf_path is None:
+        from app.cv.pdf_generator import html_to_pdf
+
+        source = html_to_pdf(**render_args, first_page_only=True)
+    else:
+        source = pdf_path
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        page = pdf[0]
+        image = page.render(scale=width / page.get_width()).to_pil()
+    finally:
+        pdf.close()
+
+    pil_format, _, save_options = THUMBNAIL_FORMATS[image_format]
+    output = target or io.BytesIO()
+    image.convert("RGB").save(output, format=pil_format, **save_options)
+    return None if target else output.getvalue()
+
+
+class ThumbnailService:
+    """Looks up dashboard thumbnails and queues the missing ones."""
+
+    def __init__(self):
+        self.enabled = False
+        self.width = 360
+        self.image_format = "webp"
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._renderable = None
+
+    def init_app(self, app):
+        """Configure thumbnails from app config."""
+        self.enabled = app.config["THUMBNAILS_ENABLED"]
+        self.width = app.config["THUMBNAIL_WIDTH"]
+        self.image_format = app.config["THUMBNAIL_FORMAT"]
+        if self.image_format not in THUMBNAIL_FORMATS:
+            raise ValueError(f"Unknown THUMBNAIL_FORMAT: {self.image_format!r}")
+        self._renderable = None
+
+    @property
+    def renderable(self):
+        """
+        Whether missing thumbnails can be rendered at all (checked once per process).
+
+        Needs pypdfium2, and WeasyPrint unless cached PDFs are on disk to
+        rasterize instead. Nothing is imported to find out.
+        """
+        if self._renderable is None:
+            from app.cv.render_engine import render_engine
+
+            self._renderable = importlib.util.find_spec("pypdfium2") is not None and (
+                render_engine.installed or pdf_cache.is_filesystem
+            )
+        return self._renderable
+
+    @property
+    def mimetype(self):
+        """Content type of generated thumbnails."""
+        return THUMBNAIL_FORMATS[self.image_format][1]
+
+    def key(self, content_key):
+        """Derive the thumbnail cache key from a CV content hash."""
+        payload = f"{content_key}:{self.width}:{self.image_format}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def key_for(self, cv, sections=None):
+        """
+        Get the current thumbnail key for a CV.
+
+        CVs with a snapshot are keyed by its hash, so this needs no more than
+        the template slug and snapshot_hash columns (see dashboard listings).
+
+        Args:
+            cv: CV model instance or row with template_slug and snapshot_hash
+            sections: Optional pre-loaded list of the CV's sections (CVs without a snapshot)
+
+        Returns:
+            str: Thumbnail cache key
+        """
+        if cv.snapshot_hash:
+            payload = (
+                f"{CACHE_FORMAT_VERSION}:{cv.template_slug}:"
+                f"{template_version(cv.template_slug)}:{cv.snapshot_hash}"
+            )
+            content_key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        else:
+            content_key = compute_cache_key(cv, cv.template_slug, sections=sections)
+        return self.key(content_key)
+
+    def lookup(self, cvs):
+        """
+        Find cached thumbnails and queue background renders for the rest.
+
+        Only CVs whose thumbnail is missing are loaded in full, to render it,
+        and only when thumbnails can be rendered here; otherwise they keep
+        their placeholder.
+
+        Args:
+            cvs: CV model instances or dashboard rows (id, template_slug, snapshot_hash)
+
+        Returns:
+            tuple: (dict of cv_id -> thumbnail key for CVs whose thumbnail is
+            ready, whether any thumbnail is still being rendered)
+        """
+        from app.extensions import db
+        from app.models import CV
+
+        ready = {}
+        pending = False
+        if not self.enabled:
+            return ready, pending
+        renderable = self.renderable
+
+        for row in cvs:
+            if row.template_slug not in template_registry:
+                continue
+            cv = row
+            if not isinstance(row, CV) and not row.snapshot_hash:
+                # No snapshot yet: the key needs the sections
+                cv = db.session.get(CV, row.id)
+            key = self.key_for(cv)
+            if thumbnail_cache.has(key):
+                ready[row.id] = key
+                continue
+            if not renderable:
+                continue
+
+            if not isinstance(cv, CV):
+                cv = db.session.get(CV, row.id)
+            view = build_cv_view(cv)
+            pdf_key = compute_cache_key(view, view.template_slug, sections=view.sections)
+            pending |= self._submit(view, key, pdf_key)
+        return ready, pending
+
+    def _submit(self, cv, key, pdf_key):
+        """
+        Queue a thumbnail render (cv is a CVView) unless one is already pending for this key.
+
+        Returns:
+            bool: Whether a render for the key is queued or running
+        """
+        from flask import current_app
+        from app.cv.pdf_generator import build_render_args
+        from app.cv.render_engine import render_engine
+        from app.cv.render_jobs import render_queue, QueueFullError
+
+        pdf_path = pdf_cache.get_path(pdf_key) if pdf_cache.is_filesystem else None
+        if pdf_path is None and not render_engine.installed:
+            return False
+
+        with self._lock:
+            if key in self._pending:
+                return True
+            self._pending.add(key)
+
+        def build_args():
+            args = {"width": self.width, "image_format": self.image_format}
+            if pdf_path is not None:
+                args["pdf_path"] = pdf_path
+            else:
+                args.update(build_render_args(cv, cv.template_slug))
+            return args
+
+        try:
+            future = render_queue.submit(
+                key, build_args, cache=thumbnail_cache, render_func=render_thumbnail
+            )
+        except QueueFullError:
+            # Busy; the next dashboard load will try again
+            self._done(key)
+            return True
+        except Exception as e:
+            current_app.logger.warning(f"Thumbnail for CV {cv.id} not queued: {e}")
+            self._done(key)
+            return False
+
+        future.add_done_callback(lambda f: self._done(key))
+        return True
+
+    def _done(self, key):
+        with self._lock:
+            self._pending.discard(key)
+
+
+thumbnails = ThumbnailService()
+
+
+def init_thumbnails(app):
+    """Initialize dashboard thumbnails from app config."""
+    thumbnails.init_app(app)
+    return thumbnails
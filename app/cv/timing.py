@@ -0,0 +1,176 @@
+"""
+Per-request render timing and profiling.
+Views decorated with @timed collect phase timings (Jinja, layout, PDF
+serialization, cache...) and SQL statement counts for the request. They are
+reported in a Server-Timing header, which browser devtools show next to the
+request, and in one JSON log line per request.
+
+An admin can profile a single request by sending "X-Profile: 1"; a fraction
+of all timed requests can be profiled with PROFILER_SAMPLE_RATE. Profiles are
+written to PROFILER_DIR (default <instance path>/profiles) as .prof files
+(open with snakeviz or pstats) and the top functions are logged.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import random
+import time
+from contextlib import contextmanager
+
+from flask import g, current_app, request, has_app_context
+
+
+class RequestTimer:
+    """Phase durations and SQL counters for one request."""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.phases = {}  # name -> milliseconds, in first-seen order
+        self.sql_queries = 0
+        self.sql_ms = 0.0
+        self.profile_path = None
+
+    def add(self, name, ms):
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        """Format the Server-Timing header value."""
+        metrics = [f"{name};dur={ms:.1f}" for name, ms in self.phases.items()]
+        metrics.append(f'sql;dur={self.sql_ms:.1f};desc="{self.sql_queries} queries"')
+        if self.profile_path:
+            metrics.append(f'profile;desc="{os.path.basename(self.profile_path)}"')
+        metrics.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(metrics)
+
+    def log_record(self, status_code):
+        """Build the structured log entry."""
+        return {
+            "event": "request_timing",
+            "endpoint": self.endpoint,
+            "method": request.method,
+            "path": request.path,
+            "status": status_code,
+            "total_ms": round(self.total_ms, 1),
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "sql_queries": self.sql_queries,
+            "sql_ms": round(self.sql_ms, 1),
+            "profile": self.profile_path,
+        }
+
+
+def current_timer():
+    """Get the timer of the request being handled, or None (untimed view, worker process)."""
+    if not has_app_context():
+        return None
+    return g.get("request_timer")
+
+
+@contextmanager
+def phase(name):
+    """Time a block as a named phase of the current request; no-op when not timing."""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, (time.perf_counter() - started) * 1000)
+
+
+def timed(view):
+    """Collect phase timings, SQL counts and an optional profile for a view."""
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config["SERVER_TIMING_ENABLED"]:
+            return view(*args, **kwargs)
+
+        timer = g.request_timer = RequestTimer(request.endpoint)
+        if not _should_profile():
+            return view(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            profiler.disable()
+            timer.profile_path = _save_profile(profiler, timer.endpoint)
+
+    return wrapper
+
+
+def _should_profile():
+    if request.headers.get("X-Profile") == "1" and _is_admin():
+        return True
+    rate = current_app.config["PROFILER_SAMPLE_RATE"]
+    return rate > 0 and random.random() < rate
+
+
+def _is_admin():
+    from flask_login import current_user
+
+    admins = current_app.config["ADMIN_EMAILS"]
+    return current_user.is_authenticated and current_user.email.lower() in admins
+
+
+def _save_profile(profiler, endpoint):
+    """Write the profile to PROFILER_DIR and log its top functions."""
+    from app.utils.security import app_directory
+
+    directory = app_directory(current_app, "PROFILER_DIR", "profiles")
+    path = os.path.join(directory, f"{endpoint}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+    profiler.dump_stats(path)
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+    current_app.logger.info(f"Profile for {endpoint} saved to {path}\n{summary.getvalue()}")
+    return path
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    timer = current_timer()
+    if timer is not None:
+        timer.sql_queries += 1
+        context._timing_started = time.perf_counter()
+
+
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_timing_started", None)
+    timer = current_timer()
+    if timer is not None and started is not None:
+        timer.sql_ms += (time.perf_counter() - started) * 1000
+
+
+def _add_headers(response):
+    timer = g.pop("request_timer", None)
+    if timer is None:
+        return response
+
+    response.headers["Server-Timing"] = timer.server_timing()
+    current_app.logger.info(json.dumps(timer.log_record(response.status_code)))
+    return response
+
+
+def init_timing(app):
+    """Count SQL statements and emit Server-Timing for @timed views."""
+    from sqlalchemy import event
+    from app.extensions import db
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+        event.listen(engine, "after_cursor_execute", _time_query)
+
+    app.after_request(_add_headers)
@@ -10,9 +10,13 @@ class CV(db.Model):
     """User's CV/Resume."""
 
     __tablename__ = "cvs"
+    __table_args__ = (
+        # Dashboard: a user's live CVs, newest first (id breaks updated_at ties)
+        db.Index("ix_cvs_user_id_is_deleted_updated_at", "user_id", "is_deleted", "updated_at", "id"),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=False, index=True)
+    user_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=False)
     title = db.Column(db.String(255), nullable=False)
     template_slug = db.Column(db.String(50), nullable=False, default="ats_clean")
     primary_color = db.Column(db.String(7))  # Hex color code
@@ -22,6 +26,11 @@ class CV(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Denormalized copy of the metadata and sections, kept current on flush (app/cv/snapshot.py)
+    snapshot = db.Column(db.JSON)
+    snapshot_hash = db.Column(db.String(64))
+    section_count = db.Column(db.Integer, default=0, nullable=False)
+
     # Relationships
     user = db.relationship("User", back_populates="cvs")
     sections = db.relationship("CVSection", back_populates="cv", lazy="dynamic", cascade="all, delete-orphan", order_by="CVSection.display_order")
@@ -30,9 +39,24 @@ class CV(db.Model):
         return f"<CV {self.title}>"
 
     def soft_delete(self):
-        """Soft delete the CV."""
-        self.is_deleted = True
-        self.deleted_at = datetime.utcnow()
+        """
+        Soft delete the CV and free its slot in the owner's CV limit.
+
+        The flag is set by a conditional UPDATE, so when two requests delete
+        the same CV only the one that changed the row releases the slot.
+        """
+        from app.cv.dashboard import mark_user_changed
+
+        result = db.session.execute(
+            db.update(CV)
+            .where(CV.id == self.id, CV.is_deleted == db.false())
+            .values(is_deleted=True, deleted_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire(self, ["is_deleted", "deleted_at", "updated_at"])
+        if result.rowcount == 1:
+            self.user.release_cv_slot()
+            mark_user_changed(db.session, self.user_id)
         db.session.commit()
 
     def to_dict(self):
@@ -45,5 +69,14 @@ class CV(db.Model):
             "font_pair": self.font_pair,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
-            "sections": [section.to_dict() for section in self.sections],
+            "sections": self.section_dicts(),
         }
+
+    def section_dicts(self):
+        """Serialize the sections, from the snapshot when it is current."""
+        from app.cv.snapshot import current_snapshot
+
+        snapshot = current_snapshot(self)
+        if snapshot is not None:
+            return snapshot["sections"]
+        return [section.to_dict() for section in self.sections]
@@ -11,9 +11,13 @@ class CVSection(db.Model):
     """CV section with flexible JSON content."""
 
     __tablename__ = "cv_sections"
+    __table_args__ = (
+        # A CV's sections in display order (renders, batch writes)
+        db.Index("ix_cv_sections_cv_id_display_order", "cv_id", "display_order"),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    cv_id = db.Column(db.String(36), db.ForeignKey("cvs.id"), nullable=False, index=True)
+    cv_id = db.Column(db.String(36), db.ForeignKey("cvs.id"), nullable=False)
     section_type = db.Column(db.String(50), nullable=False)  # 'experience', 'education', etc.
     label = db.Column(db.String(255))  # Custom label override
     content = db.Column(db.JSON, nullable=False)  # Flexible section data
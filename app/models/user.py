@@ -22,6 +22,8 @@ class User(UserMixin, db.Model):
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_login = db.Column(db.DateTime)
+    # Non-deleted CVs; maintained by reserve_cv_slot/release_cv_slot (repair: flask repair-cv-counts)
+    active_cv_count = db.Column(db.Integer, default=0, nullable=False)
 
     # Relationships
     cvs = db.relationship("CV", back_populates="user", lazy="dynamic", cascade="all, delete-orphan")
@@ -32,12 +34,65 @@ class User(UserMixin, db.Model):
     @property
     def cv_count(self):
         """Get count of active (non-deleted) CVs."""
-        return self.cvs.filter_by(is_deleted=False).count()
+        return self.active_cv_count
 
     def can_create_cv(self, max_limit):
-        """Check if user can create more CVs."""
+        """Check if user can create more CVs (advisory; reserve_cv_slot enforces the limit)."""
         return self.cv_count < max_limit
 
+    def reserve_cv_slot(self, max_limit):
+        """
+        Count a new CV against the user's limit, in the current transaction.
+
+        A single conditional UPDATE, so concurrent requests cannot both take
+        the last slot; rolling back the transaction releases the slot.
+
+        Returns:
+            bool: False if the user already has max_limit CVs
+        """
+        result = db.session.execute(
+            db.update(User)
+            .where(User.id == self.id, User.active_cv_count < max_limit)
+            .values(active_cv_count=User.active_cv_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire(self, ["active_cv_count"])
+        return result.rowcount == 1
+
+    def release_cv_slot(self):
+        """Stop counting a CV against the user's limit, in the current transaction."""
+        db.session.execute(
+            db.update(User)
+            .where(User.id == self.id, User.active_cv_count > 0)
+            .values(active_cv_count=User.active_cv_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire(self, ["active_cv_count"])
+
+    @classmethod
+    def repair_cv_counts(cls):
+        """
+        Recompute every user's active_cv_count from the cvs table.
+
+        Returns:
+            int: Number of users whose count was wrong
+        """
+        from app.models.cv import CV
+
+        actual = (
+            db.select(db.func.count(CV.id))
+            .where(CV.user_id == cls.id, CV.is_deleted == db.false())
+            .scalar_subquery()
+        )
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.active_cv_count != actual)
+            .values(active_cv_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
     @classmethod
     def get_anonymous_user(cls):
         """Get the anonymous system user for public CVs."""
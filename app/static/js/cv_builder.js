@@ -3,12 +3,25 @@
  * Handles form submission, section management, and live preview
  */
 
+// Autosave waits this long after the last keystroke...
+const SAVE_DEBOUNCE = 3000;
+// ...but no longer than this after the first unsaved edit
+const SAVE_MAX_WAIT = 10000;
+// How long a save waits for its update event before fetching fragments itself
+const LIVE_UPDATE_WAIT = 1500;
+
 class CVBuilder {
     constructor(cvId, csrfToken) {
         this.cvId = cvId;
         this.csrfToken = csrfToken;
-        this.previewRefreshTimeout = null;
         this.saveTimeout = null;
+        this.pendingSince = null;
+        this.saving = null;
+        // Sections edited since the last save: section ids, or the type
+        // name for single sections (personal, summary, skills)
+        this.dirtySections = new Set();
+        this.liveUpdates = null;
+        this.lastLiveUpdateAt = 0;
         this.init();
     }
 
@@ -16,6 +29,65 @@ class CVBuilder {
         // Attach event listeners
         this.attachFormListeners();
         this.loadSections();
+        this.connectLiveUpdates();
+    }
+
+    /**
+     * Subscribe to the CV's server-sent update stream. Every committed
+     * save (from this tab or another one) arrives with the re-rendered
+     * sections, so all open previews stay in sync without refetching.
+     * Only opened when the server has live updates enabled; otherwise
+     * saves fetch the changed fragments themselves.
+     */
+    connectLiveUpdates() {
+        const layout = document.querySelector('.editor-layout');
+        if (!window.EventSource || !layout || layout.dataset.liveUpdates !== 'true') return;
+
+        this.liveUpdates = new EventSource(`/cv/${this.cvId}/events`);
+        this.liveUpdates.addEventListener('update', (e) => {
+            this.lastLiveUpdateAt = Date.now();
+            this.applyLiveUpdate(JSON.parse(e.data));
+        });
+    }
+
+    get liveUpdatesConnected() {
+        return this.liveUpdates !== null && this.liveUpdates.readyState === EventSource.OPEN;
+    }
+
+    applyLiveUpdate(update) {
+        const doc = this.previewDocument();
+        if (update.reload || !doc) {
+            this.refreshPreview();
+            return;
+        }
+
+        for (const [sectionId, html] of Object.entries(update.fragments)) {
+            if (!this.replaceFragment(doc, sectionId, html)) {
+                this.refreshPreview();
+                return;
+            }
+        }
+        update.removed
+            .filter(sectionId => doc.querySelector(`[data-section-id="${sectionId}"]`))
+            .forEach(sectionId => this.removeFromPreview(sectionId));
+    }
+
+    previewDocument() {
+        const iframe = document.getElementById('previewFrame');
+        try {
+            const doc = iframe && iframe.contentDocument;
+            return doc && doc.body ? doc : null;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    replaceFragment(doc, sectionId, html) {
+        const target = doc.querySelector(`[data-section-id="${sectionId}"]`);
+        if (!target || !html || !html.trim()) return false;
+
+        target.outerHTML = html.trim();
+        return true;
     }
 
     attachFormListeners() {
@@ -24,7 +96,7 @@ class CVBuilder {
 
         // Auto-save and preview refresh on input
         form.addEventListener('input', (e) => {
-            this.onFormChange();
+            this.onFormChange(e.target);
         });
 
         // Prevent form submission
@@ -34,21 +106,20 @@ class CVBuilder {
         });
     }
 
-    onFormChange() {
+    onFormChange(field) {
         // Update save status
         this.updateSaveStatus('unsaved');
+        this.markDirty(field);
 
-        // Debounced preview refresh
-        clearTimeout(this.previewRefreshTimeout);
-        this.previewRefreshTimeout = setTimeout(() => {
-            this.refreshPreview();
-        }, 1000);
-
-        // Debounced auto-save
+        // Debounced auto-save (the preview is patched once the save lands).
+        // Edits pile up into one batch; continuous typing still saves every
+        // SAVE_MAX_WAIT ms.
+        if (this.pendingSince === null) this.pendingSince = Date.now();
+        const wait = Math.min(SAVE_DEBOUNCE, this.pendingSince + SAVE_MAX_WAIT - Date.now());
         clearTimeout(this.saveTimeout);
         this.saveTimeout = setTimeout(() => {
             this.autoSave();
-        }, 3000);
+        }, Math.max(0, wait));
     }
 
     updateSaveStatus(status) {
@@ -79,11 +150,94 @@ class CVBuilder {
         indicator.style.color = state.color;
     }
 
+    markDirty(field) {
+        if (!field || !field.name) return;
+
+        if (field.dataset.sectionId) {
+            this.dirtySections.add(field.dataset.sectionId);
+        } else {
+            const type = field.name.split('.')[0];
+            if (['personal', 'summary', 'skills'].includes(type)) {
+                this.dirtySections.add(type);
+            }
+        }
+    }
+
+    /**
+     * Re-render only the given sections and swap them into the preview
+     * iframe. Falls back to a full (conditional) reload when a section is
+     * not in the preview yet or renders to nothing.
+     *
+     * With a live update stream open the fragments normally arrive on it;
+     * they are only fetched here when no event shows up in time (e.g., the
+     * save was handled by a worker that cannot reach this tab's stream).
+     */
+    async patchPreview(sectionIds, savedSince) {
+        if (this.liveUpdatesConnected) {
+            if (this.lastLiveUpdateAt < savedSince) {
+                await new Promise(resolve => setTimeout(resolve, LIVE_UPDATE_WAIT));
+            }
+            if (this.lastLiveUpdateAt >= savedSince) return;
+        }
+
+        const doc = this.previewDocument();
+        if (!doc) {
+            this.refreshPreview();
+            return;
+        }
+
+        for (const sectionId of sectionIds) {
+            if (!doc.querySelector(`[data-section-id="${sectionId}"]`)) {
+                this.refreshPreview();
+                return;
+            }
+
+            let html = '';
+            try {
+                const response = await fetch(`/cv/${this.cvId}/preview/sections/${sectionId}`);
+                html = response.ok ? await response.text() : '';
+            } catch (error) {
+                console.error('Error loading preview fragment:', error);
+            }
+            if (!this.replaceFragment(doc, sectionId, html)) {
+                this.refreshPreview();
+                return;
+            }
+        }
+    }
+
+    removeFromPreview(sectionId) {
+        const doc = this.previewDocument();
+        const target = doc && doc.querySelector(`[data-section-id="${sectionId}"]`);
+        const group = target && target.parentElement;
+        if (!target) {
+            this.refreshPreview();
+            return;
+        }
+        target.remove();
+
+        // Last entry of its group: reload so the empty heading goes too
+        if (group && !group.querySelector('[data-section-id]')) {
+            this.refreshPreview();
+        }
+    }
+
     refreshPreview() {
         const iframe = document.getElementById('previewFrame');
-        if (iframe) {
-            iframe.src = `/cv/${this.cvId}/preview?t=${Date.now()}`;
+        if (!iframe) return;
+
+        // The preview is served with an ETag and no-cache, so a reload is a
+        // conditional GET that comes back 304 when nothing changed
+        const previewUrl = `/cv/${this.cvId}/preview`;
+        try {
+            if (iframe.contentWindow.location.pathname === previewUrl) {
+                iframe.contentWindow.location.reload();
+                return;
+            }
+        } catch (e) {
+            // Not loaded yet; fall through and set the src
         }
+        iframe.src = previewUrl;
     }
 
     async loadSections() {
@@ -104,14 +258,17 @@ class CVBuilder {
     }
 
     async saveCV() {
+        clearTimeout(this.saveTimeout);
+        this.pendingSince = null;
         this.updateSaveStatus('saving');
+        const savedSince = Date.now();
 
         try {
-            const formData = this.collectFormData();
-            await this.saveSections(formData);
+            // An explicit save writes every section, not just the edited ones
+            const changed = await this.saveChanges(true);
 
             this.updateSaveStatus('saved');
-            this.refreshPreview();
+            await this.patchPreview(changed, savedSince);
         } catch (error) {
             console.error('Save failed:', error);
             alert('Failed to save CV. Please try again.');
@@ -121,9 +278,98 @@ class CVBuilder {
 
     async autoSave() {
         console.log('Auto-saving...');
-        const formData = this.collectFormData();
-        await this.saveSections(formData);
-        this.updateSaveStatus('saved');
+        this.pendingSince = null;
+        const savedSince = Date.now();
+        const changed = await this.saveChanges();
+        if (this.dirtySections.size === 0) {
+            this.updateSaveStatus('saved');
+        }
+        await this.patchPreview(changed, savedSince);
+    }
+
+    /**
+     * Save pending edits in one batch request and return the ids of the
+     * sections it changed, for patching the preview. Saves never overlap:
+     * edits made while a batch is in flight go out in the next one.
+     */
+    saveChanges(all = false) {
+        const run = () => this.sendBatch(all);
+        this.saving = (this.saving || Promise.resolve()).then(run, run);
+        return this.saving;
+    }
+
+    async sendBatch(all) {
+        const dirty = this.dirtySections;
+        this.dirtySections = new Set();
+
+        const operations = this.buildOperations(this.collectFormData(), all ? null : dirty);
+        if (operations.length === 0) return [];
+
+        let results;
+        try {
+            results = await this.batchSections(operations);
+        } catch (error) {
+            // Keep the edits marked so the next save retries them
+            dirty.forEach(key => this.dirtySections.add(key));
+            throw error;
+        }
+
+        return results.filter(result => result.id).map(result => result.id);
+    }
+
+    /**
+     * Turn form data into batch operations. Single sections are upserted by
+     * type on the server, so no lookup request is needed first. With a
+     * dirty set, only the sections edited since the last save are sent.
+     */
+    buildOperations(data, dirty) {
+        const include = key => dirty === null || dirty.has(key);
+        const operations = [];
+
+        if (include('personal') && Object.keys(data.personal).length > 0) {
+            operations.push({ op: 'upsert', section_type: 'personal', content: data.personal });
+        }
+        if (include('summary') && data.summary) {
+            operations.push({ op: 'upsert', section_type: 'summary', content: { text: data.summary } });
+        }
+        if (include('skills') && Object.keys(data.skills).length > 0) {
+            operations.push({ op: 'upsert', section_type: 'skills', content: data.skills });
+        }
+
+        for (const exp of data.experience) {
+            if (exp.id && exp.id !== 'new' && include(exp.id)) {
+                operations.push({
+                    op: 'update',
+                    id: exp.id,
+                    content: {
+                        title: exp.title,
+                        company: exp.company,
+                        start_date: exp.start,
+                        end_date: exp.end,
+                        location: exp.location,
+                        description: exp.description
+                    }
+                });
+            }
+        }
+
+        for (const edu of data.education) {
+            if (edu.id && edu.id !== 'new' && include(edu.id)) {
+                operations.push({
+                    op: 'update',
+                    id: edu.id,
+                    content: {
+                        degree: edu.degree,
+                        field: edu.field,
+                        institution: edu.institution,
+                        year: edu.year,
+                        gpa: edu.gpa
+                    }
+                });
+            }
+        }
+
+        return operations;
     }
 
     collectFormData() {
@@ -191,88 +437,20 @@ class CVBuilder {
         return data;
     }
 
-    async saveSections(data) {
-        // Save personal info
-        if (data.personal && Object.keys(data.personal).length > 0) {
-            await this.updateOrCreateSection('personal', {
-                content: data.personal
-            });
-        }
-
-        // Save summary
-        if (data.summary) {
-            await this.updateOrCreateSection('summary', {
-                content: { text: data.summary }
-            });
-        }
-
-        // Save skills
-        if (data.skills && Object.keys(data.skills).length > 0) {
-            await this.updateOrCreateSection('skills', {
-                content: data.skills
-            });
-        }
-
-        // Save experience entries
-        for (const exp of data.experience) {
-            if (exp.id && exp.id !== 'new') {
-                await this.updateSection(exp.id, {
-                    content: {
-                        title: exp.title,
-                        company: exp.company,
-                        start_date: exp.start,
-                        end_date: exp.end,
-                        location: exp.location,
-                        description: exp.description
-                    }
-                });
-            }
-        }
-
-        // Save education entries
-        for (const edu of data.education) {
-            if (edu.id && edu.id !== 'new') {
-                await this.updateSection(edu.id, {
-                    content: {
-                        degree: edu.degree,
-                        field: edu.field,
-                        institution: edu.institution,
-                        year: edu.year,
-                        gpa: edu.gpa
-                    }
-                });
-            }
-        }
-    }
-
-    async updateOrCreateSection(type, data) {
-        // Try to find existing section
-        const sections = await this.getSections();
-        const existing = sections.find(s => s.section_type === type);
-
-        if (existing) {
-            return await this.updateSection(existing.id, data);
-        } else {
-            return await this.createSection(type, data);
-        }
-    }
-
-    async getSections() {
-        try {
-            const response = await fetch(`/cv/api/${this.cvId}/sections`, {
-                headers: {
-                    'X-CSRFToken': this.csrfToken
-                }
-            });
+    async batchSections(operations) {
+        const response = await fetch(`/cv/api/${this.cvId}/sections/batch`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': this.csrfToken
+            },
+            body: JSON.stringify({ operations })
+        });
 
-            if (!response.ok) throw new Error('Failed to get sections');
+        if (!response.ok) throw new Error('Failed to save sections');
 
-            const data = await response.json();
-            return data.sections;
-        } catch (error) {
-            console.error('Error getting sections:', error);
-            return [];
-        }
+        const data = await response.json();
+        return data.results;
     }
 
     async createSection(type, data) {
@@ -393,7 +571,12 @@ function deleteSection(id) {
 
     if (confirm('Delete this entry?')) {
         window.cvBuilder.deleteSection(id).then(() => {
-            window.location.reload();
+            // Drop the entry from the form and the preview without reloading
+            const field = document.querySelector(`#cvForm [data-section-id="${id}"]`);
+            const entry = field && field.closest('.multi-entry');
+            if (entry) entry.remove();
+            window.cvBuilder.dirtySections.delete(id);
+            window.cvBuilder.removeFromPreview(id);
         }).catch(error => {
             alert('Failed to delete: ' + error.message);
         });
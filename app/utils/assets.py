@@ -0,0 +1,320 @@
+"""
+Static asset pipeline.
+`flask build-assets` minifies the CSS and JS under app/static, writes each
+file to static/dist under a content-hashed name with .gz and .br variants,
+and records logical name -> built name in static/dist/manifest.json.
+
+Templates link assets with asset_url('css/design-system.css'). With a
+manifest it points at /assets/<hashed name>, which is served precompressed
+and cached as immutable, so repeat visits download nothing; without one
+(development, no build step) it falls back to the plain static URL.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from flask import request, send_from_directory, url_for
+
+# Source files to build, relative to the static folder
+ASSET_PATTERNS = (
+    re.compile(r"^css/[^/]+\.css$"),
+    re.compile(r"^js/[^/]+\.js$"),
+)
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Comments, strings and unquoted url() values; only the CSS between them is rewritten
+_CSS_TOKEN_RE = re.compile(
+    r"""/\*.*?\*/|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\((?!\s*['"])[^)]*\)""",
+    re.DOTALL | re.IGNORECASE,
+)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON_RE = re.compile(r":\s+")
+
+_JS_NEWLINE_RE = re.compile(r"[ \t]*\n\s*")
+# A "/" after one of these starts a regex literal rather than a division
+_JS_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_JS_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "case", "do", "else", "in", "of",
+    "new", "delete", "void", "throw", "yield", "await",
+}
+_JS_WORD_RE = re.compile(r"(\w+)$")
+
+
+def _squeeze_css(css):
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    return _CSS_COLON_RE.sub(":", css)
+
+
+def minify_css(css):
+    """
+    Strip comments and collapse whitespace (conservative; selectors keep their spaces).
+
+    Strings and unquoted url() values are copied as written.
+    """
+    parts = []
+    code = []
+    pos = 0
+    for match in _CSS_TOKEN_RE.finditer(css):
+        code.append(css[pos:match.start()])
+        pos = match.end()
+        if not match.group().startswith("/*"):
+            parts.append(_squeeze_css("".join(code)))
+            parts.append(match.group())
+            code = []
+    code.append(css[pos:])
+    parts.append(_squeeze_css("".join(code)))
+    return "".join(parts).replace(";}", "}").strip()
+
+
+def _scan_string(js, i):
+    """Get the index after the '...' or "..." literal starting at i."""
+    quote = js[i]
+    i += 1
+    while i < len(js) and js[i] != quote:
+        i += 2 if js[i] == "\\" else 1
+    return i + 1
+
+
+def _scan_template(js, i):
+    """
+    Scan template literal text from i (just after ` or the } closing a ${...}).
+
+    Returns:
+        tuple: (index after the text, whether it stopped at a ${ rather than the closing `)
+    """
+    while i < len(js):
+        if js[i] == "\\":
+            i += 2
+        elif js[i] == "`":
+            return i + 1, False
+        elif js.startswith("${", i):
+            return i + 2, True
+        else:
+            i += 1
+    return i, False
+
+
+def _scan_regex(js, i):
+    """Get the index after the regex literal starting at i, or None if there is none."""
+    in_class = False
+    i += 1
+    while i < len(js) and js[i] != "\n":
+        char = js[i]
+        if char == "\\":
+            i += 1
+        elif char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            while i < len(js) and (js[i].isalnum() or js[i] == "_"):
+                i += 1
+            return i
+        i += 1
+    return None
+
+
+def minify_js(js):
+    """
+    Drop comments, indentation, trailing whitespace and blank lines.
+
+    Line breaks are kept so automatic semicolon insertion is unchanged, and
+    strings, template literals and regex literals are copied as written.
+    """
+    parts = []
+    code = []  # code characters since the last literal
+    interpolations = []  # open braces inside each ${...} being scanned
+    after_literal = False
+    i = 0
+
+    def flush():
+        parts.append(_JS_NEWLINE_RE.sub("\n", "".join(code)))
+        code.clear()
+
+    while i < len(js):
+        char = js[i]
+        if js.startswith("//", i):
+            end = js.find("\n", i)
+            i = len(js) if end == -1 else end
+            continue
+        if js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            end = len(js) if end == -1 else end + 2
+            code.append("\n" if "\n" in js[i:end] else " ")
+            i = end
+            continue
+
+        start = i
+        if char in "'\"":
+            i = _scan_string(js, i)
+        elif char == "`":
+            i, opened = _scan_template(js, i + 1)
+            if opened:
+                interpolations.append(0)
+        elif char == "}" and interpolations and interpolations[-1] == 0:
+            interpolations.pop()
+            i, opened = _scan_template(js, i + 1)
+            if opened:
+                interpolations.append(0)
+        elif char == "/" and _regex_allowed("".join(code), after_literal):
+            i = _scan_regex(js, i) or i
+
+        if i != start:
+            flush()
+            parts.append(js[start:i])
+            after_literal = True
+            continue
+
+        if interpolations and char in "{}":
+            interpolations[-1] += 1 if char == "{" else -1
+        code.append(char)
+        if not char.isspace():
+            after_literal = False
+        i += 1
+
+    flush()
+    return "".join(parts).strip() + "\n"
+
+
+def _regex_allowed(code, after_literal):
+    """Whether a "/" following this code starts a regex literal."""
+    code = code.rstrip()
+    if not code:
+        return not after_literal
+    if code[-1] in _JS_REGEX_AFTER:
+        return True
+    word = _JS_WORD_RE.search(code)
+    return word is not None and word.group(1) in _JS_REGEX_KEYWORDS
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+def _compress_br(data):
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+
+def build_assets(static_folder):
+    """
+    Minify, fingerprint and precompress the static assets.
+
+    Args:
+        static_folder: The app's static folder
+
+    Returns:
+        dict: Manifest of logical name -> built name (relative to the static folder)
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    # Start clean so builds of old file versions do not pile up
+    shutil.rmtree(dist, ignore_errors=True)
+    os.makedirs(dist)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != dist]
+        for filename in sorted(files):
+            name = os.path.relpath(os.path.join(root, filename), static_folder).replace(os.sep, "/")
+            if not any(pattern.match(name) for pattern in ASSET_PATTERNS):
+                continue
+
+            base, ext = os.path.splitext(name)
+            with open(os.path.join(static_folder, name), encoding="utf-8") as f:
+                data = MINIFIERS[ext](f.read()).encode("utf-8")
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            built = f"{base}.{digest}{ext}"
+            target = os.path.join(dist, built)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            with open(target, "wb") as f:
+                f.write(data)
+            with open(target + ".gz", "wb") as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            compressed = _compress_br(data)
+            if compressed is not None:
+                with open(target + ".br", "wb") as f:
+                    f.write(compressed)
+
+            manifest[name] = built
+
+    with open(os.path.join(dist, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class AssetManifest:
+    """Maps logical asset names to their fingerprinted builds."""
+
+    def __init__(self):
+        self.directory = None
+        self.max_age = 31536000
+        self._manifest = {}
+
+    def init_app(self, app):
+        """Load the manifest (if built) and register the asset route and template helper."""
+        self.directory = os.path.join(app.static_folder, DIST_DIR)
+        self.max_age = app.config["ASSETS_MAX_AGE"]
+        if app.config["ASSETS_ENABLED"]:
+            self.load()
+
+        app.add_url_rule("/assets/<path:filename>", "assets", self.serve)
+        app.jinja_env.globals["asset_url"] = self.url
+
+    def load(self):
+        """(Re)read static/dist/manifest.json; no manifest means serve unbuilt files."""
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._manifest = json.load(f)
+        except FileNotFoundError:
+            self._manifest = {}
+
+    def url(self, name):
+        """Get the URL of an asset by logical name (e.g., 'js/cv_builder.js')."""
+        built = self._manifest.get(name)
+        if built is None:
+            return url_for("static", filename=name)
+        return url_for("assets", filename=built)
+
+    def serve(self, filename):
+        """Serve a built asset, precompressed when the client accepts it."""
+        accepted = request.accept_encodings
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if accepted[encoding] and os.path.isfile(os.path.join(self.directory, filename + suffix)):
+                response = send_from_directory(self.directory, filename + suffix, max_age=self.max_age)
+                response.content_encoding = encoding
+                response.mimetype = _mimetype(filename)
+                break
+        else:
+            response = send_from_directory(self.directory, filename, max_age=self.max_age)
+
+        # The hash in the name changes with the content
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+def _mimetype(filename):
+    return "text/css" if filename.endswith(".css") else "application/javascript"
+
+
+asset_manifest = AssetManifest()
+
+
+def init_assets(app):
+    """Initialize the asset manifest and /assets route."""
+    asset_manifest.init_app(app)
+    return asset_manifest
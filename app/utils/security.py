@@ -2,6 +2,9 @@
 Security utilities.
 CSP headers, sanitization helpers, etc.
 """
+import os
+import stat
+
 import bleach
 
 
@@ -45,3 +48,45 @@ def validate_url(url, allowed_schemes=None):
         return result.scheme in allowed_schemes
     except Exception:
         return False
+
+
+def private_directory(path):
+    """
+    Create a directory only this user can access, or check an existing one.
+
+    Cache directories hold files the app executes (template bytecode) or
+    serves to users (PDFs, thumbnails), so a directory another local user
+    created or can write to must not be used.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        str: The path
+
+    Raises:
+        RuntimeError: If the path is a symlink or not a directory, is owned by
+        another user, or is accessible to group or others
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise RuntimeError(f"Refusing to use {path}: not a directory")
+    # No owner or mode bits to check on Windows
+    if hasattr(os, "getuid"):
+        if info.st_uid != os.getuid():
+            raise RuntimeError(f"Refusing to use {path}: owned by another user")
+        if info.st_mode & 0o077:
+            raise RuntimeError(f"Refusing to use {path}: accessible to other users (chmod 700 it)")
+    return path
+
+
+def app_directory(app, config_key, default_name):
+    """
+    Resolve a directory setting (default: <instance path>/<default_name>) and make it private.
+
+    The resolved path is written back to app.config.
+    """
+    path = app.config.get(config_key) or os.path.join(app.instance_path, default_name)
+    app.config[config_key] = private_directory(path)
+    return path
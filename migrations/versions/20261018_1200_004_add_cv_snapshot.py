@@ -0,0 +1,112 @@
+"""Add denormalized CV snapshots
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# CVs backfilled per batch
+CHUNK_SIZE = 500
+
+# Frozen copy of the version 1 snapshot layout (app.cv.snapshot at the time
+# of this revision), so later changes to the app cannot alter this migration
+SNAPSHOT_VERSION = 1
+CV_FIELDS = ('title', 'template_slug', 'primary_color', 'font_pair')
+
+cvs = sa.table(
+    'cvs',
+    sa.column('id', sa.String),
+    sa.column('title', sa.String),
+    sa.column('template_slug', sa.String),
+    sa.column('primary_color', sa.String),
+    sa.column('font_pair', sa.String),
+    sa.column('snapshot', sa.JSON),
+    sa.column('snapshot_hash', sa.String),
+)
+
+cv_sections = sa.table(
+    'cv_sections',
+    sa.column('id', sa.String),
+    sa.column('cv_id', sa.String),
+    sa.column('section_type', sa.String),
+    sa.column('label', sa.String),
+    sa.column('content', sa.JSON),
+    sa.column('display_order', sa.Integer),
+    sa.column('is_visible', sa.Boolean),
+)
+
+
+def section_entry(section):
+    return {
+        'id': section.id,
+        'section_type': section.section_type,
+        'label': section.label,
+        'content': section.content if section.content is not None else {},
+        'display_order': section.display_order if section.display_order is not None else 0,
+        'is_visible': section.is_visible if section.is_visible is not None else True,
+    }
+
+
+def build_snapshot(cv, sections):
+    """Build a version 1 snapshot and the hex SHA-256 of its canonical JSON."""
+    entries = sorted((section_entry(section) for section in sections), key=lambda s: s['display_order'])
+    snapshot = {'v': SNAPSHOT_VERSION, **{field: getattr(cv, field) for field in CV_FIELDS}, 'sections': entries}
+    encoded = json.dumps(snapshot, sort_keys=True, separators=(',', ':'), default=str)
+    return snapshot, hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def upgrade():
+    op.add_column('cvs', sa.Column('snapshot', sa.JSON(), nullable=True))
+    op.add_column('cvs', sa.Column('snapshot_hash', sa.String(64), nullable=True))
+
+    # Backfill in keyset-paginated chunks so large tables are never loaded at once
+    bind = op.get_bind()
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(cvs.c.id, cvs.c.title, cvs.c.template_slug, cvs.c.primary_color, cvs.c.font_pair)
+            .where(cvs.c.id > last_id)
+            .order_by(cvs.c.id)
+            .limit(CHUNK_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        sections_by_cv = {row.id: [] for row in rows}
+        sections = bind.execute(
+            sa.select(cv_sections)
+            .where(cv_sections.c.cv_id.in_(list(sections_by_cv)))
+            .order_by(cv_sections.c.display_order)
+        )
+        for section in sections:
+            sections_by_cv[section.cv_id].append(section)
+
+        updates = []
+        for row in rows:
+            snapshot, digest = build_snapshot(row, sections_by_cv[row.id])
+            updates.append({'cv_id': row.id, 'snapshot': snapshot, 'snapshot_hash': digest})
+        bind.execute(
+            cvs.update()
+            .where(cvs.c.id == sa.bindparam('cv_id'))
+            .values(snapshot=sa.bindparam('snapshot'), snapshot_hash=sa.bindparam('snapshot_hash')),
+            updates,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('cvs') as batch_op:
+        batch_op.drop_column('snapshot_hash')
+        batch_op.drop_column('snapshot')
@@ -0,0 +1,35 @@
+"""Add composite indexes for the dashboard and section queries
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Dashboard: WHERE user_id = ? AND is_deleted = false ORDER BY updated_at DESC
+    op.create_index('ix_cvs_user_id_is_deleted_updated_at', 'cvs',
+                    ['user_id', 'is_deleted', 'updated_at', 'id'], unique=False)
+    # Renders: WHERE cv_id = ? ORDER BY display_order
+    op.create_index('ix_cv_sections_cv_id_display_order', 'cv_sections',
+                    ['cv_id', 'display_order'], unique=False)
+
+    # Leading columns of the new indexes; the single-column ones are redundant
+    op.drop_index('ix_cvs_user_id', table_name='cvs')
+    op.drop_index('ix_cv_sections_cv_id', table_name='cv_sections')
+
+
+def downgrade():
+    op.create_index('ix_cv_sections_cv_id', 'cv_sections', ['cv_id'], unique=False)
+    op.create_index('ix_cvs_user_id', 'cvs', ['user_id'], unique=False)
+
+    op.drop_index('ix_cv_sections_cv_id_display_order', table_name='cv_sections')
+    op.drop_index('ix_cvs_user_id_is_deleted_updated_at', table_name='cvs')
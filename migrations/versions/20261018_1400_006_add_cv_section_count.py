@@ -0,0 +1,30 @@
+"""Add precomputed section counts to CVs
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('cvs', sa.Column('section_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # One set-based UPDATE; the (cv_id, display_order) index serves the subquery
+    op.execute(
+        'UPDATE cvs SET section_count = '
+        '(SELECT COUNT(*) FROM cv_sections WHERE cv_sections.cv_id = cvs.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('cvs') as batch_op:
+        batch_op.drop_column('section_count')
@@ -0,0 +1,30 @@
+"""Add maintained active CV counts to users
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('active_cv_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # One set-based UPDATE; the (user_id, is_deleted, ...) index serves the subquery
+    op.execute(
+        'UPDATE users SET active_cv_count = '
+        '(SELECT COUNT(*) FROM cvs WHERE cvs.user_id = users.id AND cvs.is_deleted = false)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('active_cv_count')
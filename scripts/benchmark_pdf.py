@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+"""
+PDF rendering benchmarks.
+
+Suite: synthetic CVs from 5 to 200 sections, rendered with every template.
+Each case runs in a fresh process and records Jinja render time, WeasyPrint
+layout time, PDF size, peak RSS and SQL query count. Results are written as
+JSON so runs from different commits can be compared.
+
+    python scripts/benchmark_pdf.py suite --output bench.json
+    python scripts/benchmark_pdf.py suite --output new.json --compare bench.json
+
+Cold/warm: compares the first render in a process (font discovery and
+stylesheet parsing) against renders that reuse the render context.
+
+    python scripts/benchmark_pdf.py coldwarm --iterations 5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_SIZES = (5, 20, 50, 100, 200)
+DEFAULT_TEMPLATES = ("ats_clean", "ats_modern", "ats_executive")
+
+# Metrics compared by --compare (lower is better for all of them)
+COMPARED_METRICS = ("jinja_ms", "layout_ms", "pdf_bytes", "peak_rss_kb", "sql_queries")
+
+
+def build_synthetic_cv(template_slug, section_count):
+    """
+    Create a CV with section_count sections.
+
+    One personal, summary and skills section each; the rest split 3:1
+    between experience and education entries.
+    """
+    from app.extensions import db
+    from app.models import User, CV, CVSection
+
+    user = User(email=f"bench-{template_slug}-{section_count}@example.com", display_name="Bench User")
+    db.session.add(user)
+    db.session.flush()
+
+    cv = CV(user_id=user.id, title="Benchmark CV", template_slug=template_slug, primary_color="#4285f4")
+    db.session.add(cv)
+
+    sections = [
+        ("personal", {"name": "Jane Doe", "email": "jane@example.com", "phone": "+1 555 0100",
+                      "location": "Remote", "headline": "Senior Software Engineer",
+                      "linkedin": "https://linkedin.com/in/jane", "github": "https://github.com/jane"}),
+        ("summary", {"text": "Engineer with ten years of experience building web platforms. " * 3}),
+        ("skills", {"technical": "Python, SQL, Docker, Kubernetes, AWS", "soft": "Leadership, Mentoring",
+                    "languages": "English, Spanish"}),
+    ]
+    for i in range(max(section_count - len(sections), 0)):
+        if i % 4 == 3:
+            sections.append(("education", {"degree": "BSc", "field": "Computer Science",
+                                           "institution": f"University {i}", "year": "2015", "gpa": "3.8"}))
+        else:
+            sections.append(("experience", {
+                "title": f"Engineer {i}", "company": f"Company {i}", "start_date": "Jan 2020",
+                "end_date": "Present", "location": "Remote",
+                "description": "\n".join(f"Delivered project {j} ahead of schedule" for j in range(5)),
+            }))
+
+    for order, (section_type, content) in enumerate(sections[:section_count]):
+        db.session.add(CVSection(cv=cv, section_type=section_type, content=content, display_order=order))
+    db.session.commit()
+    return cv
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run_case(template_slug, section_count, repeat):
+    """
+    Measure one (template, size) case. Runs in its own process.
+
+    Returns:
+        dict: Metrics for this case
+    """
+    from app import create_app
+    from app.extensions import db
+    from app.cv.pdf_generator import build_render_args, html_to_pdf
+    from app.cv.render_engine import render_engine
+    from app.models import CV
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        cv_id = build_synthetic_cv(template_slug, section_count).id
+
+        counter = QueryCounter(db.engine)
+        jinja_times = []
+        for _ in range(repeat):
+            # Start from a clean session so every run loads the CV like a request would
+            db.session.expunge_all()
+            counter.count = 0
+            cv = db.session.get(CV, cv_id)
+            render_args, elapsed = _timed(lambda: build_render_args(cv, template_slug))
+            jinja_times.append(elapsed)
+        sql_queries = counter.count
+
+        layout_times = []
+        pdf_bytes = None
+        if render_engine.available:
+            # First layout warms the render context; only later runs are measured
+            html_to_pdf(**render_args)
+            for _ in range(repeat):
+                pdf, elapsed = _timed(lambda: html_to_pdf(**render_args))
+                layout_times.append(elapsed)
+            pdf_bytes = len(pdf)
+
+    return {
+        "template": template_slug,
+        "sections": section_count,
+        "html_bytes": len(render_args["html_content"].encode("utf-8")),
+        "jinja_ms": round(statistics.median(jinja_times), 2),
+        "layout_ms": round(statistics.median(layout_times), 2) if layout_times else None,
+        "pdf_bytes": pdf_bytes,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "sql_queries": sql_queries,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(templates, sizes, repeat):
+    """Run every case in a fresh process so peak RSS is per case."""
+    from app.cv.render_engine import render_engine
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for template_slug in templates:
+            for section_count in sizes:
+                result = pool.apply(run_case, (template_slug, section_count, repeat))
+                results.append(result)
+                layout = f"{result['layout_ms']:>10.1f}" if result["layout_ms"] is not None else f"{'n/a':>10}"
+                print(
+                    f"{template_slug:<16}{section_count:>5}{result['jinja_ms']:>9.1f}{layout}"
+                    f"{result['pdf_bytes'] or 0:>10}{result['peak_rss_kb']:>10}{result['sql_queries']:>6}"
+                )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "weasyprint": getattr(render_engine.weasyprint, "__version__", None) if render_engine.available else None,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline_path):
+    """Print per-case changes against a previous run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    previous = {(r["template"], r["sections"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    for result in current["results"]:
+        before = previous.get((result["template"], result["sections"]))
+        if before is None:
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result.get(metric)
+            if old and new is not None:
+                changes.append(f"{metric} {(new - old) / old * 100:+.1f}%")
+        print(f"  {result['template']:<16}{result['sections']:>5}  " + ", ".join(changes))
+
+
+def coldwarm(iterations):
+    """Print cold and warm render latency for every CV template."""
+    from app import create_app
+    from app.extensions import db
+    from app.cv.pdf_generator import render_pdf
+    from app.cv.render_context import render_context, available_template_slugs
+    from app.cv.render_engine import render_engine
+
+    if not render_engine.available:
+        print("WeasyPrint is not available; nothing to benchmark.")
+        return 1
+
+    app = create_app("testing")
+
+    with app.app_context():
+        db.create_all()
+
+        print(f"{'template':<16}{'cold ms':>10}{'warm p50 ms':>14}{'warm min ms':>14}")
+        for template_slug in available_template_slugs():
+            cv = build_synthetic_cv(template_slug, 12)
+
+            render_context.clear()
+            _, cold = _timed(lambda: render_pdf(cv, template_slug))
+            warm = [_timed(lambda: render_pdf(cv, template_slug))[1] for _ in range(iterations)]
+
+            print(f"{template_slug:<16}{cold:>10.1f}{statistics.median(warm):>14.1f}{min(warm):>14.1f}")
+
+        db.drop_all()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF rendering benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    suite = commands.add_parser("suite", help="templates x CV sizes, JSON output")
+    suite.add_argument("--templates", default=",".join(DEFAULT_TEMPLATES))
+    suite.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES))
+    suite.add_argument("--repeat", type=int, default=3, help="timed runs per case (median is reported)")
+    suite.add_argument("--output", default="bench_output.json")
+    suite.add_argument("--compare", default=None, help="previous JSON output to diff against")
+
+    cold = commands.add_parser("coldwarm", help="cold versus warm render latency")
+    cold.add_argument("--iterations", type=int, default=5, help="warm renders per template")
+
+    args = parser.parse_args()
+
+    if args.command == "coldwarm":
+        return coldwarm(args.iterations)
+
+    print(f"{'template':<16}{'size':>5}{'jinja ms':>9}{'layout ms':>10}{'pdf B':>10}{'rss KB':>10}{'sql':>6}")
+    current = run_suite(
+        templates=args.templates.split(","),
+        sizes=[int(size) for size in args.sizes.split(",")],
+        repeat=args.repeat,
+    )
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        compare(current, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,14 @@ Pytest configuration and fixtures.
 """
 import pytest
 from app import create_app
-from app.extensions import db as _db
+from app.extensions import cache, db as _db
 from app.models import User, CV, CVSection
 
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: seeds a large database (deselect with -m 'not slow')")
+
+
 @pytest.fixture(scope="session")
 def app():
     """Create application for testing."""
@@ -25,23 +29,17 @@ def _database(app):
 
 @pytest.fixture(scope="function")
 def db(_database, app):
-    """Create a new database session for each test."""
+    """Database for one test; every table and the app cache are emptied afterwards."""
     with app.app_context():
-        # Begin a nested transaction
-        connection = _database.engine.connect()
-        transaction = connection.begin()
-
-        # Bind session to connection
-        options = dict(bind=connection, binds={})
-        session = _database.create_scoped_session(options=options)
-        _database.session = session
-
         yield _database
 
-        # Rollback transaction and close connection
-        transaction.rollback()
-        connection.close()
-        session.remove()
+        _database.session.rollback()
+        for table in reversed(_database.metadata.sorted_tables):
+            _database.session.execute(table.delete())
+        _database.session.commit()
+        _database.session.remove()
+        # Render cache keys depend only on content, so entries would leak between tests
+        cache.clear()
 
 
 @pytest.fixture
@@ -88,5 +86,6 @@ def cv(db, user):
 def authenticated_client(client, user):
     """Create an authenticated test client."""
     with client.session_transaction() as session:
-        session["user_id"] = user.id
+        session["_user_id"] = user.id
+        session["_fresh"] = True
     return client
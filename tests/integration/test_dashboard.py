@@ -0,0 +1,51 @@
+"""
+Tests for the CV dashboard (GET /cv/dashboard).
+"""
+from app.models import CV
+
+
+def test_lists_cvs_even_if_the_counter_is_stale(authenticated_client, db, user, cv):
+    # The cv fixture adds a row without reserving a slot: active_cv_count is 0
+    assert user.active_cv_count == 0
+
+    html = authenticated_client.get("/cv/dashboard").get_data(as_text=True)
+
+    assert 'class="cv-grid"' in html
+    assert "Test CV" in html
+    assert "No CVs Yet" not in html
+
+
+def test_empty_state_when_the_page_has_no_rows(authenticated_client, db, user):
+    user.active_cv_count = 1
+    db.session.commit()
+
+    html = authenticated_client.get("/cv/dashboard").get_data(as_text=True)
+
+    assert "No CVs Yet" in html
+    assert 'class="cv-grid"' not in html
+
+
+def test_stale_cursor_links_back_to_the_first_page(authenticated_client, db, user, cv):
+    html = authenticated_client.get("/cv/dashboard?after=2000-01-01T00:00:00~0").get_data(as_text=True)
+
+    assert "No CVs Yet" not in html
+    assert "← Newest" in html
+
+
+def test_deleted_cvs_are_not_listed(authenticated_client, db, user, cv):
+    db.session.add(CV(user_id=user.id, title="Deleted CV", template_slug="ats_clean", is_deleted=True))
+    db.session.commit()
+
+    html = authenticated_client.get("/cv/dashboard").get_data(as_text=True)
+
+    assert "Test CV" in html
+    assert "Deleted CV" not in html
+
+
+def test_deleting_a_cv_invalidates_the_cached_page(authenticated_client, db, user, cv):
+    assert "Test CV" in authenticated_client.get("/cv/dashboard").get_data(as_text=True)
+
+    response = authenticated_client.post(f"/cv/{cv.id}/delete")
+
+    assert response.get_json() == {"success": True}
+    assert "Test CV" not in authenticated_client.get("/cv/dashboard").get_data(as_text=True)
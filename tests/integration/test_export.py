@@ -0,0 +1,30 @@
+"""
+Tests for the export endpoint (GET /cv/export).
+"""
+import io
+import json
+import zipfile
+
+from app.cv.render_engine import render_engine
+
+
+def test_streams_sources_and_error_files_without_an_engine(authenticated_client, db, cv, monkeypatch):
+    monkeypatch.setattr(render_engine, "_loaded", True)
+    monkeypatch.setattr(render_engine, "_module", None)
+
+    response = authenticated_client.get("/cv/export")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    names = archive.namelist()
+    assert len(names) == 2
+    source = json.loads(archive.read(next(name for name in names if name.endswith(".json"))))
+    assert source["title"] == "Test CV"
+    assert any(name.endswith(".error.txt") for name in names)
+
+
+def test_redirects_without_cvs(authenticated_client, db, user):
+    response = authenticated_client.get("/cv/export")
+
+    assert response.status_code == 302
@@ -0,0 +1,117 @@
+"""
+Tests for live preview updates over Server-Sent Events.
+"""
+import json
+
+import pytest
+
+from app.cv.live_updates import live_updates, LocalBroker
+from app.models import CVSection
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    """Live updates on, with short streams and one stream slot."""
+    monkeypatch.setattr(live_updates, "enabled", True)
+    monkeypatch.setattr(live_updates, "broker", LocalBroker())
+    monkeypatch.setattr(live_updates, "heartbeat", 0.05)
+    monkeypatch.setattr(live_updates, "max_stream_seconds", 0.2)
+    monkeypatch.setattr(live_updates, "max_streams", 1)
+    monkeypatch.setattr(live_updates, "_streams", 0)
+    return live_updates
+
+
+def events(cv):
+    return f"/cv/{cv.id}/events"
+
+
+class TestEventsEndpoint:
+    def test_404_when_disabled(self, client, cv):
+        assert not live_updates.enabled
+        assert client.get(events(cv)).status_code == 404
+
+    def test_404_for_deleted_cv(self, client, db, cv, enabled):
+        cv.is_deleted = True
+        db.session.commit()
+
+        assert client.get(events(cv)).status_code == 404
+
+    def test_streams_events(self, client, cv, enabled):
+        response = client.get(events(cv))
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["X-Accel-Buffering"] == "no"
+        body = response.get_data(as_text=True)
+        assert body.startswith("retry: 2000\n\n")
+        assert ": keep-alive\n\n" in body
+
+    def test_503_above_the_stream_cap(self, client, cv, enabled):
+        first = client.get(events(cv), buffered=False)
+        assert first.status_code == 200
+
+        second = client.get(events(cv))
+        assert second.status_code == 503
+        assert second.headers["Retry-After"] == "60"
+
+        # Closing a stream frees its slot
+        first.close()
+        assert enabled._streams == 0
+        assert client.get(events(cv)).status_code == 200
+
+
+class TestPublish:
+    def test_subscribers_get_rendered_fragments(self, app, db, cv, enabled):
+        section = CVSection(cv_id=cv.id, section_type="summary", content={"text": "Hello"}, display_order=0)
+        db.session.add(section)
+        db.session.commit()
+
+        stream = enabled.stream(cv.id)
+        assert next(stream) == "retry: 2000\n\n"
+        # Subscribed once the generator has started
+        enabled.publish(cv, sections=[section], removed=["gone"])
+        event = next(stream)
+        stream.close()
+
+        assert event.startswith("event: update\ndata: ")
+        message = json.loads(event.split("data: ", 1)[1])
+        assert "Hello" in message["fragments"][section.id]
+        assert message["removed"] == ["gone"]
+        assert message["reload"] is False
+        assert message["version"]
+
+    def test_section_without_macro_asks_for_reload(self, app, db, cv, enabled):
+        section = CVSection(cv_id=cv.id, section_type="volunteering", content={}, display_order=0)
+        db.session.add(section)
+        db.session.commit()
+
+        stream = enabled.stream(cv.id)
+        next(stream)
+        enabled.publish(cv, sections=[section])
+        message = json.loads(next(stream).split("data: ", 1)[1])
+        stream.close()
+
+        assert message["reload"] is True
+        assert message["fragments"] == {}
+
+    def test_nothing_rendered_without_subscribers(self, app, db, cv, enabled, monkeypatch):
+        from app.cv import preview
+
+        def fail(*args, **kwargs):
+            raise AssertionError("fragment rendered with nobody listening")
+
+        monkeypatch.setattr(preview, "render_section_fragment", fail)
+
+        enabled.publish(cv, sections=[CVSection(id="s", cv_id=cv.id, section_type="summary", content={})])
+
+
+class TestEditorFlag:
+    def test_editor_disables_the_stream_by_default(self, client, cv):
+        html = client.get(f"/cv/{cv.id}/edit").get_data(as_text=True)
+
+        assert 'data-live-updates="false"' in html
+
+    def test_editor_enables_the_stream(self, client, cv, enabled):
+        html = client.get(f"/cv/{cv.id}/edit").get_data(as_text=True)
+
+        assert 'data-live-updates="true"' in html
@@ -0,0 +1,85 @@
+"""
+Tests for PDF downloads served from the render cache.
+"""
+import pytest
+
+from app.cv.render_cache import pdf_cache, compute_cache_key
+from app.cv.render_engine import render_engine
+
+PDF = b"%PDF-1.7 " + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def no_engine(monkeypatch):
+    """Pretend WeasyPrint is missing, so only cached PDFs can be sent."""
+    monkeypatch.setattr(render_engine, "_loaded", True)
+    monkeypatch.setattr(render_engine, "_module", None)
+
+
+@pytest.fixture
+def disk_pdf_cache(tmp_path, monkeypatch):
+    """Switch the PDF cache to the filesystem backend in a private directory."""
+    directory = tmp_path / "pdf_cache"
+    directory.mkdir(mode=0o700)
+    monkeypatch.setattr(pdf_cache, "backend", "filesystem")
+    monkeypatch.setattr(pdf_cache, "directory", str(directory))
+    monkeypatch.setattr(pdf_cache, "max_bytes", 10 * 1024 * 1024)
+    monkeypatch.setattr(pdf_cache, "_index", type(pdf_cache._index)())
+    monkeypatch.setattr(pdf_cache, "_size", 0)
+    return pdf_cache
+
+
+@pytest.fixture(params=["flask-caching", "filesystem"])
+def cached_pdf(request, db, cv, no_engine):
+    """The test CV's PDF, already in the cache (both backends)."""
+    if request.param == "filesystem":
+        request.getfixturevalue("disk_pdf_cache")
+    key = compute_cache_key(cv, cv.template_slug)
+    pdf_cache.set(key, PDF)
+    return key
+
+
+def download(client, cv, **headers):
+    return client.get(f"/cv/{cv.id}/download", headers=headers)
+
+
+class TestCachedDownload:
+    def test_full_download(self, authenticated_client, cv, cached_pdf):
+        response = download(authenticated_client, cv)
+
+        assert response.status_code == 200
+        assert response.data == PDF
+        assert response.headers["Content-Length"] == str(len(PDF))
+        assert response.headers["ETag"] == f'"{cached_pdf}"'
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["Content-Disposition"].startswith("attachment; filename=Test_CV_CV_")
+
+    def test_range_request(self, authenticated_client, cv, cached_pdf):
+        response = download(authenticated_client, cv, Range="bytes=100-199")
+
+        assert response.status_code == 206
+        assert response.data == PDF[100:200]
+        assert response.headers["Content-Range"] == f"bytes 100-199/{len(PDF)}"
+
+    def test_unsatisfiable_range(self, authenticated_client, cv, cached_pdf):
+        response = download(authenticated_client, cv, Range=f"bytes={len(PDF) + 10}-")
+
+        assert response.status_code == 416
+
+    def test_if_none_match(self, authenticated_client, cv, cached_pdf):
+        response = download(authenticated_client, cv, **{"If-None-Match": f'"{cached_pdf}"'})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+
+def test_other_users_cv_is_forbidden(client, db, cv, no_engine):
+    from app.models import User
+
+    stranger = User(email="stranger@example.com", display_name="Stranger")
+    db.session.add(stranger)
+    db.session.commit()
+    with client.session_transaction() as session:
+        session["_user_id"] = stranger.id
+
+    assert download(client, cv).status_code == 403
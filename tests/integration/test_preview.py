@@ -0,0 +1,58 @@
+"""
+Tests for the live preview (GET /cv/<cv_id>/preview).
+"""
+import pytest
+
+from app.models import CVSection
+
+
+@pytest.fixture
+def summary(db, cv):
+    section = CVSection(cv_id=cv.id, section_type="summary", content={"text": "Builds compilers"}, display_order=1)
+    db.session.add(section)
+    db.session.commit()
+    return section
+
+
+class TestPreviewConditionalGet:
+    def test_sends_an_etag_and_revalidates(self, client, cv, summary):
+        response = client.get(f"/cv/{cv.id}/preview")
+
+        assert response.status_code == 200
+        assert "Builds compilers" in response.get_data(as_text=True)
+        assert response.headers["ETag"]
+        assert "no-cache" in response.headers["Cache-Control"]
+        assert "private" in response.headers["Cache-Control"]
+
+    def test_unchanged_preview_is_304(self, client, cv, summary):
+        etag = client.get(f"/cv/{cv.id}/preview").headers["ETag"]
+
+        response = client.get(f"/cv/{cv.id}/preview", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+
+    def test_edit_changes_the_etag(self, client, db, cv, summary):
+        etag = client.get(f"/cv/{cv.id}/preview").headers["ETag"]
+        summary.content = {"text": "Builds databases"}
+        db.session.commit()
+
+        response = client.get(f"/cv/{cv.id}/preview", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert "Builds databases" in response.get_data(as_text=True)
+
+    def test_metadata_change_changes_the_etag(self, client, db, cv):
+        etag = client.get(f"/cv/{cv.id}/preview").headers["ETag"]
+        cv.primary_color = "#112233"
+        db.session.commit()
+
+        assert client.get(f"/cv/{cv.id}/preview").headers["ETag"] != etag
+
+    def test_deleted_cv(self, client, db, cv):
+        cv.is_deleted = True
+        db.session.commit()
+
+        assert client.get(f"/cv/{cv.id}/preview").status_code == 404
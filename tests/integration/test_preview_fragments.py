@@ -0,0 +1,47 @@
+"""
+Tests for preview section fragments (GET /cv/<cv_id>/preview/sections/<section_id>).
+"""
+import pytest
+
+from app.models import CV, CVSection
+
+
+@pytest.fixture
+def summary(db, cv):
+    section = CVSection(cv_id=cv.id, section_type="summary", content={"text": "Builds compilers"}, display_order=1)
+    db.session.add(section)
+    db.session.commit()
+    return section
+
+
+class TestSectionFragment:
+    def url(self, cv, section):
+        return f"/cv/{cv.id}/preview/sections/{section.id}"
+
+    def test_renders_one_section(self, client, cv, summary):
+        response = client.get(self.url(cv, summary))
+
+        assert response.status_code == 200
+        html = response.get_data(as_text=True)
+        assert "Builds compilers" in html
+        assert "<html" not in html
+        assert "no-store" in response.headers["Cache-Control"]
+
+    def test_fragment_matches_the_full_preview(self, client, cv, summary):
+        fragment = client.get(self.url(cv, summary)).get_data(as_text=True)
+
+        assert fragment in client.get(f"/cv/{cv.id}/preview").get_data(as_text=True)
+
+    def test_section_of_another_cv(self, client, db, user, cv, summary):
+        other = CV(user_id=user.id, title="Other", template_slug="ats_clean")
+        db.session.add(other)
+        db.session.commit()
+
+        assert client.get(self.url(other, summary)).status_code == 404
+
+    def test_section_type_without_macro(self, client, db, cv):
+        custom = CVSection(cv_id=cv.id, section_type="volunteering", content={}, display_order=2)
+        db.session.add(custom)
+        db.session.commit()
+
+        assert client.get(self.url(cv, custom)).status_code == 404
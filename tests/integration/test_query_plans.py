@@ -0,0 +1,121 @@
+"""
+Query plan check for the hot read paths.
+
+Seeds synthetic users, CVs and sections, runs EXPLAIN on the queries the
+dashboard, template renders and section API issue, and fails if any of
+them scans a table or sorts in a temporary B-tree instead of reading an
+index in order.
+
+The default seed keeps the suite fast; for the full-size check run
+
+    QUERY_PLAN_CVS=100000 pytest -m slow tests/integration/test_query_plans.py
+"""
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import User, CV, CVSection
+
+SEED_CVS = int(os.environ.get("QUERY_PLAN_CVS", "5000"))
+SEED_CVS_PER_USER = int(os.environ.get("QUERY_PLAN_CVS_PER_USER", "50"))
+
+INSERT_CHUNK = 10000
+
+SECTION_TYPES = ("personal", "summary", "experience", "experience", "education", "skills")
+
+# Plan fragments that mean "no usable index", per dialect
+BAD_PLAN_MARKERS = {
+    "sqlite": ("SCAN ", "USE TEMP B-TREE"),
+    "postgresql": ("Seq Scan", "Sort "),
+}
+
+
+def seed(db, cv_count, cvs_per_user):
+    """Insert users, CVs (10% soft-deleted) and 2-6 sections per CV."""
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    users = [
+        {"id": str(uuid.uuid4()), "email": f"plan-{i}@example.com", "display_name": f"User {i}",
+         "is_active": True, "created_at": now}
+        for i in range(max(cv_count // cvs_per_user, 1))
+    ]
+
+    db.session.execute(db.insert(User), users)
+
+    cvs, sections = [], []
+    for i in range(cv_count):
+        cv_id = str(uuid.uuid4())
+        deleted = rng.random() < 0.1
+        cvs.append({
+            "id": cv_id, "user_id": users[i % len(users)]["id"], "title": f"CV {i}",
+            "template_slug": "ats_clean", "is_deleted": deleted, "deleted_at": now if deleted else None,
+            "created_at": now, "updated_at": now - timedelta(minutes=rng.randrange(500000)),
+        })
+        for order, section_type in enumerate(SECTION_TYPES[:rng.randint(2, len(SECTION_TYPES))]):
+            sections.append({
+                "id": str(uuid.uuid4()), "cv_id": cv_id, "section_type": section_type,
+                "content": {"text": "x"}, "display_order": order, "is_visible": True,
+                "created_at": now, "updated_at": now,
+            })
+
+        if len(cvs) >= INSERT_CHUNK:
+            db.session.execute(db.insert(CV), cvs)
+            db.session.execute(db.insert(CVSection), sections)
+            cvs, sections = [], []
+    if cvs:
+        db.session.execute(db.insert(CV), cvs)
+        db.session.execute(db.insert(CVSection), sections)
+    db.session.commit()
+
+
+def hot_queries():
+    """The statements issued by the app's hot read paths, built the way the app builds them."""
+    from app.cv.dashboard import page_query, encode_cursor
+
+    user = User.query.first()
+    cv = CV.query.filter_by(user_id=user.id).first()
+    section = cv.sections.first()
+    first_page = page_query(user.id).limit(12)
+
+    return {
+        # cv.dashboard: first and later (keyset) pages
+        "dashboard": first_page,
+        "dashboard next page": page_query(user.id, encode_cursor(first_page.all()[-1])).limit(12),
+        # export
+        "export": CV.query.filter_by(user_id=user.id, is_deleted=False).order_by(CV.updated_at.desc()),
+        # build_cv_view fallback, batch writes
+        "template sections": cv.sections,
+        # section API: CV and section lookups
+        "section api cv": CV.query.filter(CV.id == cv.id),
+        "section api section": CVSection.query.filter(CVSection.id == section.id),
+    }
+
+
+def explain(db, query):
+    """Get the query plan as text lines."""
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        return [row[-1] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}"))]
+    return [row[0] for row in db.session.execute(db.text(f"EXPLAIN {sql}"))]
+
+
+@pytest.mark.slow
+def test_hot_queries_use_indexes(db):
+    markers = BAD_PLAN_MARKERS.get(db.engine.dialect.name)
+    if markers is None:
+        pytest.skip(f"No plan markers for {db.engine.dialect.name}")
+
+    seed(db, SEED_CVS, SEED_CVS_PER_USER)
+    db.session.execute(db.text("ANALYZE"))
+
+    failures = {}
+    for name, query in hot_queries().items():
+        plan = explain(db, query)
+        if any(marker in line for line in plan for marker in markers):
+            failures[name] = plan
+
+    assert not failures, f"Queries without a usable index: {failures}"
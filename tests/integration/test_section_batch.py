@@ -0,0 +1,135 @@
+"""
+Tests for the batched section API (POST /cv/api/<cv_id>/sections/batch).
+"""
+import pytest
+
+from app.cv.snapshot import check_snapshots, current_snapshot
+from app.models import CV, CVSection
+
+
+@pytest.fixture
+def sections(db, cv):
+    """A personal and a summary section on the test CV."""
+    rows = [
+        CVSection(cv_id=cv.id, section_type="personal", content={"name": "Ada"}, display_order=0),
+        CVSection(cv_id=cv.id, section_type="summary", content={"text": "Hello"}, display_order=1),
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def post_batch(client, cv, operations):
+    return client.post(f"/cv/api/{cv.id}/sections/batch", json={"operations": operations})
+
+
+def section_state(db, cv_id):
+    """(id, section_type, content, display_order) of every section row, by position."""
+    db.session.expire_all()
+    return [
+        (s.id, s.section_type, s.content, s.display_order)
+        for s in CVSection.query.filter_by(cv_id=cv_id).order_by(CVSection.display_order)
+    ]
+
+
+class TestBatchApply:
+    def test_applies_every_operation(self, authenticated_client, db, cv, sections):
+        personal, summary = sections
+        cv_id = cv.id
+
+        response = post_batch(authenticated_client, cv, [
+            {"op": "update", "id": personal.id, "content": {"name": "Grace"}},
+            {"op": "create", "section_type": "skills", "content": {"items": ["SQL"]}, "display_order": 2},
+            {"op": "upsert", "section_type": "summary", "content": {"text": "Updated"}},
+            {"op": "delete", "id": summary.id},
+        ])
+
+        assert response.status_code == 200
+        results = response.get_json()["results"]
+        assert [r["op"] for r in results] == ["update", "create", "upsert", "delete"]
+        state = section_state(db, cv_id)
+        assert [(s[1], s[2]) for s in state] == [("personal", {"name": "Grace"}), ("skills", {"items": ["SQL"]})]
+        assert state[1][0] == results[1]["id"]
+
+        snapshot = current_snapshot(db.session.get(CV, cv_id))
+        assert [s["content"] for s in snapshot["sections"]] == [{"name": "Grace"}, {"items": ["SQL"]}]
+        assert check_snapshots()["drifted"] == 0
+
+    def test_reorder(self, authenticated_client, db, cv, sections):
+        personal, summary = sections
+        cv_id = cv.id
+
+        response = post_batch(authenticated_client, cv, [{"op": "reorder", "order": [summary.id, personal.id]}])
+
+        assert response.status_code == 200
+        assert [s[0] for s in section_state(db, cv_id)] == [summary.id, personal.id]
+        snapshot = current_snapshot(db.session.get(CV, cv_id))
+        assert [s["id"] for s in snapshot["sections"]] == [summary.id, personal.id]
+        assert check_snapshots()["drifted"] == 0
+
+
+class TestBatchValidation:
+    @pytest.mark.parametrize("operations, index", [
+        (None, 0),
+        ([], 0),
+        ([{"op": "rename"}], 0),
+        ([{"op": "create"}], 0),
+        ([{"op": "update", "id": "missing"}], 0),
+        ([{"op": "create", "section_type": "skills", "content": {}}, {"op": "delete", "id": "missing"}], 1),
+        ([{"op": "reorder", "order": ["missing"]}], 0),
+    ])
+    def test_rejects_invalid_operations(self, authenticated_client, cv, sections, operations, index):
+        response = post_batch(authenticated_client, cv, operations)
+
+        assert response.status_code == 400
+        assert response.get_json()["index"] == index
+
+    def test_rejects_oversized_batch(self, app, authenticated_client, cv, sections):
+        limit = app.config["SECTION_BATCH_MAX_OPERATIONS"]
+        operations = [{"op": "update", "id": sections[0].id, "label": "x"}] * (limit + 1)
+
+        response = post_batch(authenticated_client, cv, operations)
+
+        assert response.status_code == 400
+
+    def test_invalid_operation_rolls_back_the_whole_batch(self, authenticated_client, db, cv, sections):
+        personal, summary = sections
+        cv_id = cv.id
+        before = section_state(db, cv_id)
+        snapshot_hash = cv.snapshot_hash
+
+        response = post_batch(authenticated_client, cv, [
+            {"op": "update", "id": personal.id, "content": {"name": "Grace"}},
+            {"op": "create", "section_type": "skills", "content": {}},
+            {"op": "delete", "id": summary.id},
+            {"op": "update", "id": "not-in-this-cv", "content": {}},
+        ])
+
+        assert response.status_code == 400
+        assert response.get_json()["index"] == 3
+        assert section_state(db, cv_id) == before
+        assert db.session.get(CV, cv_id).snapshot_hash == snapshot_hash
+        assert check_snapshots()["drifted"] == 0
+
+    def test_cannot_touch_sections_of_another_cv(self, authenticated_client, db, user, cv, sections):
+        other = CV(user_id=user.id, title="Other", template_slug="ats_clean")
+        db.session.add(other)
+        db.session.commit()
+
+        response = post_batch(authenticated_client, other, [{"op": "delete", "id": sections[0].id}])
+
+        assert response.status_code == 400
+        assert db.session.get(CVSection, sections[0].id) is not None
+
+    def test_requires_ownership(self, client, db, cv, sections):
+        from app.models import User
+
+        stranger = User(email="stranger@example.com", display_name="Stranger")
+        db.session.add(stranger)
+        db.session.commit()
+        with client.session_transaction() as session:
+            session["_user_id"] = stranger.id
+
+        response = post_batch(client, cv, [{"op": "delete", "id": sections[0].id}])
+
+        assert response.status_code == 403
@@ -0,0 +1,121 @@
+"""
+Tests for reordering sections (PUT /cv/api/<cv_id>/sections/order).
+"""
+import pytest
+
+from app.cv.snapshot import check_snapshots, current_snapshot
+from app.models import CV, CVSection, User
+
+
+@pytest.fixture
+def sections(db, cv):
+    """Personal, summary and skills sections on the test CV, in that order."""
+    rows = [
+        CVSection(cv_id=cv.id, section_type=section_type, content={}, display_order=position)
+        for position, section_type in enumerate(("personal", "summary", "skills"))
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [row.id for row in rows]
+
+
+def put_order(client, cv_id, order):
+    return client.put(f"/cv/api/{cv_id}/sections/order", json={"order": order})
+
+
+def stored_order(db, cv_id):
+    db.session.expire_all()
+    return [s.id for s in CVSection.query.filter_by(cv_id=cv_id).order_by(CVSection.display_order)]
+
+
+class TestReorder:
+    def test_moves_sections(self, authenticated_client, db, cv, sections):
+        personal, summary, skills = sections
+        cv_id = cv.id
+
+        response = put_order(authenticated_client, cv_id, [personal, skills, summary])
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["success"] is True
+        assert sorted(body["moved"]) == sorted([summary, skills])
+        assert stored_order(db, cv_id) == [personal, skills, summary]
+
+    def test_snapshot_follows_the_new_order(self, authenticated_client, db, cv, sections):
+        cv_id = cv.id
+
+        put_order(authenticated_client, cv_id, list(reversed(sections)))
+
+        snapshot = current_snapshot(db.session.get(CV, cv_id))
+        assert [section["id"] for section in snapshot["sections"]] == list(reversed(sections))
+        assert check_snapshots()["drifted"] == 0
+
+    def test_same_order_moves_nothing(self, authenticated_client, cv, sections):
+        response = put_order(authenticated_client, cv.id, sections)
+
+        assert response.get_json() == {"success": True, "moved": []}
+
+    @pytest.mark.parametrize("order", [
+        "not a list",
+        None,
+        [1, 2, 3],
+        [{"id": "x"}],
+    ])
+    def test_rejects_malformed_order(self, authenticated_client, db, cv, sections, order):
+        cv_id = cv.id
+
+        response = put_order(authenticated_client, cv_id, order)
+
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "order must be a list of distinct section ids"
+        assert stored_order(db, cv_id) == sections
+
+    def test_rejects_duplicate_ids(self, authenticated_client, db, cv, sections):
+        cv_id = cv.id
+        personal, summary, _ = sections
+
+        response = put_order(authenticated_client, cv_id, [personal, summary, summary])
+
+        assert response.status_code == 400
+        assert stored_order(db, cv_id) == sections
+
+    @pytest.mark.parametrize("change", ["missing", "extra", "foreign"])
+    def test_rejects_a_non_permutation(self, authenticated_client, db, cv, user, sections, change):
+        cv_id = cv.id
+        order = list(reversed(sections))
+        if change == "missing":
+            order.pop()
+        elif change == "extra":
+            order.append("00000000-0000-0000-0000-000000000000")
+        else:
+            other = CV(user_id=user.id, title="Other", template_slug="ats_clean")
+            db.session.add(other)
+            db.session.flush()
+            foreign = CVSection(cv_id=other.id, section_type="summary", content={}, display_order=0)
+            db.session.add(foreign)
+            db.session.commit()
+            order[-1] = foreign.id
+
+        response = put_order(authenticated_client, cv_id, order)
+
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "order must list every section of this CV exactly once"
+        assert stored_order(db, cv_id) == sections
+
+    def test_other_users_cv(self, client, db, cv, sections):
+        stranger = User(email="stranger@example.com", display_name="Stranger")
+        db.session.add(stranger)
+        db.session.commit()
+        with client.session_transaction() as session:
+            session["_user_id"] = stranger.id
+
+        assert put_order(client, cv.id, sections).status_code == 403
+
+    def test_deleted_cv(self, authenticated_client, db, cv, sections):
+        cv.is_deleted = True
+        db.session.commit()
+
+        assert put_order(authenticated_client, cv.id, list(reversed(sections))).status_code == 403
+
+    def test_requires_login(self, client, cv, sections):
+        assert put_order(client, cv.id, sections).status_code == 302
@@ -0,0 +1,107 @@
+"""
+Tests for the compiled theme stylesheet (GET /cv/theme/<template_slug>.css).
+"""
+import pytest
+
+from app.cv.preview import theme_stylesheet_url
+from app.cv.theme import ThemeCompiler, theme_compiler
+
+
+@pytest.fixture
+def modern(db, cv):
+    cv.template_slug = "ats_modern"
+    cv.primary_color = "#AA3300"
+    cv.font_pair = "serif"
+    db.session.commit()
+    return cv
+
+
+class TestThemeStylesheet:
+    def test_versioned_url_is_immutable(self, app, client, modern):
+        with app.test_request_context():
+            url = theme_stylesheet_url(modern)
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/css"
+        assert response.cache_control.public
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == app.config["THEME_CSS_MAX_AGE"]
+        css = response.get_data(as_text=True)
+        assert "#aa3300" in css
+        assert "#4299e1" not in css
+        assert "Georgia" in css
+
+    def test_unversioned_url_revalidates(self, client):
+        response = client.get("/cv/theme/ats_clean.css")
+
+        assert response.status_code == 200
+        assert response.cache_control.no_cache
+        assert not response.cache_control.immutable
+        assert response.headers["ETag"]
+
+    def test_stale_version_is_not_immutable(self, client):
+        response = client.get("/cv/theme/ats_clean.css?v=0000000000000000")
+
+        assert response.cache_control.no_cache
+        assert not response.cache_control.immutable
+
+    def test_304_on_matching_etag(self, client):
+        etag = client.get("/cv/theme/ats_clean.css").headers["ETag"]
+
+        response = client.get("/cv/theme/ats_clean.css", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.data == b""
+
+    @pytest.mark.parametrize("slug", ["retired", "pro_elegant"])
+    def test_unknown_template(self, client, slug):
+        assert client.get(f"/cv/theme/{slug}.css").status_code == 404
+
+    def test_theme_change_links_a_new_url(self, app, db, modern):
+        with app.test_request_context():
+            before = theme_stylesheet_url(modern)
+            modern.primary_color = "#003366"
+            db.session.commit()
+
+            assert theme_stylesheet_url(modern) != before
+
+    def test_preview_links_the_versioned_stylesheet(self, app, client, modern):
+        with app.test_request_context():
+            url = theme_stylesheet_url(modern)
+
+        html = client.get(f"/cv/{modern.id}/preview").get_data(as_text=True)
+
+        assert f'href="{url.replace("&", "&amp;")}"' in html
+
+
+class TestThemeCompiler:
+    def test_reuses_compiled_css(self):
+        compiler = ThemeCompiler()
+
+        first = compiler.get("ats_modern", "#aa3300", "serif")
+
+        assert compiler.get("ats_modern", "#AA3300", "serif") == first
+        assert compiler.stats()["hits"] == 1
+
+    def test_invalid_theme_values_fall_back(self):
+        compiler = ThemeCompiler()
+
+        assert compiler.get("ats_modern", "red", "comic") == compiler.get("ats_modern")
+
+    def test_evicts_least_recently_used(self):
+        compiler = ThemeCompiler(max_entries=2)
+        compiler.get("ats_modern", "#000001")
+        compiler.get("ats_modern", "#000002")
+        compiler.get("ats_modern", "#000001")
+        compiler.get("ats_modern", "#000003")
+
+        stats = compiler.stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        compiler.get("ats_modern", "#000001")
+        assert compiler.stats()["hits"] == 2
+
+    def test_templates_without_accent_share_one_entry(self):
+        assert theme_compiler.get("ats_clean", "#111111") == theme_compiler.get("ats_clean", "#222222")
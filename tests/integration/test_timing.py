@@ -0,0 +1,90 @@
+"""
+Tests for Server-Timing headers and request profiling.
+"""
+import json
+import os
+
+import pytest
+
+from app.cv.render_cache import pdf_cache, compute_cache_key
+
+
+def metrics(response):
+    """Parse a Server-Timing header into {name: params string}."""
+    parsed = {}
+    for metric in response.headers["Server-Timing"].split(", "):
+        name, _, params = metric.partition(";")
+        parsed[name] = params
+    return parsed
+
+
+@pytest.fixture
+def profiles(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "PROFILER_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestServerTiming:
+    def test_preview_reports_phases_and_sql(self, client, db, cv):
+        url = f"/cv/{cv.id}/preview"
+        db.session.expire_all()
+
+        response = client.get(url)
+
+        timing = metrics(response)
+        assert "cache" in timing
+        assert timing["total"].startswith("dur=")
+        sql_queries = int(timing["sql"].split('desc="')[1].split(" ")[0])
+        assert sql_queries >= 1
+
+    def test_section_api_times_publishing(self, authenticated_client, cv):
+        response = authenticated_client.post(
+            f"/cv/api/{cv.id}/sections", json={"section_type": "summary", "content": {"text": "Hi"}}
+        )
+
+        assert response.status_code == 200
+        assert "publish" in metrics(response)
+
+    def test_download_reports_the_cache_lookup(self, authenticated_client, cv):
+        pdf_cache.set(compute_cache_key(cv, cv.template_slug), b"%PDF")
+
+        response = authenticated_client.get(f"/cv/{cv.id}/download")
+
+        assert response.status_code == 200
+        timing = metrics(response)
+        assert "cache_key" in timing
+        assert "cache" in timing
+        assert "layout" not in timing
+
+    def test_untimed_views_have_no_header(self, client):
+        assert "Server-Timing" not in client.get("/cv/theme/ats_clean.css").headers
+
+    def test_disabled(self, app, client, cv, monkeypatch):
+        monkeypatch.setitem(app.config, "SERVER_TIMING_ENABLED", False)
+
+        assert "Server-Timing" not in client.get(f"/cv/{cv.id}/preview").headers
+
+    def test_logs_one_json_line(self, app, client, cv, caplog):
+        with caplog.at_level("INFO", logger=app.logger.name):
+            client.get(f"/cv/{cv.id}/preview")
+
+        records = [json.loads(r.getMessage()) for r in caplog.records if '"request_timing"' in r.getMessage()]
+        assert len(records) == 1
+        assert records[0]["endpoint"] == "cv.preview_cv"
+        assert records[0]["status"] == 200
+
+
+class TestProfiling:
+    def test_admin_can_profile_a_request(self, app, authenticated_client, cv, profiles, monkeypatch):
+        monkeypatch.setitem(app.config, "ADMIN_EMAILS", {"test@example.com"})
+
+        response = authenticated_client.get(f"/cv/{cv.id}/preview", headers={"X-Profile": "1"})
+
+        assert "profile" in metrics(response)
+        assert [name for name in os.listdir(profiles) if name.endswith(".prof")]
+
+    def test_profile_header_needs_an_admin(self, authenticated_client, cv, profiles):
+        response = authenticated_client.get(f"/cv/{cv.id}/preview", headers={"X-Profile": "1"})
+
+        assert "profile" not in metrics(response)
+        assert not os.listdir(profiles)
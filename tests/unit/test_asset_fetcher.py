@@ -0,0 +1,62 @@
+"""
+Tests for the in-memory PDF asset map.
+"""
+import pytest
+
+from app.cv.asset_fetcher import AssetMap
+
+
+@pytest.fixture
+def assets(tmp_path):
+    static = tmp_path / "static"
+    (static / "css").mkdir(parents=True)
+    (static / "css" / "cv.css").write_bytes(b"body { color: red }")
+    (static / "fonts").mkdir()
+    (static / "fonts" / "inter.woff2").write_bytes(b"wOF2")
+    (static / "notes.txt").write_bytes(b"not an asset")
+    asset_map = AssetMap(roots={"/static/": str(static)})
+    asset_map.load()
+    return asset_map
+
+
+class TestLookup:
+    def test_resolves_by_path_and_ignores_the_host(self, assets):
+        assert assets.lookup("https://any-host.example/static/css/cv.css") == (b"body { color: red }", "text/css")
+        assert assets.lookup("http://localhost/static/fonts/inter.woff2") == (b"wOF2", "font/woff2")
+
+    def test_decodes_the_path(self, assets):
+        assert assets.lookup("https://assets.invalid/static/css/%63v.css")[0] == b"body { color: red }"
+
+    @pytest.mark.parametrize("url", [
+        "file:///etc/passwd",
+        "ftp://example.com/static/css/cv.css",
+        "/static/css/cv.css",
+        "gopher://example.com/",
+    ])
+    def test_refuses_other_schemes(self, assets, url):
+        with pytest.raises(ValueError, match="Refusing to fetch"):
+            assets.lookup(url)
+
+    def test_unknown_asset(self, assets):
+        with pytest.raises(ValueError, match="Unknown asset"):
+            assets.lookup("https://assets.invalid/static/css/missing.css")
+
+    def test_only_asset_extensions_are_loaded(self, assets):
+        with pytest.raises(ValueError, match="Unknown asset"):
+            assets.lookup("https://assets.invalid/static/notes.txt")
+
+    def test_fetch_returns_weasyprint_dict(self, assets):
+        url = "https://assets.invalid/static/css/cv.css"
+
+        assert assets.fetch(url) == {"string": b"body { color: red }", "mime_type": "text/css", "redirected_url": url}
+
+    def test_fetch_refuses_file_urls(self, assets):
+        with pytest.raises(ValueError):
+            assets.fetch("file:///etc/passwd")
+
+
+def test_real_templates_resolve():
+    asset_map = AssetMap()
+
+    assert asset_map.load() > 0
+    assert asset_map.lookup("https://assets.cv-builder.invalid/static/css/design-system.css")[1] == "text/css"
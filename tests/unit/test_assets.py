@@ -0,0 +1,93 @@
+"""
+Tests for the static asset pipeline.
+"""
+import gzip
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from app.utils.assets import build_assets, minify_css, minify_js
+
+
+class TestMinifyCSS:
+    def test_strips_comments_and_whitespace(self):
+        css = "/* header */\n.a > .b ,\n.c {\n    color :  red ;\n    margin: 0 auto;\n}\n"
+
+        assert minify_css(css) == ".a>.b,.c{color :red;margin:0 auto}"
+
+    def test_strings_are_kept(self):
+        css = '.a::after { content: "x:  y ; } /* z */"; }'
+
+        assert minify_css(css) == '.a::after{content:"x:  y ; } /* z */"}'
+
+    def test_url_values_are_kept(self):
+        css = ".a { background: url(data:image/svg+xml;utf8,<svg>  a: b</svg>) no-repeat; }"
+
+        assert minify_css(css) == ".a{background:url(data:image/svg+xml;utf8,<svg>  a: b</svg>) no-repeat}"
+
+    def test_quote_in_a_comment(self):
+        assert minify_css("/* it's */ .a { color: red; }") == ".a{color:red}"
+
+
+class TestMinifyJS:
+    def test_strips_comments_and_indentation(self):
+        js = "// header\nfunction f(a) {\n    /* block */\n    return a / 2; // half\n\n}\n"
+
+        assert minify_js(js) == "function f(a) {\nreturn a / 2;\n}\n"
+
+    def test_template_literals_are_kept(self):
+        js = "const html = `\n    // not a comment\n    ${ {a: 1}.a } ${`${'}'}`}\n`;\n"
+
+        assert minify_js(js) == js
+
+    def test_strings_are_kept(self):
+        js = "const url = 'http://example.com'; // link\nconst s = \"a /* b */ c\";\n"
+
+        assert minify_js(js) == "const url = 'http://example.com';\nconst s = \"a /* b */ c\";\n"
+
+    def test_regex_literals_are_kept(self):
+        js = "const re = /\\/\\/['`]*/g;\nconst n = total / count / 2;\n"
+
+        assert minify_js(js) == js
+
+    def test_block_comment_keeps_the_line_break(self):
+        assert minify_js("a = 1 /* x\n */ b = 2\n") == "a = 1\nb = 2\n"
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+    def test_built_script_parses(self, tmp_path):
+        static = os.path.join(os.path.dirname(__file__), "..", "..", "app", "static", "js", "cv_builder.js")
+        with open(static, encoding="utf-8") as f:
+            script = tmp_path / "cv_builder.js"
+            script.write_text(minify_js(f.read()))
+
+        subprocess.run(["node", "--check", str(script)], check=True)
+
+
+class TestBuildAssets:
+    def test_writes_hashed_and_compressed_files(self, tmp_path):
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "site.css").write_text(".a { color: red; }")
+        (tmp_path / "img").mkdir()
+        (tmp_path / "img" / "logo.svg").write_text("<svg/>")
+
+        manifest = build_assets(str(tmp_path))
+
+        built = manifest["css/site.css"]
+        assert list(manifest) == ["css/site.css"]
+        assert (tmp_path / "dist" / built).read_text() == ".a{color:red}"
+        assert gzip.decompress((tmp_path / "dist" / f"{built}.gz").read_bytes()) == b".a{color:red}"
+        assert json.loads((tmp_path / "dist" / "manifest.json").read_text()) == manifest
+
+    def test_rebuild_removes_old_builds(self, tmp_path):
+        (tmp_path / "js").mkdir()
+        (tmp_path / "js" / "app.js").write_text("a = 1\n")
+        old = build_assets(str(tmp_path))["js/app.js"]
+        (tmp_path / "js" / "app.js").write_text("a = 2\n")
+
+        new = build_assets(str(tmp_path))["js/app.js"]
+
+        assert new != old
+        assert not (tmp_path / "dist" / old).exists()
@@ -0,0 +1,112 @@
+"""
+Tests for the per-user active CV counter (User.active_cv_count).
+"""
+from app.models import User, CV
+
+
+def add_cv(db, user, title="CV"):
+    """Add a CV row; callers reserve its slot (or not) themselves."""
+    cv = CV(user_id=user.id, title=title, template_slug="ats_clean")
+    db.session.add(cv)
+    return cv
+
+
+class TestReserveCVSlot:
+    def test_reserves_below_the_limit(self, db, user):
+        assert user.reserve_cv_slot(2)
+        add_cv(db, user)
+        db.session.commit()
+
+        assert user.active_cv_count == 1
+
+    def test_refuses_at_the_limit(self, db, user):
+        for i in range(2):
+            assert user.reserve_cv_slot(2)
+            add_cv(db, user, f"CV {i}")
+            db.session.commit()
+
+        assert not user.reserve_cv_slot(2)
+        db.session.rollback()
+        assert user.active_cv_count == 2
+
+    def test_rollback_releases_the_slot(self, db, user):
+        assert user.reserve_cv_slot(1)
+        add_cv(db, user)
+        db.session.rollback()
+
+        assert user.active_cv_count == 0
+        assert user.reserve_cv_slot(1)
+
+
+class TestReleaseCVSlot:
+    def test_soft_delete_releases_the_slot(self, db, user):
+        user.reserve_cv_slot(1)
+        cv = add_cv(db, user)
+        db.session.commit()
+
+        cv.soft_delete()
+
+        assert user.active_cv_count == 0
+        assert user.reserve_cv_slot(1)
+
+    def test_soft_delete_twice_releases_once(self, db, user):
+        for i in range(2):
+            user.reserve_cv_slot(5)
+            add_cv(db, user, f"CV {i}")
+        db.session.commit()
+        cv = user.cvs.first()
+
+        cv.soft_delete()
+        cv.soft_delete()
+
+        assert user.active_cv_count == 1
+
+    def test_never_goes_negative(self, db, user):
+        user.release_cv_slot()
+        db.session.commit()
+
+        assert user.active_cv_count == 0
+
+
+class TestRepairCVCounts:
+    def test_recounts_live_cvs(self, db, user):
+        # Rows written without reserving a slot
+        for i in range(3):
+            add_cv(db, user, f"CV {i}")
+        deleted = add_cv(db, user, "Deleted")
+        deleted.is_deleted = True
+        db.session.commit()
+
+        assert User.repair_cv_counts() == 1
+        assert db.session.get(User, user.id).active_cv_count == 3
+
+    def test_leaves_correct_counts_alone(self, db, user):
+        user.reserve_cv_slot(5)
+        add_cv(db, user)
+        db.session.commit()
+
+        assert User.repair_cv_counts() == 0
+        assert user.active_cv_count == 1
+
+
+class TestConcurrentSoftDelete:
+    def test_deleting_twice_releases_the_slot_once(self, app, db, user):
+        for i in range(2):
+            user.reserve_cv_slot(5)
+            add_cv(db, user, f"CV {i}")
+        db.session.commit()
+        cv_id, user_id = user.cvs.first().id, user.id
+
+        # Two requests load the same live CV, each in its own session
+        with app.app_context():
+            first = db.session.get(CV, cv_id)
+            assert first.is_deleted is False
+            with app.app_context():
+                second = db.session.get(CV, cv_id)
+                assert second.is_deleted is False
+                second.soft_delete()
+            first.soft_delete()
+            assert first.is_deleted is True
+
+        db.session.expire_all()
+        assert db.session.get(User, user_id).active_cv_count == 1
@@ -0,0 +1,156 @@
+"""
+Tests for the bulk CV export.
+"""
+import io
+import os
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+
+from app.cv import export
+from app.cv.export import prepare_export, iter_export_zip
+from app.cv.render_cache import pdf_cache, compute_cache_key
+from app.cv.render_engine import render_engine
+from app.cv.render_jobs import QueueFullError
+from app.models import CV
+
+
+def read_zip(entries, **kwargs):
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_export_zip(entries, **kwargs))))
+    return {name: archive.read(name) for name in archive.namelist()}
+
+
+def add_cvs(db, user, count):
+    cvs = [CV(user_id=user.id, title=f"CV {i}", template_slug="ats_clean") for i in range(count)]
+    db.session.add_all(cvs)
+    db.session.commit()
+    return cvs
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Pretend WeasyPrint is available in this process."""
+    monkeypatch.setattr(render_engine, "_loaded", True)
+    monkeypatch.setattr(render_engine, "_module", object())
+
+
+@pytest.fixture
+def no_engine(monkeypatch):
+    monkeypatch.setattr(render_engine, "_loaded", True)
+    monkeypatch.setattr(render_engine, "_module", None)
+
+
+class FakeQueue:
+    """Records submissions; raises QueueFullError after `room` of them."""
+
+    def __init__(self, room=100):
+        self.room = room
+        self.futures = []
+
+    def submit(self, cache_key, build_args):
+        if len(self.futures) >= self.room:
+            raise QueueFullError("full")
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+class TestPrepareExport:
+    def test_cached_pdfs_are_not_rendered(self, db, user, cv, no_engine, monkeypatch):
+        queue = FakeQueue()
+        monkeypatch.setattr(export, "render_queue", queue)
+        pdf_cache.set(compute_cache_key(cv, cv.template_slug), b"%PDF")
+
+        entries = prepare_export([cv])
+
+        assert entries[0]["future"] is None
+        assert "error" not in entries[0]
+        assert queue.futures == []
+
+    def test_uncached_pdfs_are_queued(self, db, user, engine, monkeypatch):
+        queue = FakeQueue()
+        monkeypatch.setattr(export, "render_queue", queue)
+
+        entries = prepare_export(add_cvs(db, user, 3))
+
+        assert [entry["future"] for entry in entries] == queue.futures
+        assert len(queue.futures) == 3
+
+    def test_without_engine_nothing_is_queued(self, db, user, no_engine, monkeypatch):
+        queue = FakeQueue()
+        monkeypatch.setattr(export, "render_queue", queue)
+
+        entries = prepare_export(add_cvs(db, user, 2))
+
+        assert queue.futures == []
+        assert all("PDF generation is not available" in entry["error"] for entry in entries)
+
+    def test_queue_full_cancels_queued_renders(self, db, user, engine, monkeypatch):
+        queue = FakeQueue(room=2)
+        monkeypatch.setattr(export, "render_queue", queue)
+
+        with pytest.raises(QueueFullError):
+            prepare_export(add_cvs(db, user, 3))
+
+        assert len(queue.futures) == 2
+        assert all(future.cancelled() for future in queue.futures)
+
+    def test_unknown_template(self, db, user, no_engine):
+        cv = CV(user_id=user.id, title="Old", template_slug="retired")
+        db.session.add(cv)
+        db.session.commit()
+
+        entries = prepare_export([cv])
+
+        assert entries[0]["error"] == "unknown template 'retired'"
+
+
+class TestExportZip:
+    def entry(self, name, cache_key=None, future=None, error=None):
+        entry = {"name": name, "cache_key": cache_key, "source": b'{"title": "x"}', "future": future}
+        if error:
+            entry["error"] = error
+        return entry
+
+    def test_pdfs_next_to_sources(self, app):
+        pdf = b"%PDF" + bytes(range(256)) * 1000
+        pdf_cache.set("zip-key", pdf)
+
+        files = read_zip([self.entry("CV_1", "zip-key")])
+
+        assert files == {"CV_1.json": b'{"title": "x"}', "CV_1.pdf": pdf}
+
+    def test_waits_for_pending_renders(self, app):
+        future = Future()
+        future.set_result(True)
+        pdf_cache.set("rendered-key", b"%PDF")
+
+        assert read_zip([self.entry("CV_1", "rendered-key", future)])["CV_1.pdf"] == b"%PDF"
+
+    def test_failed_render_gets_an_error_file(self, app):
+        future = Future()
+        future.set_exception(RuntimeError("layout failed"))
+
+        files = read_zip([self.entry("CV_1", "failed-key", future)])
+
+        assert "CV_1.pdf" not in files
+        assert files["CV_1.error.txt"] == b"PDF could not be rendered: layout failed\n"
+
+    def test_entry_error_and_evicted_pdf(self, app):
+        files = read_zip([
+            self.entry("Old", error="unknown template 'retired'"),
+            self.entry("Gone", "evicted-key"),
+        ])
+
+        assert files["Old.error.txt"] == b"PDF could not be rendered: unknown template 'retired'\n"
+        assert files["Gone.error.txt"] == b"PDF could not be rendered: evicted from cache\n"
+        assert set(files) == {"Old.json", "Old.error.txt", "Gone.json", "Gone.error.txt"}
+
+    def test_streams_in_chunks(self, app):
+        pdf_cache.set("big-key", os.urandom(export.CHUNK_SIZE * 4))
+
+        chunks = list(iter_export_zip([self.entry("Big", "big-key")]))
+
+        assert len(chunks) > 4
+        assert max(len(chunk) for chunk in chunks) < export.CHUNK_SIZE * 2
@@ -0,0 +1,32 @@
+"""
+Tests for the PDF download filename.
+"""
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.cv.routes import _pdf_filename
+from app.models import CVSection
+
+
+def test_uses_the_personal_name_from_the_snapshot(db, cv):
+    db.session.add(CVSection(cv=cv, section_type="personal", content={"name": "Ada Lovelace"}))
+    db.session.commit()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        filename = _pdf_filename(cv)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert filename == f"Ada_Lovelace_CV_{datetime.now().strftime('%Y-%m')}.pdf"
+    assert not any("cv_sections" in statement for statement in statements)
+
+
+def test_falls_back_to_the_title(db, cv):
+    db.session.add(CVSection(cv=cv, section_type="personal", content={"name": ""}))
+    db.session.commit()
+
+    assert _pdf_filename(cv).startswith("Test_CV_CV_")
@@ -0,0 +1,113 @@
+"""
+Tests for the content-addressed render cache and PDF cache lookups.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.cv import pdf_generator, render_cache
+from app.cv.render_cache import RenderCache, compute_cache_key
+from app.cv.render_engine import render_engine
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """A filesystem RenderCache with a 10-byte budget."""
+    cache = RenderCache("PDF_CACHE", suffix=".pdf", dir_name="pdf_cache")
+    cache.init_app(SimpleNamespace(
+        instance_path=str(tmp_path),
+        config={
+            "PDF_CACHE_BACKEND": "filesystem",
+            "PDF_CACHE_MAX_BYTES": 10,
+            "PDF_CACHE_TIMEOUT": None,
+            "PDF_CACHE_DIR": None,
+        },
+    ))
+    return cache
+
+
+class TestFilesystemCache:
+    def test_stores_under_the_instance_path(self, disk_cache, tmp_path):
+        disk_cache.set("a", b"1234")
+
+        assert disk_cache.directory == str(tmp_path / "pdf_cache")
+        assert disk_cache.get("a") == b"1234"
+        assert os.stat(disk_cache.directory).st_mode & 0o777 == 0o700
+
+    def test_evicts_least_recently_used_over_budget(self, disk_cache):
+        disk_cache.set("a", b"1234")
+        disk_cache.set("b", b"1234")
+        disk_cache.get_path("a")  # a is now the most recently used
+        disk_cache.set("c", b"1234")
+
+        assert disk_cache.get("b") is None
+        assert disk_cache.get("a") == b"1234"
+        assert disk_cache.get("c") == b"1234"
+        assert disk_cache.stats()["evictions"] == 1
+        assert disk_cache.stats()["size_bytes"] == 8
+
+    def test_keeps_the_newest_entry_even_over_budget(self, disk_cache):
+        disk_cache.set("big", b"x" * 50)
+
+        assert disk_cache.get("big") == b"x" * 50
+
+    def test_file_removed_by_another_worker_is_a_miss(self, disk_cache):
+        disk_cache.set("a", b"1234")
+        os.remove(disk_cache.get_path("a"))
+
+        assert disk_cache.get_path("a") is None
+        assert disk_cache.get("a") is None
+        assert disk_cache.stats()["entries"] == 0
+        assert disk_cache.stats()["size_bytes"] == 0
+
+    def test_file_stored_by_another_worker_is_a_hit(self, disk_cache):
+        with open(os.path.join(disk_cache.directory, "shared.pdf"), "wb") as f:
+            f.write(b"12")
+
+        assert disk_cache.get("shared") == b"12"
+        assert disk_cache.stats()["entries"] == 1
+
+    def test_index_is_rebuilt_from_disk(self, disk_cache):
+        disk_cache.set("a", b"1234")
+        disk_cache._load_index()
+
+        assert disk_cache.stats()["entries"] == 1
+        assert disk_cache.stats()["size_bytes"] == 4
+
+
+class TestCacheKey:
+    def test_changes_with_content(self, db, cv):
+        key = compute_cache_key(cv, cv.template_slug)
+        cv.title = "Renamed"
+
+        assert compute_cache_key(cv, cv.template_slug) != key
+
+    def test_changes_with_format_version(self, db, cv, monkeypatch):
+        key = compute_cache_key(cv, cv.template_slug)
+        monkeypatch.setattr(render_cache, "CACHE_FORMAT_VERSION", render_cache.CACHE_FORMAT_VERSION + 1)
+
+        assert compute_cache_key(cv, cv.template_slug) != key
+
+
+class TestGeneratePDF:
+    def test_miss_without_engine_fails_before_rendering_html(self, db, cv, monkeypatch):
+        monkeypatch.setattr(render_engine, "_loaded", True)
+        monkeypatch.setattr(render_engine, "_module", None)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("template rendered without a PDF engine")
+
+        monkeypatch.setattr(pdf_generator, "build_render_args", fail)
+
+        with pytest.raises(RuntimeError, match="PDF generation is not available"):
+            pdf_generator.generate_pdf(cv, cv.template_slug)
+
+    def test_hit_needs_no_engine(self, db, cv, monkeypatch):
+        monkeypatch.setattr(render_engine, "_loaded", True)
+        monkeypatch.setattr(render_engine, "_module", None)
+        render_cache.pdf_cache.set(compute_cache_key(cv, cv.template_slug), b"%PDF-cached")
+
+        pdf_file, _ = pdf_generator.generate_pdf(cv, cv.template_slug)
+
+        assert pdf_file.read() == b"%PDF-cached"
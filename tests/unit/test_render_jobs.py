@@ -0,0 +1,147 @@
+"""
+Tests for the background render job queue.
+A thread pool stands in for the process pool so render functions can be
+plain test doubles.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.cv.render_cache import pdf_cache
+from app.cv.render_jobs import (
+    RenderJobQueue, QueueFullError, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED
+)
+
+
+def fake_render(html_content, target=None):
+    return f"%PDF {html_content}".encode()
+
+
+def failing_render(html_content, target=None):
+    raise ValueError("layout failed")
+
+
+@pytest.fixture
+def queue(app, tmp_path):
+    queue = RenderJobQueue()
+    queue.app = app
+    queue.job_dir = str(tmp_path)
+    queue.max_pending = 2
+    queue._executor = ThreadPoolExecutor(max_workers=2)
+    yield queue
+    queue.shutdown()
+
+
+def wait_for_job(queue, job_id):
+    """Poll a job record until it leaves the queued state."""
+    for _ in range(100):
+        record = queue.get(job_id)
+        if record["status"] != STATUS_QUEUED:
+            return record
+        time.sleep(0.05)
+    return record
+
+
+def submit(queue, key, render_func=fake_render, html="cv"):
+    return queue.submit(key, lambda: {"html_content": html}, render_func=render_func)
+
+
+def render_jobs_with(queue, monkeypatch, render_func):
+    """Make enqueue() render with a test double instead of html_to_pdf()."""
+    real_submit = queue.submit
+    monkeypatch.setattr(
+        queue, "submit",
+        lambda key, build_args, job_id: real_submit(key, build_args, job_id=job_id, render_func=render_func),
+    )
+
+
+class TestSubmit:
+    def test_stores_the_result_in_the_cache(self, app, queue):
+        future = submit(queue, "submit-key", html="hello")
+
+        assert future.result(timeout=5) is True
+        assert pdf_cache.get("submit-key") == b"%PDF hello"
+        assert queue._pending == 0
+
+    def test_queue_full(self, app, queue):
+        release = threading.Event()
+
+        def blocked_render(html_content, target=None):
+            release.wait(5)
+            return b"%PDF"
+
+        futures = [submit(queue, f"full-{i}", blocked_render) for i in range(2)]
+        try:
+            with pytest.raises(QueueFullError):
+                submit(queue, "full-2")
+        finally:
+            release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        # Slots are freed once renders finish
+        assert submit(queue, "full-3").result(timeout=5) is True
+
+    def test_build_args_error_frees_the_slot(self, queue):
+        def broken():
+            raise KeyError("template")
+
+        with pytest.raises(KeyError):
+            queue.submit("broken", broken, render_func=fake_render)
+        assert queue._pending == 0
+
+    def test_render_error_is_set_on_the_future(self, app, queue):
+        future = submit(queue, "fail-key", failing_render)
+
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+        assert pdf_cache.get("fail-key") is None
+
+
+class TestEnqueue:
+    def test_job_finishes(self, app, queue, monkeypatch):
+        render_jobs_with(queue, monkeypatch, fake_render)
+
+        job = queue.enqueue("cv-1", "user-1", "job-key", lambda: {"html_content": "x"})
+        assert job["status"] == STATUS_QUEUED
+
+        record = wait_for_job(queue, job["id"])
+        assert record["status"] == STATUS_DONE
+        assert record["user_id"] == "user-1"
+
+    def test_failed_job_records_the_error(self, app, queue, monkeypatch):
+        render_jobs_with(queue, monkeypatch, failing_render)
+
+        job = queue.enqueue("cv-1", "user-1", "failed-key", lambda: {"html_content": "x"})
+
+        record = wait_for_job(queue, job["id"])
+        assert record["status"] == STATUS_FAILED
+        assert "layout failed" in record["error"]
+
+    def test_cached_pdf_is_done_immediately(self, app, queue):
+        pdf_cache.set("cached-key", b"%PDF")
+
+        def never(**kwargs):
+            raise AssertionError("cached PDF rendered again")
+
+        job = queue.enqueue("cv-1", "user-1", "cached-key", never)
+
+        assert job["status"] == STATUS_DONE
+        assert queue.get(job["id"])["status"] == STATUS_DONE
+
+    def test_full_queue_leaves_no_job_record(self, app, queue, monkeypatch):
+        def full(*args, **kwargs):
+            raise QueueFullError("full")
+
+        monkeypatch.setattr(queue, "submit", full)
+
+        with pytest.raises(QueueFullError):
+            queue.enqueue("cv-1", "user-1", "full-key", lambda: {})
+        assert not [name for name in os.listdir(queue.job_dir) if name.endswith(".json")]
+
+    def test_unknown_job_ids(self, queue):
+        assert queue.get("not-a-uuid") is None
+        assert queue.get("00000000-0000-0000-0000-000000000000") is None
@@ -0,0 +1,150 @@
+"""
+Tests for the CV snapshot kept up to date by the before_flush hook.
+"""
+import pytest
+
+from app.cv.section_batch import reorder_sections
+from app.cv.snapshot import build_snapshot, check_snapshots, current_snapshot
+from app.models import CV, CVSection
+
+
+def assert_no_drift():
+    # check_snapshots() expunges what it loads: read CV attributes before calling it
+    counts = check_snapshots()
+    assert counts["checked"] > 0
+    assert counts["drifted"] == 0
+
+
+def snapshot_ids(cv):
+    return [section["id"] for section in current_snapshot(cv)["sections"]]
+
+
+def add_section(db, cv, section_type, display_order, content=None, **fields):
+    section = CVSection(
+        cv_id=cv.id, section_type=section_type, display_order=display_order, content=content or {}, **fields
+    )
+    db.session.add(section)
+    db.session.commit()
+    return section
+
+
+class TestSnapshotHook:
+    def test_new_cv_gets_a_snapshot(self, db, cv):
+        assert current_snapshot(cv)["title"] == "Test CV"
+        assert current_snapshot(cv)["sections"] == []
+        assert cv.section_count == 0
+        assert_no_drift()
+
+    def test_add_section(self, db, cv):
+        section = add_section(db, cv, "summary", 0, content={"text": "Hello"})
+
+        assert snapshot_ids(cv) == [section.id]
+        assert current_snapshot(cv)["sections"][0]["content"] == {"text": "Hello"}
+        assert cv.section_count == 1
+        assert_no_drift()
+
+    def test_add_section_through_relationship(self, db, cv):
+        db.session.add(CVSection(cv=cv, section_type="personal", content={"name": "Ada"}))
+        db.session.commit()
+
+        assert current_snapshot(cv)["sections"][0]["content"] == {"name": "Ada"}
+        assert_no_drift()
+
+    def test_update_section(self, db, cv):
+        section = add_section(db, cv, "summary", 0, content={"text": "Hello"})
+        old_hash = cv.snapshot_hash
+
+        section.content = {"text": "Updated"}
+        section.is_visible = False
+        db.session.commit()
+
+        entry = current_snapshot(cv)["sections"][0]
+        assert entry["content"] == {"text": "Updated"}
+        assert entry["is_visible"] is False
+        assert cv.snapshot_hash != old_hash
+        assert_no_drift()
+
+    def test_delete_section(self, db, cv):
+        keep = add_section(db, cv, "summary", 0)
+        drop = add_section(db, cv, "skills", 1)
+
+        db.session.delete(drop)
+        db.session.commit()
+
+        assert snapshot_ids(cv) == [keep.id]
+        assert cv.section_count == 1
+        assert_no_drift()
+
+    def test_update_cv_metadata(self, db, cv):
+        cv.title = "Renamed"
+        cv.primary_color = "#000000"
+        db.session.commit()
+
+        assert current_snapshot(cv)["title"] == "Renamed"
+        assert current_snapshot(cv)["primary_color"] == "#000000"
+        assert_no_drift()
+
+    def test_change_display_order(self, db, cv):
+        first = add_section(db, cv, "summary", 0)
+        second = add_section(db, cv, "skills", 1)
+
+        first.display_order = 2
+        db.session.commit()
+
+        assert snapshot_ids(cv) == [second.id, first.id]
+        assert_no_drift()
+
+
+class TestReorderSections:
+    def test_reorder(self, db, cv):
+        sections = [add_section(db, cv, section_type, order)
+                    for order, section_type in enumerate(("personal", "summary", "skills"))]
+        order = [sections[2].id, sections[0].id, sections[1].id]
+
+        moved = reorder_sections(cv, order)
+        db.session.commit()
+
+        assert sorted(moved) == sorted(order)
+        assert snapshot_ids(cv) == order
+        assert_no_drift()
+
+    def test_reorder_only_writes_moved_sections(self, db, cv):
+        sections = [add_section(db, cv, section_type, order)
+                    for order, section_type in enumerate(("personal", "summary", "skills"))]
+
+        moved = reorder_sections(cv, [sections[0].id, sections[2].id, sections[1].id])
+        db.session.commit()
+
+        assert sorted(moved) == sorted([sections[1].id, sections[2].id])
+        assert_no_drift()
+
+    def test_reorder_rejects_partial_order(self, db, cv):
+        sections = [add_section(db, cv, section_type, order)
+                    for order, section_type in enumerate(("personal", "summary"))]
+
+        with pytest.raises(ValueError):
+            reorder_sections(cv, [sections[0].id])
+        db.session.rollback()
+        assert_no_drift()
+
+
+class TestCheckSnapshots:
+    def test_detects_and_repairs_drift(self, db, cv):
+        cv_id = cv.id
+        section = add_section(db, cv, "summary", 0, content={"text": "Hello"})
+        # A write that bypasses the ORM flush hook
+        db.session.execute(
+            db.update(CVSection).where(CVSection.id == section.id).values(content={"text": "Changed"})
+        )
+        db.session.commit()
+
+        assert check_snapshots(repair=True)["drifted"] == 1
+        assert_no_drift()
+        repaired = db.session.get(CV, cv_id)
+        assert current_snapshot(repaired)["sections"][0]["content"] == {"text": "Changed"}
+
+    def test_build_snapshot_is_order_independent(self, db, cv):
+        first = add_section(db, cv, "summary", 0)
+        second = add_section(db, cv, "skills", 1)
+
+        assert build_snapshot(cv, [first, second]) == build_snapshot(cv, [second, first])
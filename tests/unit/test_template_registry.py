@@ -0,0 +1,118 @@
+"""
+Tests for the CV template registry.
+"""
+import pytest
+
+from app.cv.render_cache import template_version
+from app.cv.template_registry import TemplateRegistry, UnknownTemplateError, load_templates
+
+
+DEFINITIONS = (
+    {"slug": "plain", "name": "Plain", "category": "ats", "description": "", "is_ats_friendly": True,
+     "sort_order": 2},
+    {"slug": "bare", "name": "Bare", "category": "ats", "description": "", "is_ats_friendly": True,
+     "sort_order": 1},
+    {"slug": "planned", "name": "Planned", "category": "professional", "description": "",
+     "is_ats_friendly": False, "sort_order": 3},
+)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    (tmp_path / "sections").mkdir()
+    (tmp_path / "plain.html").write_text("<p>plain</p>")
+    (tmp_path / "sections" / "plain.html").write_text("{% macro summary() %}{% endmacro %}")
+    (tmp_path / "bare.html").write_text("<p>bare</p>")
+    return tmp_path
+
+
+@pytest.fixture
+def registry(template_dir, monkeypatch):
+    from app.cv import template_registry as module
+
+    # load() reads the shipped definitions; use the test ones instead
+    monkeypatch.setattr(
+        module, "load_templates",
+        lambda template_dir: load_templates(template_dir, DEFINITIONS),
+    )
+    registry = TemplateRegistry()
+    registry.load(str(template_dir))
+    return registry
+
+
+class TestLoadTemplates:
+    def test_paths_and_sort_order(self, template_dir):
+        templates = load_templates(str(template_dir), DEFINITIONS)
+
+        assert list(templates) == ["bare", "plain", "planned"]
+        assert templates["plain"].sections_path == str(template_dir / "sections" / "plain.html")
+        assert templates["bare"].path == str(template_dir / "bare.html")
+        assert templates["bare"].sections_path is None
+        assert templates["planned"].path is None
+        assert templates["planned"].version is None
+
+    def test_read_only(self, template_dir):
+        templates = load_templates(str(template_dir), DEFINITIONS)
+
+        with pytest.raises(TypeError):
+            templates["new"] = templates["plain"]
+
+    def test_version_follows_the_sections_file(self, template_dir):
+        before = load_templates(str(template_dir), DEFINITIONS)["plain"].version
+        (template_dir / "sections" / "plain.html").write_text("{% macro summary() %}x{% endmacro %}")
+
+        assert load_templates(str(template_dir), DEFINITIONS)["plain"].version != before
+
+
+class TestRegistry:
+    def test_contains_only_available_templates(self, registry):
+        assert "plain" in registry
+        assert "planned" not in registry
+        assert "missing" not in registry
+
+    def test_require(self, registry):
+        assert registry.require("plain").slug == "plain"
+
+    def test_require_unknown_slug(self, registry):
+        with pytest.raises(UnknownTemplateError, match="Unknown template: 'missing'"):
+            registry.require("missing")
+
+    def test_require_template_without_html(self, registry):
+        assert registry.get("planned") is not None
+
+        with pytest.raises(UnknownTemplateError, match="not available yet"):
+            registry.require("planned")
+
+    def test_unknown_template_is_a_value_error(self, registry):
+        with pytest.raises(ValueError):
+            registry.require("missing")
+
+    def test_listing(self, registry):
+        assert [t.slug for t in registry.all()] == ["bare", "plain", "planned"]
+        assert [t.slug for t in registry.available()] == ["bare", "plain"]
+
+    def test_version_changes_on_edit(self, registry, template_dir):
+        before = registry.version
+        (template_dir / "bare.html").write_text("<p>changed</p>")
+        registry.load(str(template_dir))
+
+        assert registry.version != before
+
+
+class TestAppRegistry:
+    def test_shipped_templates(self, app):
+        from app.cv.template_registry import template_registry
+
+        assert {"ats_clean", "ats_modern", "ats_executive"} <= {t.slug for t in template_registry.available()}
+        assert "pro_elegant" not in template_registry
+        assert template_version("ats_clean") == template_registry.get("ats_clean").version
+
+    def test_cache_key_of_unknown_template(self, app):
+        with pytest.raises(UnknownTemplateError):
+            template_version("retired")
+
+    def test_routes_reject_unavailable_templates(self, authenticated_client, cv):
+        response = authenticated_client.put(f"/cv/api/{cv.id}/meta", json={"template_slug": "pro_elegant"})
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Unknown template"}
@@ -0,0 +1,48 @@
+"""
+Tests for dashboard thumbnail lookups.
+"""
+import pytest
+
+from app.cv import thumbnails as thumbnails_module
+from app.cv.thumbnails import ThumbnailService
+
+
+@pytest.fixture
+def service(app):
+    service = ThumbnailService()
+    service.init_app(app)
+    service.enabled = True
+    return service
+
+
+def test_unrenderable_thumbnails_skip_the_cv_load(service, db, cv, monkeypatch):
+    service._renderable = False
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CV view built for a thumbnail that cannot be rendered")
+
+    monkeypatch.setattr(thumbnails_module, "build_cv_view", fail)
+
+    assert service.lookup([cv]) == ({}, False)
+
+
+def test_renderable_is_checked_once(service, monkeypatch):
+    calls = []
+
+    def find_spec(name):
+        calls.append(name)
+        return None
+
+    monkeypatch.setattr(thumbnails_module.importlib.util, "find_spec", find_spec)
+
+    assert service.renderable is False
+    assert service.renderable is False
+    assert calls == ["pypdfium2"]
+
+
+def test_cached_thumbnails_are_ready_without_a_renderer(service, db, cv):
+    service._renderable = False
+    key = service.key_for(cv)
+    thumbnails_module.thumbnail_cache.set(key, b"image")
+
+    assert service.lookup([cv]) == ({cv.id: key}, False)